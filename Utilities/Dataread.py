@@ -1,8 +1,8 @@
 import allure
-import time
-from openpyxl import load_workbook
 import os
 
+from Utilities.data_provider import cell
+
 class Dataread:
     @allure.step("Load data from Excel file: {file_path}")
     def dataread(self, file_path="Testdata1.xlsx"):
@@ -14,12 +14,6 @@ class Dataread:
         # build full path to the Excel file inside the Utilities folder
         full_path = os.path.join(os.path.dirname(__file__), file_path)
 
-        # Open the workbook and read A1
-        wb = load_workbook(filename=full_path)
-        sheet = wb.active
-
-        # small pause (could be removed later)
-        time.sleep(1)
-
-        search_keyword = sheet["A1"].value
+        # A1 of the active sheet; the workbook is parsed once and cached (see Utilities/data_provider.py)
+        search_keyword = cell(full_path, "A1")
         return search_keyword
@@ -0,0 +1,27 @@
+# Utilities/artifacts.py
+import datetime
+import itertools
+import os
+
+from base.parallel import worker_id
+
+ARTIFACT_DIR = "tests"
+
+_counter = itertools.count()
+
+
+def artifact_stamp():
+    """
+    Timestamp for debug artifacts that stays unique across parallel workers and rapid calls:
+    millisecond time + xdist worker id + a per-process counter, e.g. 20251114_173410_123_gw2_7.
+    Use one stamp for files that belong together (screenshot + page html).
+    """
+    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+    wid = worker_id()
+    suffix = "" if wid == "master" else f"_{wid}"
+    return f"{ts}{suffix}_{next(_counter)}"
+
+
+def artifact_path(prefix, ext, stamp=None):
+    """tests/<prefix>_<stamp>.<ext>"""
+    return os.path.join(ARTIFACT_DIR, f"{prefix}_{stamp or artifact_stamp()}.{ext}")
@@ -0,0 +1,233 @@
+# Utilities/data_provider.py
+"""
+Test data from Excel workbooks, read once.
+
+    from Utilities.data_provider import cell, records
+    keyword = cell("Utilities/Testdata1.xlsx", "A1")
+    for row in records("Utilities/searches.xlsx", converters={"max_products": int}):
+        row.keyword, row.max_products
+
+- workbooks are opened read-only (streamed row by row, never loaded as a full object model)
+- parsed rows are kept in memory and in an on-disk cache, both keyed by the file's mtime + size,
+  so a changed workbook is re-read and an unchanged one is never opened again (across runs too)
+- the disk cache is plain JSON (dates / times tagged) in a per-user directory (mode 0700), never
+  pickle in a shared temp dir: a planted cache file can at worst change test data, not run code
+- rows are plain tuples and records are namedtuples: thousands of rows stay small and flat
+"""
+import datetime
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ebay_capstone", "test_data")
+_CACHE_VERSION = 2
+# iter_rows() keeps a copy of a streamed sheet for the disk cache only up to this many rows
+STREAM_CACHE_ROWS = 20000
+
+# (path, sheet) -> (stamp, rows); one entry per sheet, replaced when the file changes
+_rows = {}
+# (path, sheet, converters) -> (stamp, records)
+_records = {}
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _cache_file(path, sheet):
+    digest = hashlib.sha1(f"{path}|{sheet}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{digest}.json")
+
+
+def _cache_dir_ok(create=False):
+    """The cache directory exists (or was just created) private to this user."""
+    try:
+        if create:
+            os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        st = os.stat(CACHE_DIR)
+        if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o077):
+            print(f"⚠️ ignoring test data cache {CACHE_DIR}: not private to this user")
+            return False
+        return True
+    except OSError:
+        return False
+
+
+# cell values openpyxl hands out that JSON can't hold as-is
+_TAGGED = {
+    "datetime": (datetime.datetime, datetime.datetime.isoformat, datetime.datetime.fromisoformat),
+    "date": (datetime.date, datetime.date.isoformat, datetime.date.fromisoformat),
+    "time": (datetime.time, datetime.time.isoformat, datetime.time.fromisoformat),
+    "timedelta": (datetime.timedelta, datetime.timedelta.total_seconds, lambda s: datetime.timedelta(seconds=s)),
+}
+
+
+def _encode(value):
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    # datetime before date: a datetime is a date too
+    for tag, (kind, dump, _) in _TAGGED.items():
+        if isinstance(value, kind):
+            return {"$" + tag: dump(value)}
+    raise TypeError(f"can't cache a {type(value).__name__} cell")
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        (key, raw), = value.items()
+        return _TAGGED[key[1:]][2](raw)
+    return value
+
+
+def _read_disk_cache(path, sheet, stamp):
+    try:
+        if not _cache_dir_ok():
+            return None
+        with open(_cache_file(path, sheet), encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached["version"] == _CACHE_VERSION and tuple(cached["stamp"]) == stamp:
+            return tuple(tuple(_decode(v) for v in row) for row in cached["rows"])
+    except Exception:
+        pass
+    return None
+
+
+def _write_disk_cache(path, sheet, stamp, rows):
+    try:
+        if not _cache_dir_ok(create=True):
+            return
+        data = {"version": _CACHE_VERSION, "stamp": list(stamp), "rows": [[_encode(v) for v in row] for row in rows]}
+        target = _cache_file(path, sheet)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, target)
+    except Exception:
+        pass  # the cache is an optimisation only
+
+
+def iter_sheet_rows(path, sheet=None):
+    """Stream the rows of a sheet straight from the workbook (read-only mode), as tuples of values."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(filename=path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.active
+        for row in ws.iter_rows(values_only=True):
+            yield tuple(row)
+    finally:
+        wb.close()
+
+
+def rows(path, sheet=None):
+    """All rows of a sheet as a tuple of tuples (memory cache, then disk cache, then the workbook)."""
+    path = os.path.abspath(path)
+    stamp = _stamp(path)
+    cached = _rows.get((path, sheet))
+    if cached and cached[0] == stamp:
+        return cached[1]
+    data = _read_disk_cache(path, sheet, stamp)
+    if data is None:
+        data = tuple(iter_sheet_rows(path, sheet))
+        _write_disk_cache(path, sheet, stamp, data)
+    _rows[(path, sheet)] = (stamp, data)
+    return data
+
+
+def iter_rows(path, sheet=None):
+    """
+    Rows of a sheet one at a time, for sheets too big to hold: served from the memory / disk cache
+    when it is fresh, else streamed from the workbook. A sheet streamed to the end that stayed under
+    STREAM_CACHE_ROWS goes to the disk cache, so the next run doesn't even import openpyxl.
+    """
+    path = os.path.abspath(path)
+    stamp = _stamp(path)
+    cached = _rows.get((path, sheet))
+    if cached and cached[0] == stamp:
+        return iter(cached[1])
+    data = _read_disk_cache(path, sheet, stamp)
+    if data is not None:
+        return iter(data)
+    return _stream_and_cache(path, sheet, stamp)
+
+
+def _stream_and_cache(path, sheet, stamp):
+    kept = []
+    for row in iter_sheet_rows(path, sheet):
+        if kept is not None:
+            kept.append(row)
+            if len(kept) > STREAM_CACHE_ROWS:
+                kept = None
+        yield row
+    if kept is not None:
+        _write_disk_cache(path, sheet, stamp, tuple(kept))
+
+
+def cell(path, ref, sheet=None):
+    """Value of one cell, e.g. cell(path, "A1"); None when the sheet doesn't reach it."""
+    match = re.fullmatch(r"([A-Za-z]+)(\d+)", ref.strip())
+    if not match:
+        raise ValueError(f"Bad cell reference {ref!r}")
+    column = 0
+    for ch in match.group(1).upper():
+        column = column * 26 + ord(ch) - ord("A") + 1
+    row_index, column = int(match.group(2)) - 1, column - 1
+    data = rows(path, sheet)
+    if row_index >= len(data) or column >= len(data[row_index]):
+        return None
+    return data[row_index][column]
+
+
+def field_names(header):
+    """Header cells -> namedtuple field names ("Max Products" -> max_products); invalid or
+    duplicate names are renamed by namedtuple to _<index>."""
+    return [re.sub(r"\W+", "_", str(value if value is not None else "")).strip("_").lower() for value in header]
+
+
+def make_records(raw_rows, converters=None):
+    """
+    Turn rows (first one = header) into namedtuple records. Fully empty rows are skipped.
+    - converters: field -> callable applied to that column (e.g. {"max_products": int}); empty cells stay None
+    """
+    raw_rows = iter(raw_rows)
+    header = next(raw_rows, None)
+    if header is None:
+        return
+    Record = namedtuple("Record", field_names(header), rename=True)
+    width = len(Record._fields)
+    convert = [(Record._fields.index(name), fn) for name, fn in (converters or {}).items() if name in Record._fields]
+    for row in raw_rows:
+        if not any(v not in (None, "") for v in row):
+            continue
+        values = list(row[:width]) + [None] * (width - len(row))
+        for index, fn in convert:
+            if values[index] not in (None, ""):
+                values[index] = fn(values[index])
+        yield Record(*values)
+
+
+def records(path, sheet=None, converters=None):
+    """Whole sheet as a tuple of typed namedtuple records (cached like rows())."""
+    key = (os.path.abspath(path), sheet, tuple(sorted((converters or {}).items(), key=lambda kv: kv[0])))
+    stamp = _stamp(key[0])
+    cached = _records.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    data = tuple(make_records(rows(path, sheet), converters))
+    _records[key] = (stamp, data)
+    return data
+
+
+def clear_cache(disk=False):
+    """Forget everything cached in memory (and on disk with disk=True)."""
+    _rows.clear()
+    _records.clear()
+    if disk:
+        try:
+            for name in os.listdir(CACHE_DIR):
+                os.remove(os.path.join(CACHE_DIR, name))
+        except OSError:
+            pass
@@ -0,0 +1,70 @@
+# Utilities/notify.py
+"""
+Tells whoever is watching the run that it needs a human (a CAPTCHA to solve by hand):
+
+    --captcha-notify=bell      print + terminal bell (default)
+    --captcha-notify=off       print only
+    --captcha-notify-cmd=CMD   also run CMD, e.g. "notify-send eBay {message}"
+                               ({message} is replaced; without it the message is appended)
+
+    from Utilities.notify import notify
+    notify("CAPTCHA on the sign-in page - solve it in the browser")
+"""
+import shlex
+import subprocess
+import sys
+
+MODES = ("bell", "off")
+
+
+class Notifier:
+    """
+    - bell: ring the terminal bell (written past pytest's output capture)
+    - command: shell-style command run in the background for every notification
+    """
+
+    def __init__(self, bell=True, command=None, stream=None):
+        self.bell = bell
+        self.command = command
+        self.stream = stream
+        self.sent = []
+
+    def __call__(self, message):
+        self.sent.append(message)
+        print(f"🔔 {message}")
+        if self.bell:
+            try:
+                stream = self.stream or sys.__stderr__
+                stream.write("\a")
+                stream.flush()
+            except Exception:
+                pass
+        if self.command:
+            try:
+                subprocess.Popen(self.argv(message), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except Exception as e:
+                print(f"⚠️ --captcha-notify-cmd failed: {e}")
+
+    def argv(self, message):
+        args = shlex.split(self.command)
+        if any("{message}" in arg for arg in args):
+            return [arg.replace("{message}", message) for arg in args]
+        return args + [message]
+
+
+_current = Notifier()
+
+
+def current_notifier():
+    return _current
+
+
+def set_notifier(notifier):
+    global _current
+    _current = notifier or Notifier()
+    return _current
+
+
+def notify(message):
+    """Get the attention of whoever is attending the run."""
+    return _current(message)
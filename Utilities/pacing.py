@@ -0,0 +1,140 @@
+# Utilities/pacing.py
+"""
+Every deliberate pause of the suite goes through here, by name, so one option decides how a
+run is paced:
+
+    --pacing=human   randomized, human-like pauses (live eBay; keeps bot detection calm)
+    --pacing=zero    no pauses at all (stand-in, fake driver, replay); polling keeps a small floor
+    --pacing=custom  human, with --pacing-points overrides, e.g. "between_products=0.5-1,after_click=0"
+    --pacing-scale   multiplies every pause of the chosen profile
+
+    from Utilities.pacing import pause, poll
+    pause("between_products")      # a named pause point
+    time.sleep(poll(0.4))          # a polling interval
+"""
+import random
+import time
+
+# pause point -> (min, max) seconds in the human profile
+HUMAN_PAUSES = {
+    "between_products": (1.0, 3.0),     # before acting on the next search result
+    "after_skip": (0.8, 1.6),           # after closing a product tab we skipped
+    "after_product": (1.2, 3.0),        # after finishing a product, before the next one
+    "after_scroll": (0.2, 0.4),         # scrollIntoView settled before clicking
+    "after_click": (0.4, 0.5),          # small beat after a click
+    "after_option": (0.3, 0.4),         # after picking a variant / radio / dropdown option
+    "after_typing": (0.3, 0.3),         # value typed / set by script, before moving on
+    "page_react": (1.0, 2.0),           # page reacting to a click (add to cart, remove, item open)
+    "after_submit": (1.2, 1.2),         # form submitted (sign-in steps)
+    "retry": (0.6, 0.8),                # before retrying a failed interaction
+    "after_captcha": (1.0, 1.0),        # a solved CAPTCHA re-rendering the page
+}
+DEFAULT_POLL_FLOOR = 0.05
+PROFILES = ("zero", "human", "custom")
+
+
+def _check_point(point):
+    if point not in HUMAN_PAUSES:
+        raise ValueError(f"Unknown pause point {point!r}. Known: {', '.join(HUMAN_PAUSES)}")
+    return point
+
+
+def parse_points(spec):
+    """'a=0.5-1,b=0' -> {'a': (0.5, 1.0), 'b': (0.0, 0.0)}; a name that isn't a pause point raises ValueError"""
+    points = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        name, _, value = part.partition("=")
+        low, _, high = value.strip().partition("-")
+        try:
+            low = float(low)
+            high = float(high) if high else low
+        except ValueError:
+            raise ValueError(f"Bad pacing point {part.strip()!r}; use name=seconds or name=min-max")
+        points[_check_point(name.strip())] = (low, max(low, high))
+    return points
+
+
+class Pacing:
+    """
+    One pacing profile.
+    - pauses: pause point -> (min, max) seconds; a known point missing here doesn't pause,
+      a name that isn't in HUMAN_PAUSES raises ValueError (a typo would otherwise go unnoticed)
+    - scale: multiplier for every pause
+    - poll_scale: multiplier for polling intervals (0 = poll as fast as poll_floor allows)
+    - poll_floor: smallest polling interval, so waits never spin
+    """
+
+    def __init__(self, name, pauses, scale=1.0, poll_scale=1.0, poll_floor=DEFAULT_POLL_FLOOR, sleep=None):
+        self.name = name
+        self.pauses = dict(pauses)
+        self.scale = scale
+        self.poll_scale = poll_scale
+        self.poll_floor = poll_floor
+        self._sleep = sleep
+        self.slept = 0.0
+
+    @classmethod
+    def profile(cls, name, scale=1.0, points=None):
+        """zero | human | custom (human + `points` overrides)."""
+        if name == "zero":
+            return cls("zero", {}, scale=0.0, poll_scale=0.0)
+        if name == "human":
+            return cls("human", HUMAN_PAUSES, scale=scale)
+        if name == "custom":
+            pauses = dict(HUMAN_PAUSES)
+            overrides = parse_points(points) if isinstance(points, str) else dict(points or {})
+            pauses.update({_check_point(point): value for point, value in overrides.items()})
+            return cls("custom", pauses, scale=scale)
+        raise ValueError(f"Unknown pacing profile {name!r}. Use {' | '.join(PROFILES)}.")
+
+    def duration(self, point):
+        if point not in self.pauses:
+            _check_point(point)
+        low, high = self.pauses.get(point, (0.0, 0.0))
+        return (random.uniform(low, high) if high > low else low) * self.scale
+
+    def pause(self, point):
+        seconds = self.duration(point)
+        if seconds > 0:
+            self.slept += seconds
+            # time.sleep looked up per call, so --time-breakdown sees these pauses
+            (self._sleep or time.sleep)(seconds)
+        return seconds
+
+    def without(self, *points):
+        """Turn the given pause points off (something else spaces those actions now)."""
+        for point in points:
+            self.pauses[point] = (0.0, 0.0)
+        return self
+
+    def poll(self, seconds):
+        """Interval to sleep between two checks of a polling loop."""
+        return max(self.poll_floor, seconds * self.poll_scale)
+
+    def __repr__(self):
+        return f"Pacing({self.name}, scale={self.scale})"
+
+
+_current = Pacing.profile("human")
+
+
+def current_pacing():
+    return _current
+
+
+def set_pacing(pacing):
+    global _current
+    _current = pacing or Pacing.profile("human")
+    return _current
+
+
+def pause(point):
+    """Sleep for the named pause point of the active profile."""
+    return _current.pause(point)
+
+
+def poll(seconds):
+    """Polling interval of the active profile for a loop written against `seconds`."""
+    return _current.poll(seconds)
@@ -0,0 +1,186 @@
+# Utilities/rate_control.py
+"""
+Feedback-driven pacing of page loads against the live site (AIMD, like TCP congestion control).
+
+One token bucket is shared by every test and xdist worker of a run (a small JSON state file
+guarded by a lock file). Each product / page open takes a token; the refill rate
+  - grows additively (+increase) for every page that loads clean
+  - is cut multiplicatively (x decrease) whenever a CAPTCHA / verification wall shows up
+so the run settles just under the rate at which eBay starts challenging it.
+
+The state file is per run (named after the run id) and temporary: every worker registers in it
+and the last one to close() deletes it, so nothing is left behind in the temp dir. The lock file
+only exists while a worker holds it. A run that crashes can leave its file; stale ones are
+harmless, since the next run uses a new name.
+"""
+import json
+import os
+import tempfile
+import time
+
+from base.parallel import run_id, worker_id
+
+LOCK_STALE_SECONDS = 10
+
+
+class _StateLock:
+    """Cross-process lock: a lock file created with O_EXCL (stale ones are broken after a while)."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > LOCK_STALE_SECONDS:
+                        os.remove(self.path)
+                        continue
+                except OSError:
+                    continue
+                time.sleep(0.01)
+
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class RateController:
+    """
+    Shared AIMD token bucket.
+    - rate: starting refill rate in page loads per second
+    - min_rate / max_rate: bounds of the learned rate
+    - increase: added to the rate per clean page
+    - decrease: factor applied to the rate per CAPTCHA (0.5 = halve it)
+    - burst: bucket size (page loads allowed back to back)
+    - state_dir: where the shared state lives (default: temp dir, one file per pytest run)
+    """
+
+    def __init__(self, rate=0.5, min_rate=0.05, max_rate=2.0, increase=0.05, decrease=0.5, burst=1,
+                 state_dir=None, sleep=None, clock=time.time):
+        self.initial_rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.burst = burst
+        self._sleep = sleep
+        self._clock = clock
+        state_dir = state_dir or os.path.join(tempfile.gettempdir(), "ebay_rate_control")
+        os.makedirs(state_dir, exist_ok=True)
+        self.state_file = os.path.join(state_dir, f"{run_id()}.json")
+        self._lock = _StateLock(self.state_file + ".lock")
+        self._join()
+
+    # ---------- shared state ----------
+    def _read(self):
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"rate": self.initial_rate, "tokens": float(self.burst), "stamp": self._clock(),
+                    "clean": 0, "captchas": 0, "waited": 0.0}
+
+    def _write(self, state):
+        tmp = f"{self.state_file}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_file)
+
+    def _join(self):
+        with self._lock:
+            state = self._read()
+            state["workers"] = sorted(set(state.get("workers", [])) | {worker_id()})
+            self._write(state)
+
+    def close(self):
+        """This worker is done with the bucket; the last worker of the run deletes the state file."""
+        with self._lock:
+            state = self._read()
+            workers = set(state.get("workers", [])) - {worker_id()}
+            if workers:
+                state["workers"] = sorted(workers)
+                self._write(state)
+                return
+            try:
+                os.remove(self.state_file)
+            except OSError:
+                pass
+
+    def _refill(self, state):
+        now = self._clock()
+        state["tokens"] = min(float(self.burst), state["tokens"] + (now - state["stamp"]) * state["rate"])
+        state["stamp"] = now
+
+    # ---------- API ----------
+    def acquire(self):
+        """Block until this process may load the next page; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                state = self._read()
+                self._refill(state)
+                if state["tokens"] >= 1:
+                    state["tokens"] -= 1
+                    state["waited"] += waited
+                    self._write(state)
+                    return waited
+                wait = (1 - state["tokens"]) / state["rate"]
+                self._write(state)
+            # re-check at least every second: another worker may have changed the rate
+            wait = min(wait, 1.0)
+            (self._sleep or time.sleep)(wait)
+            waited += wait
+
+    def on_clean_page(self):
+        """A page loaded without any bot wall: speed up a little."""
+        with self._lock:
+            state = self._read()
+            self._refill(state)
+            state["rate"] = min(self.max_rate, state["rate"] + self.increase)
+            state["clean"] += 1
+            self._write(state)
+
+    def on_captcha(self):
+        """A CAPTCHA / verification page: back off hard and start from an empty bucket."""
+        with self._lock:
+            state = self._read()
+            self._refill(state)
+            state["rate"] = max(self.min_rate, state["rate"] * self.decrease)
+            state["tokens"] = 0.0
+            state["captchas"] += 1
+            self._write(state)
+
+    def snapshot(self):
+        with self._lock:
+            return self._read()
+
+    def summary(self):
+        state = self.snapshot()
+        return (f"rate {state['rate']:.2f} pages/s after {state['clean']} clean pages and "
+                f"{state['captchas']} CAPTCHAs, {state['waited']:.1f}s spent waiting for tokens")
+
+
+class NoRateControl:
+    """--rate=off: every call is a no-op."""
+
+    def acquire(self):
+        return 0.0
+
+    def on_clean_page(self):
+        pass
+
+    def on_captcha(self):
+        pass
+
+    def summary(self):
+        return "rate control off"
+
+    def close(self):
+        pass
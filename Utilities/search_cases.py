@@ -0,0 +1,97 @@
+# Utilities/search_cases.py
+"""
+Search test cases from a workbook, one per row, for pytest_generate_tests (see tests/conftest.py).
+
+Sheet layout: a header row with a "keyword" column and optional "match_tokens" and "max_products":
+
+    keyword        | match_tokens          | max_products
+    outdoor toys   | toy, outdoor          | 5
+    garden hose    |                       | 3
+
+- match_tokens: comma separated; empty = the keyword's words
+- max_products: empty = DEFAULT_MAX_PRODUCTS
+A sheet without a "keyword" header (Testdata1.xlsx: just A1) is read as one keyword per row in column A.
+
+--data-shard=K/N keeps the cases whose keyword hashes (crc32) to shard K of N, so separate
+invocations split a sheet the same way every time; --data-limit stops reading after that many cases.
+"""
+import itertools
+import os
+import re
+import zlib
+from collections import namedtuple
+
+from Utilities.data_provider import iter_rows
+
+DEFAULT_DATA_FILE = os.path.join(os.path.dirname(__file__), "Testdata1.xlsx")
+DEFAULT_MAX_PRODUCTS = 5
+
+SearchCase = namedtuple("SearchCase", "keyword match_tokens max_products row")
+
+
+def default_tokens(keyword):
+    return tuple(t for t in keyword.lower().split() if len(t) > 1)
+
+
+def _case(row_number, keyword, tokens=None, max_products=None):
+    keyword = str(keyword).strip()
+    tokens = tuple(t.strip().lower() for t in re.split(r"[,;]", str(tokens or "")) if t.strip())
+    try:
+        max_products = int(max_products) if max_products not in (None, "") else DEFAULT_MAX_PRODUCTS
+    except (TypeError, ValueError):
+        raise ValueError(f"Row {row_number}: max_products must be a whole number, got {max_products!r}")
+    return SearchCase(keyword, tokens or default_tokens(keyword), max_products, row_number)
+
+
+def iter_search_cases(path=DEFAULT_DATA_FILE, sheet=None):
+    """SearchCase per non-empty row, generated lazily (the sheet is never held as a whole)."""
+    rows = iter_rows(path, sheet)
+    first = next(rows, None)
+    if first is None:
+        return
+    header = [str(v).strip().lower().replace(" ", "_") if v is not None else "" for v in first]
+    if "keyword" not in header:
+        # no header row: keywords in column A
+        for number, row in enumerate(itertools.chain([first], rows), start=1):
+            if row and row[0] not in (None, ""):
+                yield _case(number, row[0])
+        return
+
+    def column(row, name):
+        index = header.index(name) if name in header else None
+        return row[index] if index is not None and index < len(row) else None
+
+    for number, row in enumerate(rows, start=2):
+        keyword = column(row, "keyword")
+        if keyword in (None, ""):
+            continue
+        yield _case(number, keyword, column(row, "match_tokens"), column(row, "max_products"))
+
+
+def parse_shard(spec):
+    """'2/4' -> (2, 4); None/'' -> None."""
+    if not spec:
+        return None
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", spec)
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise ValueError(f"Bad --data-shard {spec!r}; use K/N with 1 <= K <= N")
+    return int(match.group(1)), int(match.group(2))
+
+
+def in_shard(case, shard):
+    if not shard:
+        return True
+    index, total = shard
+    return zlib.crc32(case.keyword.lower().encode("utf-8")) % total == index - 1
+
+
+def select_cases(path=DEFAULT_DATA_FILE, sheet=None, shard=None, limit=None):
+    """The cases of one shard, stopping after `limit` of them."""
+    cases = (case for case in iter_search_cases(path, sheet) if in_shard(case, shard))
+    return itertools.islice(cases, limit) if limit else cases
+
+
+def case_id(case):
+    """Stable, readable test id: row2-outdoor_toys"""
+    slug = re.sub(r"\W+", "_", case.keyword.lower()).strip("_")[:40]
+    return f"row{case.row}-{slug}"
@@ -0,0 +1,347 @@
+# Utilities/standin_server.py
+"""
+Local stand-in for the parts of eBay the suite touches: home, search results (list and card
+layouts), product pages with add to cart, sign-in (email step + password step), cart with
+remove, and the "Please verify yourself" wall. Pages are rendered from the recorded fixtures
+in Utilities/standin_fixtures, so flows run offline, fast and the same way every time.
+
+    python -m Utilities.standin_server --port 8008
+    pytest --standin                       (starts one per worker on a free port)
+    pytest --base-url=http://127.0.0.1:8008
+"""
+import argparse
+import html
+import itertools
+import json
+import os
+import threading
+import uuid
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "standin_fixtures")
+SESSION_COOKIE = "standin_sid"
+LAYOUTS = ("list", "card")
+
+_STATIC_TYPES = {".svg": "image/svg+xml", ".html": "text/html; charset=utf-8"}
+
+
+def _load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def load_catalog():
+    with open(os.path.join(FIXTURE_DIR, "catalog.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class StandinState:
+    """Per-visitor state (cart, signed-in user), keyed by the session cookie."""
+
+    def __init__(self, catalog, challenge_every=0):
+        self.catalog = {item["id"]: item for item in catalog}
+        self.order = [item["id"] for item in catalog]
+        self.challenge_every = challenge_every
+        self._carts = {}
+        self._users = {}
+        self._item_views = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def cart(self, sid):
+        with self._lock:
+            return list(self._carts.get(sid, []))
+
+    def add_to_cart(self, sid, item_id):
+        with self._lock:
+            cart = self._carts.setdefault(sid, [])
+            if item_id in self.catalog and item_id not in cart:
+                cart.append(item_id)
+
+    def remove_from_cart(self, sid, item_id):
+        with self._lock:
+            cart = self._carts.get(sid, [])
+            if item_id in cart:
+                cart.remove(item_id)
+
+    def user(self, sid):
+        with self._lock:
+            return self._users.get(sid)
+
+    def sign_in(self, sid, userid):
+        with self._lock:
+            self._users[sid] = userid
+
+    def needs_challenge(self):
+        """Every Nth product view hits the verification wall (0 = never)."""
+        if not self.challenge_every:
+            return False
+        return next(self._item_views) % self.challenge_every == 0
+
+    def search(self, keyword):
+        tokens = [t for t in (keyword or "").lower().split() if len(t) > 1]
+        hits = [i for i in self.order if any(t in self.catalog[i]["title"].lower() for t in tokens)]
+        # like eBay, an unknown keyword still shows "similar" listings
+        return hits or list(self.order)
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = "StandinEbay/1.0"
+    # set on the subclass built by StandinServer
+    state = None
+    default_layout = "list"
+
+    def log_message(self, format, *args):
+        pass
+
+    # ---------- plumbing ----------
+    def _session(self):
+        cookie = SimpleCookie(self.headers.get("Cookie") or "")
+        if SESSION_COOKIE in cookie:
+            return cookie[SESSION_COOKIE].value, False
+        return uuid.uuid4().hex, True
+
+    def _form(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+        return {k: v[0] for k, v in parse_qs(body).items()}
+
+    def _send(self, status, body=b"", content_type="text/html; charset=utf-8", headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        if self._new_session:
+            self.send_header("Set-Cookie", f"{SESSION_COOKIE}={self._sid}; Path=/; SameSite=Lax")
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _redirect(self, location):
+        self._send(303, headers=[("Location", location)])
+
+    def _page(self, title, content, keyword="", status=200):
+        user = self.state.user(self._sid)
+        if user:
+            account = (f'<button id="gh-ug" class="gh-ug" aria-label="Account menu for {html.escape(user)}">'
+                       f'Hi <b>{html.escape(user.split("@")[0])}</b></button>'
+                       f'<a title="My eBay" href="/">My eBay</a>')
+        else:
+            account = '<span id="gh-ug-flex">Hi! <a href="/signin">Sign in</a></span>'
+        page = Template(_load_fixture("page.html")).substitute(
+            title=html.escape(title),
+            account=account,
+            keyword=html.escape(keyword, quote=True),
+            cart_count=len(self.state.cart(self._sid)),
+            content=content,
+        )
+        self._send(status, page.encode("utf-8"))
+
+    def _item_fields(self, item_id):
+        item = self.state.catalog[item_id]
+        return {
+            "item_id": item_id,
+            "href": f"/itm/{item_id}",
+            "title": html.escape(item["title"], quote=True),
+            "price": html.escape(item["price"]),
+        }
+
+    # ---------- routes ----------
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        self._sid, self._new_session = self._session()
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = url.path.rstrip("/") or "/"
+
+        if path == "/":
+            return self._home()
+        if path == "/sch/i.html":
+            return self._search(query.get("_nkw", ""), query.get("layout") or self.default_layout)
+        if path.startswith("/itm/"):
+            item_id = path.rsplit("/", 1)[-1]
+            return self._item(item_id, added=query.get("added") == "1")
+        if path == "/signin":
+            return self._page("Sign in or Register | eBay",
+                              Template(_load_fixture("signin.html")).substitute(error=""))
+        if path == "/cart":
+            return self._cart()
+        if path == "/splashui/captcha":
+            return self._challenge(query.get("ru") or "/")
+        if path.startswith("/static/"):
+            return self._static(path[len("/static/"):])
+        self._page("Page not found | eBay", "<h1>Looks like this page is missing.</h1>", status=404)
+
+    def do_POST(self):
+        self._sid, self._new_session = self._session()
+        path = urlparse(self.path).path.rstrip("/")
+        form = self._form()
+
+        if path == "/signin":
+            userid = form.get("userid", "").strip()
+            if not userid:
+                error = "<p id=\"signin-error-msg\" class=\"inline-notice\">Oops, that's not a match.</p>"
+                return self._page("Sign in or Register | eBay",
+                                  Template(_load_fixture("signin.html")).substitute(error=error))
+            return self._page("Sign in or Register | eBay", Template(_load_fixture("signin_password.html")).substitute(
+                userid=html.escape(userid, quote=True), error=""))
+        if path == "/signin/password":
+            userid = form.get("userid", "").strip()
+            if not form.get("pass"):
+                error = "<p id=\"errormsg\" class=\"inline-notice\">Oops, that's not a match.</p>"
+                return self._page("Sign in or Register | eBay", Template(_load_fixture("signin_password.html")).substitute(
+                    userid=html.escape(userid, quote=True), error=error))
+            self.state.sign_in(self._sid, userid)
+            return self._redirect("/")
+        if path == "/cart/add":
+            item_id = form.get("item", "")
+            item = self.state.catalog.get(item_id)
+            if item and item.get("variants") and not form.get("variant"):
+                return self._item(item_id, error="Please select a Colour")
+            self.state.add_to_cart(self._sid, item_id)
+            return self._redirect(f"/itm/{item_id}?added=1")
+        if path == "/cart/remove":
+            self.state.remove_from_cart(self._sid, form.get("item", ""))
+            return self._redirect("/cart")
+        if path == "/splashui/captcha":
+            ru = form.get("ru") or "/"
+            # only ever bounce back to this host
+            return self._redirect(ru if ru.startswith("/") else "/")
+        self._send(404)
+
+    # ---------- pages ----------
+    def _home(self):
+        deals = "\n    ".join(
+            '<li class="hl-item"><a href="{href}"><img src="/static/item.svg" alt="{title}">{title}</a> {price}</li>'
+            .format(**self._item_fields(i)) for i in self.state.order[:4]
+        )
+        self._page("Electronics, Cars, Fashion, Collectibles & More | eBay",
+                   Template(_load_fixture("home.html")).substitute(deals=deals))
+
+    def _search(self, keyword, layout):
+        layout = layout if layout in LAYOUTS else "list"
+        hits = self.state.search(keyword)
+        row = Template(_load_fixture("search_card_item.html" if layout == "card" else "search_list_item.html"))
+        rows = []
+        if layout == "list":
+            # the live list layout always starts with a hidden "Shop on eBay" template item
+            rows.append(row.substitute(placeholder_class=" s-item__pl-on-bottom", item_id="123456",
+                                       href="/itm/123456", title="Shop on eBay", price="$20.00"))
+        for item_id in hits:
+            rows.append(row.substitute(placeholder_class="", **self._item_fields(item_id)))
+        content = Template(_load_fixture("search.html")).substitute(
+            count=len(hits),
+            keyword_html=html.escape(keyword),
+            layout_class="srp-grid" if layout == "card" else "srp-list",
+            items="\n".join(rows),
+        )
+        self._page(f"{keyword} | eBay", content, keyword=keyword)
+
+    def _item(self, item_id, added=False, error=""):
+        if item_id not in self.state.catalog:
+            return self._page("Item not found | eBay", "<h1>We looked everywhere.</h1>", status=404)
+        if not added and not error and self.state.needs_challenge():
+            return self._redirect(f"/splashui/captcha?ru=/itm/{item_id}")
+        item = self.state.catalog[item_id]
+        fields = self._item_fields(item_id)
+        variants = ""
+        if item.get("variants"):
+            options = "".join(f'<option value="{html.escape(v)}">{html.escape(v)}</option>' for v in item["variants"])
+            notice = f'<div class="x-msku__error">{error}</div>' if error else ""
+            variants = (f'<label for="x-msku__select-box">Colour: Select</label>'
+                        f'<select id="x-msku__select-box" name="variant"><option value="">Select</option>{options}</select>'
+                        f'{notice}')
+        if added or item_id in self.state.cart(self._sid):
+            cart_action = ('<a class="ux-call-to-action fake-btn" href="/cart">'
+                           '<span class="ux-call-to-action__cell"><span class="ux-call-to-action__text">See in cart</span></span></a>')
+        else:
+            cart_action = ('<button id="atcRedesignId_btn" class="ux-call-to-action fake-btn" type="submit">'
+                           '<span class="ux-call-to-action__cell"><span class="ux-call-to-action__text">Add to cart</span></span></button>')
+        content = Template(_load_fixture("item.html")).substitute(variants=variants, cart_action=cart_action, **fields)
+        self._page(f"{item['title']} | eBay", content)
+
+    def _cart(self):
+        row = Template(_load_fixture("cart_item.html"))
+        ids = self.state.cart(self._sid)
+        items = "\n".join(row.substitute(**self._item_fields(i)) for i in ids)
+        if not ids:
+            items = '<div class="empty-cart"><span>You don\'t have any items in your cart.</span></div>'
+        self._page("eBay shopping cart", Template(_load_fixture("cart.html")).substitute(count=len(ids), items=items))
+
+    def _challenge(self, return_url):
+        content = Template(_load_fixture("captcha.html")).substitute(return_url=html.escape(return_url, quote=True))
+        self._page("Security Measure | eBay", content)
+
+    def _static(self, name):
+        name = os.path.basename(name)
+        ext = os.path.splitext(name)[1]
+        if ext not in _STATIC_TYPES or not os.path.exists(os.path.join(FIXTURE_DIR, name)):
+            return self._send(404)
+        self._send(200, _load_fixture(name).encode("utf-8"), content_type=_STATIC_TYPES[ext])
+
+
+class StandinServer:
+    """
+    The stand-in on a background thread.
+    - host / port: where to listen (port 0 = any free port)
+    - layout: default search results layout, list | card (?layout= overrides per request)
+    - challenge_every: serve the verification wall on every Nth product view (0 = never)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, layout="list", challenge_every=0):
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout {layout!r}. Use {' | '.join(LAYOUTS)}.")
+        self.state = StandinState(load_catalog(), challenge_every=challenge_every)
+        handler = type("BoundStandinHandler", (StandinHandler,), {"state": self.state, "default_layout": layout})
+        self._httpd = ThreadingHTTPServer((host, port), handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        try:
+            self._httpd.shutdown()
+        finally:
+            self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local eBay stand-in for offline test runs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8008)
+    parser.add_argument("--layout", default="list", choices=LAYOUTS)
+    parser.add_argument("--challenge-every", type=int, default=0)
+    args = parser.parse_args()
+    server = StandinServer(args.host, args.port, layout=args.layout, challenge_every=args.challenge_every)
+    print(f"eBay stand-in serving on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
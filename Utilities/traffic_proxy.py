@@ -0,0 +1,366 @@
+# Utilities/traffic_proxy.py
+"""
+Record / replay proxy for browser traffic.
+
+record: every request the browser makes is forwarded to the real host and the exchange
+        (method, url, status, headers, body) is written to a gzip'ed JSON-lines archive.
+replay: requests are answered from the archive only; nothing goes over the network.
+
+HTTPS is intercepted with one self-signed certificate (generated with the openssl CLI and
+cached); browsers behind the proxy run with insecure certs accepted. Without openssl, HTTPS
+is tunnelled untouched (not recorded).
+"""
+import base64
+import glob
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import select
+import shutil
+import socket
+import ssl
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from base.parallel import worker_id
+
+CERT_DIR = os.path.join(
+    os.getenv("DRIVER_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "ebay_capstone"), "proxy_cert"
+)
+ARCHIVE_SUFFIX = ".jsonl.gz"
+
+# eBay tracking / cache-busting params that change on every page view but not the response
+DEFAULT_IGNORED_PARAMS = (
+    "_trksid", "_trkparms", "hash", "amdata", "itmmeta", "mkevt", "mkcid", "mkrid",
+    "campid", "toolid", "customid", "_ul", "cb", "rnd", "ts", "_",
+)
+
+_HOP_BY_HOP = {
+    "connection", "keep-alive", "proxy-connection", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "trailers", "transfer-encoding", "upgrade", "content-length",
+}
+
+
+class MatchRules:
+    """
+    How a request is matched to a recorded exchange.
+    - ignore_params: query parameters left out of the match (tracking ids, cache busters)
+    - ignore_query: match on scheme/host/path only
+    - match_body: also require the same request body (POSTs)
+    """
+
+    def __init__(self, ignore_params=DEFAULT_IGNORED_PARAMS, ignore_query=False, match_body=False):
+        self.ignore_params = set(ignore_params or ())
+        self.ignore_query = ignore_query
+        self.match_body = match_body
+
+    def key(self, method, url, body=b""):
+        parts = urlsplit(url)
+        query = ""
+        if not self.ignore_query:
+            pairs = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in self.ignore_params]
+            query = urlencode(sorted(pairs))
+        key = f"{method.upper()} {parts.scheme}://{parts.netloc.lower()}{parts.path or '/'}?{query}"
+        if self.match_body and body:
+            key += " " + hashlib.sha1(body).hexdigest()
+        return key
+
+
+class TrafficArchive:
+    """
+    Recorded exchanges. Repeated requests for the same key are replayed in recorded order
+    (the last one keeps being served after that), so state changes like add-to-cart replay too.
+    """
+
+    def __init__(self, entries=None):
+        self.entries = list(entries or [])
+        self._index = None
+        self._served = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """The archive at path plus the per-worker archives recorded next to it (<name>.gwN.jsonl.gz)."""
+        entries = []
+        stem = path[: -len(ARCHIVE_SUFFIX)] if path.endswith(ARCHIVE_SUFFIX) else path
+        for file in [path] + sorted(glob.glob(glob.escape(stem) + ".gw*" + ARCHIVE_SUFFIX)):
+            if not os.path.exists(file):
+                continue
+            with gzip.open(file, "rt", encoding="utf-8") as f:
+                entries.extend(json.loads(line) for line in f if line.strip())
+        if not entries:
+            raise FileNotFoundError(f"No recorded traffic found at {path}")
+        return cls(entries)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        os.replace(tmp, path)
+
+    def add(self, method, url, request_body, status, reason, headers, body):
+        with self._lock:
+            self.entries.append({
+                "method": method,
+                "url": url,
+                "request_body": base64.b64encode(request_body or b"").decode("ascii"),
+                "status": status,
+                "reason": reason,
+                "headers": [list(h) for h in headers],
+                "body": base64.b64encode(body or b"").decode("ascii"),
+            })
+            self._index = None
+
+    def lookup(self, rules, method, url, request_body=b""):
+        """(status, reason, headers, body) recorded for this request, or None."""
+        with self._lock:
+            if self._index is None:
+                self._index = {}
+                for entry in self.entries:
+                    key = rules.key(entry["method"], entry["url"], base64.b64decode(entry.get("request_body") or ""))
+                    self._index.setdefault(key, []).append(entry)
+            key = rules.key(method, url, request_body)
+            candidates = self._index.get(key)
+            if not candidates:
+                return None
+            n = self._served.get(key, 0)
+            self._served[key] = n + 1
+            entry = candidates[min(n, len(candidates) - 1)]
+        return entry["status"], entry["reason"], entry["headers"], base64.b64decode(entry["body"])
+
+
+def archive_path_for_worker(path):
+    """xdist workers record to their own file next to path: traffic.gw1.jsonl.gz."""
+    wid = worker_id()
+    if wid == "master":
+        return path
+    stem = path[: -len(ARCHIVE_SUFFIX)] if path.endswith(ARCHIVE_SUFFIX) else path
+    return f"{stem}.{wid}{ARCHIVE_SUFFIX}"
+
+
+def ensure_certificate(cert_dir=None):
+    """(cert_file, key_file) of the interception certificate, generated once; None without openssl."""
+    cert_dir = cert_dir or CERT_DIR
+    cert, key = os.path.join(cert_dir, "proxy.pem"), os.path.join(cert_dir, "proxy.key")
+    if os.path.exists(cert) and os.path.exists(key):
+        return cert, key
+    openssl = shutil.which("openssl")
+    if not openssl:
+        return None
+    os.makedirs(cert_dir, exist_ok=True)
+    try:
+        subprocess.run(
+            [openssl, "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "3650",
+             "-keyout", key, "-out", cert, "-subj", "/CN=ebay-capstone-proxy",
+             "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1"],
+            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60,
+        )
+    except Exception as e:
+        print("traffic proxy: could not create interception certificate:", e)
+        return None
+    return cert, key
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # set on the subclass built by TrafficProxy
+    proxy = None
+    _tunnel_host = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_CONNECT(self):
+        host, _, port = self.path.partition(":")
+        port = int(port or 443)
+        if self.proxy.ssl_context is None:
+            return self._blind_tunnel(host, port)
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        try:
+            conn = self.proxy.ssl_context.wrap_socket(self.connection, server_side=True)
+        except (ssl.SSLError, OSError):
+            self.close_connection = True
+            return
+        # keep serving requests from inside the TLS stream; their paths are relative to host
+        self.connection = conn
+        self.rfile = conn.makefile("rb", self.rbufsize)
+        self.wfile = conn.makefile("wb")
+        self._tunnel_host = host if port == 443 else f"{host}:{port}"
+        self.close_connection = False
+        while not self.close_connection:
+            self.handle_one_request()
+        self.close_connection = True
+
+    def _blind_tunnel(self, host, port):
+        try:
+            upstream = socket.create_connection((host, port), timeout=self.proxy.timeout)
+        except OSError:
+            self.send_error(502)
+            return
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        sockets = [self.connection, upstream]
+        try:
+            while True:
+                readable, _, broken = select.select(sockets, [], sockets, self.proxy.timeout)
+                if broken or not readable:
+                    break
+                for s in readable:
+                    data = s.recv(65536)
+                    if not data:
+                        return
+                    (upstream if s is self.connection else self.connection).sendall(data)
+        except OSError:
+            pass
+        finally:
+            upstream.close()
+            self.close_connection = True
+
+    def _forward(self):
+        if self._tunnel_host:
+            url = f"https://{self._tunnel_host}{self.path}"
+        else:
+            url = self.path
+            if not urlsplit(url).scheme:
+                self.send_error(400, "Not a proxy request")
+                return
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        headers = [(k, v) for k, v in self.headers.items() if k.lower() not in _HOP_BY_HOP]
+
+        status, reason, resp_headers, resp_body = self.proxy.exchange(self.command, url, headers, body)
+
+        self.send_response(status, reason)
+        for name, value in resp_headers:
+            if name.lower() not in _HOP_BY_HOP:
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(resp_body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(resp_body)
+
+    do_GET = do_POST = do_HEAD = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _forward
+
+
+class TrafficProxy:
+    """
+    Local HTTP(S) proxy in front of the test browsers.
+    - mode: record | replay
+    - archive_path: gzip JSON-lines archive written on stop() (record) or read at start (replay)
+    - rules: MatchRules used to find a recorded response
+    - on_miss: replay only; error (answer 404 and list the miss) | passthrough (fetch it live)
+    """
+
+    def __init__(self, mode, archive_path, rules=None, on_miss="error", host="127.0.0.1", port=0, timeout=30):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown proxy mode {mode!r}. Use record | replay.")
+        if on_miss not in ("error", "passthrough"):
+            raise ValueError(f"Unknown on_miss {on_miss!r}. Use error | passthrough.")
+        self.mode = mode
+        self.archive_path = archive_path
+        self.rules = rules or MatchRules()
+        self.on_miss = on_miss
+        self.timeout = timeout
+        self.archive = TrafficArchive.load(archive_path) if mode == "replay" else TrafficArchive()
+        self.misses = []
+        self.served = 0
+
+        self.ssl_context = None
+        cert = ensure_certificate()
+        if cert:
+            self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self.ssl_context.load_cert_chain(*cert)
+        else:
+            print("⚠️ traffic proxy: openssl not found, HTTPS will be tunnelled without recording.")
+        self._upstream_context = ssl.create_default_context()
+
+        handler = type("BoundProxyHandler", (_ProxyHandler,), {"proxy": self})
+        self._httpd = ThreadingHTTPServer((host, port), handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def address(self):
+        host, port = self._httpd.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="traffic-proxy", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        try:
+            self._httpd.shutdown()
+        finally:
+            self._httpd.server_close()
+        if self.mode == "record":
+            self.archive.save(self.archive_path)
+            print(f"🎞️ Recorded {len(self.archive.entries)} exchanges to {self.archive_path}")
+        else:
+            print(f"🎞️ Replayed {self.served} responses from {self.archive_path}, {len(self.misses)} not in archive")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def exchange(self, method, url, headers, body):
+        """(status, reason, headers, body) for one browser request."""
+        if self.mode == "replay":
+            hit = self.archive.lookup(self.rules, method, url, body)
+            if hit:
+                self.served += 1
+                return hit
+            self.misses.append(f"{method} {url}")
+            if self.on_miss == "error":
+                return 404, "Not In Archive", [("Content-Type", "text/plain"), ("X-Replay-Miss", "1")], \
+                    f"Not in traffic archive: {method} {url}".encode("utf-8")
+            return self._fetch(method, url, headers, body)
+
+        response = self._fetch(method, url, headers, body)
+        if response[0] != 502:
+            self.archive.add(method, url, body, *response)
+        return response
+
+    def _fetch(self, method, url, headers, body):
+        parts = urlsplit(url)
+        if parts.scheme == "https":
+            conn = http.client.HTTPSConnection(parts.netloc, timeout=self.timeout, context=self._upstream_context)
+        else:
+            conn = http.client.HTTPConnection(parts.netloc, timeout=self.timeout)
+        try:
+            path = urlunsplit(("", "", parts.path or "/", parts.query, ""))
+            conn.request(method, path, body=body or None, headers=dict(headers))
+            resp = conn.getresponse()
+            data = resp.read()
+            return resp.status, resp.reason, resp.getheaders(), data
+        except Exception as e:
+            return 502, "Bad Gateway", [("Content-Type", "text/plain")], f"traffic proxy: {e}".encode("utf-8")
+        finally:
+            conn.close()
+
+    def apply_to_options(self, browser, options):
+        """Route the browser through this proxy (loopback included) and accept its certificate."""
+        host, port = self._httpd.server_address[:2]
+        options.accept_insecure_certs = True
+        if browser in ("chrome", "edge"):
+            options.add_argument(f"--proxy-server=http://{host}:{port}")
+            # Chromium never proxies localhost unless told to (needed for --standin recordings)
+            options.add_argument("--proxy-bypass-list=<-loopback>")
+            options.add_argument("--ignore-certificate-errors")
+        elif browser == "firefox":
+            options.set_preference("network.proxy.type", 1)
+            for scheme in ("http", "ssl"):
+                options.set_preference(f"network.proxy.{scheme}", host)
+                options.set_preference(f"network.proxy.{scheme}_port", port)
+            options.set_preference("network.proxy.no_proxies_on", "")
+            options.set_preference("network.proxy.allow_hijacking_localhost", True)
@@ -0,0 +1,355 @@
+# base/auth_session.py
+"""
+Signed-in state shared by every test and xdist worker of a run.
+
+The state (cookies + localStorage / sessionStorage per origin) lives in one JSON file with an
+expiry. Tests that need a signed-in user get it injected into their pooled browser instead of
+going through the sign-in flow; the flow only runs again once the state has expired.
+Where a state comes from, first hit wins:
+  1. the state file, if it is still fresh (written by an earlier login or test_user_login)
+  2. a cookie dump from tests/save_login_cookies.py (cookies.json)
+  3. one real sign-in (the `login` callable), done by a single worker while the others wait
+"""
+import json
+import os
+import threading
+import time
+import urllib.parse
+
+from base.parallel import pid_alive
+from base.storage_state import load_storage_state
+
+DEFAULT_MAX_AGE = 12 * 3600      # trust a saved sign-in this long (eBay's own cookies may end it sooner)
+# A sign-in waiting for human CAPTCHA solves can take longer than any fixed limit, so the worker
+# holding the login lock touches it every LOGIN_LOCK_HEARTBEAT_SECONDS. The lock is only broken when
+# its holder is no longer running, or (holder unknown) when nobody touched it for STALE seconds.
+LOGIN_LOCK_HEARTBEAT_SECONDS = 30
+LOGIN_LOCK_STALE_SECONDS = 600
+COOKIE_KEYS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")
+
+_READ_STORAGE_JS = """
+function dump(store) {
+  var out = {};
+  try { for (var i = 0; i < store.length; i++) { var k = store.key(i); out[k] = store.getItem(k); } } catch (e) {}
+  return out;
+}
+return {origin: location.origin, localStorage: dump(window.localStorage), sessionStorage: dump(window.sessionStorage)};
+"""
+
+_WRITE_STORAGE_JS = """
+var data = arguments[0];
+['localStorage', 'sessionStorage'].forEach(function (kind) {
+  try {
+    var items = data[kind] || {};
+    Object.keys(items).forEach(function (k) { window[kind].setItem(k, items[k]); });
+  } catch (e) {}
+});
+return true;
+"""
+
+
+def _clean_cookie(cookie):
+    clean = {k: cookie[k] for k in COOKIE_KEYS if cookie.get(k) is not None}
+    if "expiry" in clean:
+        clean["expiry"] = int(clean["expiry"])
+    if clean.get("sameSite") not in ("Strict", "Lax", "None"):
+        clean.pop("sameSite", None)
+    return clean
+
+
+def _from_cdp(cookie):
+    """CDP Network cookie -> WebDriver cookie dict."""
+    out = {"name": cookie["name"], "value": cookie["value"], "domain": cookie.get("domain"),
+           "path": cookie.get("path", "/"), "secure": cookie.get("secure", False),
+           "httpOnly": cookie.get("httpOnly", False), "sameSite": cookie.get("sameSite")}
+    if not cookie.get("session") and cookie.get("expires", -1) > 0:
+        out["expiry"] = int(cookie["expires"])
+    return _clean_cookie(out)
+
+
+def _expires_at(cookies, saved_at, max_age):
+    """max_age after saving, or when the longest-lived cookie runs out, whichever is first."""
+    expiries = [c["expiry"] for c in cookies if c.get("expiry")]
+    end = saved_at + max_age
+    return min(end, max(expiries)) if expiries else end
+
+
+class AuthState:
+    """
+    One signed-in browser state.
+    - cookies: WebDriver cookie dicts
+    - origins: origin -> {"localStorage": {...}, "sessionStorage": {...}}
+    - base_url: the site it belongs to (states of another host are never applied)
+    """
+
+    def __init__(self, cookies, origins=None, base_url=None, saved_at=None, expires_at=None, source="login"):
+        self.cookies = [_clean_cookie(c) for c in cookies]
+        self.origins = dict(origins or {})
+        self.base_url = base_url
+        self.saved_at = saved_at or time.time()
+        self.expires_at = expires_at or _expires_at(self.cookies, self.saved_at, DEFAULT_MAX_AGE)
+        self.source = source
+
+    # ---------- capture / import ----------
+    @classmethod
+    def capture(cls, driver, base_url=None, max_age=DEFAULT_MAX_AGE, source="login"):
+        """Snapshot a signed-in browser: every cookie it has (CDP) or those of the current page,
+        plus the storage of the current origin."""
+        cookies = None
+        execute_cdp_cmd = getattr(driver, "execute_cdp_cmd", None)
+        if execute_cdp_cmd:
+            try:
+                cookies = [_from_cdp(c) for c in execute_cdp_cmd("Network.getAllCookies", {})["cookies"]]
+            except Exception:
+                cookies = None
+        if cookies is None:
+            cookies = driver.get_cookies()
+        origins = {}
+        try:
+            storage = driver.execute_script(_READ_STORAGE_JS)
+            if storage and (storage.get("localStorage") or storage.get("sessionStorage")):
+                origins[storage["origin"]] = {k: storage.get(k) or {} for k in ("localStorage", "sessionStorage")}
+        except Exception:
+            pass
+        state = cls(cookies, origins, base_url, source=source)
+        state.expires_at = _expires_at(state.cookies, state.saved_at, max_age)
+        return state
+
+    @classmethod
+    def from_cookies_file(cls, path, base_url=None, max_age=DEFAULT_MAX_AGE):
+        """Import a get_cookies() dump (tests/save_login_cookies.py); its age is the file's mtime."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                cookies = json.load(f)
+            saved_at = os.path.getmtime(path)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cookies, list) or not cookies:
+            return None
+        cookies = [_clean_cookie(c) for c in cookies if isinstance(c, dict) and "name" in c]
+        return cls(cookies, {}, base_url, saved_at=saved_at,
+                   expires_at=_expires_at(cookies, saved_at, max_age), source=os.path.basename(path))
+
+    # ---------- file ----------
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(data["cookies"], data.get("origins"), data.get("base_url"),
+                       data["saved_at"], data["expires_at"], data.get("source", "file"))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path):
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"base_url": self.base_url, "saved_at": self.saved_at, "expires_at": self.expires_at,
+                       "source": self.source, "cookies": self.cookies, "origins": self.origins}, f, indent=2)
+        os.replace(tmp, path)
+
+    # ---------- use ----------
+    def is_fresh(self, base_url=None, now=None):
+        if base_url and self.base_url and _host(base_url) != _host(self.base_url):
+            return False
+        return bool(self.cookies) and (now or time.time()) < self.expires_at
+
+    def _landing_origin(self, domain):
+        """An origin whose pages may set cookies for `domain` (the site's own host when it matches)."""
+        host = (domain or "").lstrip(".")
+        if self.base_url:
+            parts = urllib.parse.urlsplit(self.base_url)
+            if not host or (parts.hostname or "").endswith(host):
+                return f"{parts.scheme}://{parts.netloc}"
+        return f"https://{host}"
+
+    def apply(self, driver):
+        """
+        Put the state into a fresh browser. Chromium takes it all through DevTools before any
+        navigation (base/storage_state.py). Elsewhere WebDriver only sets cookies for the page it is
+        on, so each cookie domain / storage origin gets one visit to a cheap URL (/robots.txt).
+        Returns the number of cookies set.
+        """
+        now = time.time()
+        if load_storage_state(driver, self.cookies, self.origins):
+            return sum(1 for c in self.cookies if not (c.get("expiry") and c["expiry"] < now))
+
+        visits = {}
+        for cookie in self.cookies:
+            if cookie.get("expiry") and cookie["expiry"] < now:
+                continue
+            visits.setdefault(self._landing_origin(cookie.get("domain")), []).append(cookie)
+        for origin in self.origins:
+            visits.setdefault(origin, [])
+
+        added = 0
+        for origin, cookies in visits.items():
+            try:
+                driver.get(f"{origin}/robots.txt")
+            except Exception:
+                continue
+            for cookie in cookies:
+                try:
+                    driver.add_cookie(cookie)
+                    added += 1
+                except Exception:
+                    pass  # domain mismatch / rejected by the browser
+            if origin in self.origins:
+                try:
+                    driver.execute_script(_WRITE_STORAGE_JS, self.origins[origin])
+                except Exception:
+                    pass
+        return added
+
+
+def _host(url):
+    return urllib.parse.urlsplit(url).netloc.lower()
+
+
+def _create_exclusive(path, content=""):
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w") as f:
+        f.write(content)
+    return True
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class _LoginLock:
+    """
+    Only one worker signs in; the others wait here and then read its state file.
+    The lock file holds the holder's pid and is touched while the sign-in runs (heartbeat).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._stop = None
+
+    def __enter__(self):
+        while not _create_exclusive(self.path, str(os.getpid())):
+            if self._abandoned():
+                self._break()
+            else:
+                time.sleep(0.2)
+        self._stop = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(self._stop,), daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        _remove(self.path)
+
+    def _heartbeat(self, stop):
+        while not stop.wait(LOGIN_LOCK_HEARTBEAT_SECONDS):
+            try:
+                os.utime(self.path)
+            except OSError:
+                pass
+
+    def _abandoned(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                holder = f.read().strip()
+            idle = time.time() - os.path.getmtime(self.path)
+        except OSError:
+            return False  # released meanwhile: just try again
+        if holder.isdigit():
+            return not pid_alive(int(holder))
+        # no pid (being written, or left by an older version): trust the heartbeat
+        return idle > LOGIN_LOCK_STALE_SECONDS
+
+    def _break(self):
+        # one waiter at a time, or a second one could remove the lock the first has just taken
+        guard = self.path + ".break"
+        if not _create_exclusive(guard):
+            try:
+                if time.time() - os.path.getmtime(guard) > 10:  # its breaker died mid-way
+                    _remove(guard)
+            except OSError:
+                pass
+            time.sleep(0.2)
+            return
+        try:
+            if self._abandoned():
+                print(f"🔓 removing login lock of a worker that is gone: {self.path}")
+                _remove(self.path)
+        finally:
+            _remove(guard)
+
+
+class AuthSession:
+    """
+    Session-level provider of the signed-in state.
+    - path: state file (shared by all workers)
+    - base_url: site under test
+    - login: callable(driver) doing a real sign-in in that browser, returning an AuthState or None
+    - import_paths: cookie dumps to import when there is no fresh state file
+    - max_age: seconds a new state is trusted
+    """
+
+    def __init__(self, path, base_url=None, login=None, import_paths=(), max_age=DEFAULT_MAX_AGE):
+        self.path = path
+        self.base_url = base_url
+        self.login = login
+        self.import_paths = list(import_paths)
+        self.max_age = max_age
+        self._state = None
+        self.logins = 0
+
+    def _fresh(self, state):
+        return state if state and state.is_fresh(self.base_url) else None
+
+    def _import(self):
+        for path in self.import_paths:
+            state = self._fresh(AuthState.from_cookies_file(path, self.base_url, self.max_age))
+            if state:
+                print(f"🔑 signed-in state imported from {path}")
+                return state
+        return None
+
+    def state(self, driver=None):
+        """
+        A fresh AuthState (memory, file, import or one sign-in in `driver`), or None if none can be had.
+        The sign-in uses the caller's browser: a second one may not fit under --max-browsers.
+        """
+        if self._fresh(self._state):
+            return self._state
+        state = self._fresh(AuthState.load(self.path))
+        if not state:
+            with _LoginLock(self.path + ".lock"):
+                # another worker may have signed in while we waited for the lock
+                state = self._fresh(AuthState.load(self.path)) or self._import()
+                if not state and self.login and driver is not None:
+                    print("🔑 no fresh signed-in state; signing in once for this run")
+                    state = self._fresh(self.login(driver))
+                    self.logins += 1 if state else 0
+                if state:
+                    state.save(self.path)
+        self._state = state
+        return state
+
+    def store(self, driver, source="login"):
+        """Save the state of a browser that just signed in (e.g. at the end of test_user_login)."""
+        state = AuthState.capture(driver, self.base_url, self.max_age, source=source)
+        if state.cookies:
+            state.save(self.path)
+            self._state = state
+        return state
+
+    def apply(self, driver):
+        """Inject the signed-in state into `driver`; returns the AuthState (None = nothing to inject)."""
+        logins = self.logins
+        state = self.state(driver)
+        if state and self.logins == logins:  # a browser that just signed in already has it
+            state.apply(driver)
+        return state
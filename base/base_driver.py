@@ -15,23 +15,333 @@
 #             EC.presence_of_all_elements_located(locator)
 #         )
 
+import time
+import weakref
 import allure
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import InvalidSelectorException, TimeoutException, WebDriverException
+
+from base.bot_wall import _WAIT_BOT_WALL_CLEARED_JS, BotWallDetected, _script_args, detect_bot_wall
+from base.site import current_site
+
+
+class By:
+    """
+    Selenium's locator strategies (the same strings as selenium.webdriver.common.by.By).
+    Importing anything under selenium.webdriver loads the Chrome, Firefox and Edge bindings, so
+    page objects and tests take their locators from here and collection stays cheap.
+    """
+    ID = "id"
+    XPATH = "xpath"
+    LINK_TEXT = "link text"
+    PARTIAL_LINK_TEXT = "partial link text"
+    NAME = "name"
+    TAG_NAME = "tag name"
+    CLASS_NAME = "class name"
+    CSS_SELECTOR = "css selector"
+
+# Resolves as soon as the locator matches: checks once, then re-checks on every DOM mutation
+# (coalesced to one query per microtask) until the in-page timer expires -> null.
+_WAIT_FOR_LOCATOR_JS = """
+var kind = arguments[0], query = arguments[1], wantAll = arguments[2], timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+var badSelector = null;
+function find() {
+  try {
+    if (kind === 'xpath') {
+      var snap = document.evaluate(query, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      var out = [];
+      for (var i = 0; i < snap.snapshotLength; i++) out.push(snap.snapshotItem(i));
+      return out;
+    }
+    return Array.prototype.slice.call(document.querySelectorAll(query));
+  } catch (e) { badSelector = String((e && e.message) || e); return []; }
+}
+var hits = find();
+// a broken selector never matches: report it now instead of waiting out the timeout
+if (badSelector !== null) { done({invalidSelector: badSelector}); return; }
+if (hits.length) { done(wantAll ? hits : hits[0]); return; }
+var finished = false, pending = false, observer, timer;
+function finish(result) {
+  if (finished) return;
+  finished = true;
+  if (observer) observer.disconnect();
+  clearTimeout(timer);
+  done(result);
+}
+function check() {
+  pending = false;
+  var found = find();
+  if (found.length) finish(wantAll ? found : found[0]);
+}
+observer = new MutationObserver(function () {
+  if (!pending) { pending = true; Promise.resolve().then(check); }
+});
+observer.observe(document.documentElement || document, {childList: true, subtree: true, attributes: true, characterData: true});
+timer = setTimeout(function () { finish(null); }, timeoutMs);
+"""
+
+# Evaluates an ordered list of [kind, query] locators in one round trip and returns
+# [element, index] for the first visible match, or null.
+_FIRST_VISIBLE_JS = """
+var locators = arguments[0];
+function visible(el) {
+  if (!el || !el.isConnected) return false;
+  var style = window.getComputedStyle(el);
+  if (style.display === 'none' || style.visibility === 'hidden' || parseFloat(style.opacity) === 0) return false;
+  var rect = el.getBoundingClientRect();
+  return rect.width > 0 && rect.height > 0;
+}
+for (var i = 0; i < locators.length; i++) {
+  var kind = locators[i][0], query = locators[i][1], nodes = [];
+  try {
+    if (kind === 'xpath') {
+      var snap = document.evaluate(query, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      for (var j = 0; j < snap.snapshotLength; j++) nodes.push(snap.snapshotItem(j));
+    } else {
+      nodes = document.querySelectorAll(query);
+    }
+  } catch (e) { continue; }
+  for (var k = 0; k < nodes.length; k++) {
+    if (visible(nodes[k])) return [nodes[k], i];
+  }
+}
+return null;
+"""
+
+# driver -> (script timeout we raised it to, its timeout before that), so it is only raised when a
+# longer wait needs it and the pool can put the original back (restore_script_timeout)
+_script_timeouts = weakref.WeakKeyDictionary()
+DEFAULT_SCRIPT_TIMEOUT = 30  # W3C default, used when the driver can't tell us its own
+
+
+def restore_script_timeout(driver):
+    """Undo what the in-page waits did to the driver's script timeout (DriverPool calls this on release)."""
+    try:
+        raised = _script_timeouts.pop(driver, None)
+    except TypeError:  # not weak-referenceable: never raised
+        return
+    if raised:
+        try:
+            driver.set_script_timeout(raised[1])
+        except Exception:
+            pass
+
+
+def as_locator(selector):
+    """A (By, value) tuple as-is; a bare string is XPath when it starts with '/', './' or '(' else CSS."""
+    if isinstance(selector, (tuple, list)):
+        return tuple(selector)
+    text = selector.strip()
+    if text.startswith(("/", "./", "(")):
+        return By.XPATH, text
+    return By.CSS_SELECTOR, text
+
+
+def _locator_to_query(locator):
+    """(By, value) -> ('css' | 'xpath', query) for in-page scripts, or None if not expressible."""
+    by, value = locator
+    if by == By.CSS_SELECTOR or by == By.TAG_NAME:
+        return "css", value
+    if by == By.XPATH:
+        return "xpath", value
+    if by in (By.ID, By.NAME) and '"' not in value:
+        return "css", f'[{"id" if by == By.ID else "name"}="{value}"]'
+    if by == By.CLASS_NAME and '"' not in value:
+        return "css", f'[class~="{value}"]'
+    return None
 
 
 class BaseDriver:
-    def __init__(self, driver):
+    # locator that exists once the page is usable for our tests (overridden by each page object)
+    READY_LOCATOR = None
+
+    def __init__(self, driver, site=None):
         self.driver = driver
+        # live eBay or the --base-url / --standin host
+        self.site = site or current_site()
 
     @allure.step("Waiting for element: {locator}")
     def wait_for_element(self, locator, timeout=30):
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located(locator)
-        )
+        return self._wait_for_locator(locator, timeout, want_all=False)
 
     @allure.step("Waiting for elements: {locator}")
     def wait_for_elements(self, locator, timeout=30):
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_all_elements_located(locator)
+        return self._wait_for_locator(locator, timeout, want_all=True)
+
+    def _wait_for_locator(self, locator, timeout, want_all):
+        """
+        Event-driven presence wait: a MutationObserver inside the page resolves the moment the
+        locator matches, instead of WebDriverWait polling every 500 ms. Same contract as
+        EC.presence_of_element_located / presence_of_all_elements_located: returns the element
+        (or non-empty list) or raises TimeoutException after `timeout` seconds; an invalid CSS / XPath
+        selector raises InvalidSelectorException right away.
+        Falls back to polling if the page navigates away repeatedly or the driver can't run async JS.
+        """
+        query = _locator_to_query(locator)
+        end = time.time() + timeout
+        failures = 0
+        while query and failures < 3:
+            remaining = end - time.time()
+            if remaining <= 0:
+                break
+            try:
+                self._ensure_script_timeout(remaining + 5)
+                result = self.driver.execute_async_script(
+                    _WAIT_FOR_LOCATOR_JS, query[0], query[1], want_all, int(remaining * 1000)
+                )
+                if isinstance(result, dict) and "invalidSelector" in result:
+                    raise InvalidSelectorException(f"Invalid selector {locator}: {result['invalidSelector']}")
+                if result:
+                    return result
+                break  # in-page timer expired
+            except TimeoutException:
+                break
+            except InvalidSelectorException:
+                raise
+            except (WebDriverException, AttributeError, NotImplementedError):
+                # document unloaded mid-wait (navigation) or no async script support
+                failures += 1
+
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        condition = EC.presence_of_all_elements_located if want_all else EC.presence_of_element_located
+        return WebDriverWait(self.driver, max(0, end - time.time())).until(
+            condition(locator), message=f"Timed out after {timeout}s waiting for {locator}"
         )
+
+    def find_first_visible(self, selectors):
+        """
+        "First match wins" over an ordered list of CSS / XPath selectors (strings or (By, value)
+        tuples), evaluated in a single injected script instead of a find_element + is_displayed
+        round trip per selector.
+        Returns (element, selector) for the first selector with a visible match, else (None, None).
+        """
+        locators = [as_locator(sel) for sel in selectors]
+        queries = [_locator_to_query(loc) for loc in locators]
+        if all(queries):
+            try:
+                hit = self.driver.execute_script(_FIRST_VISIBLE_JS, [list(q) for q in queries])
+                if not hit:
+                    return None, None
+                return hit[0], selectors[int(hit[1])]
+            except Exception:
+                pass
+
+        # fallback (e.g. link-text locators): one selector at a time
+        for sel, loc in zip(selectors, locators):
+            try:
+                for el in self.driver.find_elements(*loc):
+                    if el.is_displayed():
+                        return el, sel
+            except Exception:
+                continue
+        return None, None
+
+    def _ensure_script_timeout(self, seconds):
+        try:
+            current, original = _script_timeouts.get(self.driver, (0, None))
+            if current >= seconds:
+                return
+            if original is None:
+                try:
+                    original = self.driver.timeouts.script
+                except Exception:
+                    original = DEFAULT_SCRIPT_TIMEOUT
+            wanted = max(seconds, 60)
+            self.driver.set_script_timeout(wanted)
+            _script_timeouts[self.driver] = (wanted, original)
+        except TypeError:
+            pass
+
+    def is_ready(self):
+        """Readiness contract of the page: its READY_LOCATOR is present (no wait)."""
+        if self.READY_LOCATOR is None:
+            return True
+        try:
+            return bool(self.driver.find_elements(*self.READY_LOCATOR))
+        except Exception:
+            return False
+
+    def wait_until_ready(self, timeout=30):
+        """
+        Block until the page's READY_LOCATOR exists, independent of the load event, so runs with
+        --page-load-strategy=eager|none continue as soon as the elements we need are there.
+        Returns self for chaining.
+        """
+        if self.READY_LOCATOR is not None:
+            with allure.step(f"Waiting for {self.__class__.__name__} to be ready"):
+                self.wait_for_element(self.READY_LOCATOR, timeout)
+        return self
+
+    def open(self, url, timeout=30):
+        """Navigate to url and wait for this page's readiness contract."""
+        self.driver.get(url)
+        return self.wait_until_ready(timeout)
+
+    def guard_bot_wall(self, raise_on_wall=False):
+        """
+        Cheap post-navigation check (one script call) for a CAPTCHA / verification wall.
+        Returns the BotWallVerdict; with raise_on_wall=True a wall raises BotWallDetected.
+        """
+        verdict = detect_bot_wall(self.driver)
+        if verdict:
+            print(f"🛑 {verdict}")
+            if raise_on_wall:
+                try:
+                    url = self.driver.current_url
+                except Exception:
+                    url = ""
+                raise BotWallDetected(verdict, url)
+        return verdict
+
+    def wait_for_bot_wall_cleared(self, timeout=180):
+        """
+        Wait for a CAPTCHA / verification wall to go away (someone solving it by hand).
+        A MutationObserver in the page answers the moment the wall is gone, instead of polling
+        every few seconds; navigations (the solved form submitting) are re-checked on the new page.
+        Returns True once the page is clear, False after `timeout` seconds.
+        """
+        end = time.time() + timeout
+        failures = 0
+        while failures < 5:
+            remaining = end - time.time()
+            if remaining <= 0:
+                return not detect_bot_wall(self.driver)
+            try:
+                self._ensure_script_timeout(remaining + 5)
+                outcome = self.driver.execute_async_script(
+                    _WAIT_BOT_WALL_CLEARED_JS, *_script_args(), int(remaining * 1000)
+                )
+            except TimeoutException:
+                return not detect_bot_wall(self.driver)
+            except (WebDriverException, AttributeError, NotImplementedError):
+                # document unloaded mid-wait (navigation) or no async script support
+                failures += 1
+                continue
+            if outcome == "cleared":
+                return True
+            if outcome != "navigated":
+                return not detect_bot_wall(self.driver)  # in-page timer expired
+            # same-document URL change: look again on the new state
+
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        try:
+            WebDriverWait(self.driver, max(0, end - time.time())).until(lambda d: not detect_bot_wall(d))
+            return True
+        except TimeoutException:
+            return False
+
+    def wait_for_new_window(self, handles_before, timeout=10):
+        """Wait for a tab opened via window.open(); returns its handle (None if none appeared)."""
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        try:
+            WebDriverWait(self.driver, timeout).until(lambda d: len(d.window_handles) > len(handles_before))
+        except Exception:
+            return None
+        for handle in self.driver.window_handles[::-1]:
+            if handle not in handles_before:
+                return handle
+        return None
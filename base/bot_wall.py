@@ -0,0 +1,126 @@
+# base/bot_wall.py
+from collections import namedtuple
+
+# what eBay's hCaptcha / reCAPTCHA / "security measure" pages put in front of the real page
+CAPTCHA_IFRAME_PATTERNS = ("hcaptcha", "recaptcha", "captcha")
+CAPTCHA_CONTAINERS = ".h-captcha, .h-captcha-checkbox, .g-recaptcha, .captcha"
+CAPTCHA_PHRASES = (
+    "please verify yourself",
+    "verify yourself",
+    "please verify",
+    "security check",
+    "select the images",
+    "i am not a robot",
+)
+CAPTCHA_URL_PARTS = ("/splashui/captcha",)
+
+# All heuristics in one round trip, cheapest first; botWall(...) returns [reason, detail] or null.
+# Text is matched inside the page instead of sending body.text over the wire.
+_BOT_WALL_FN_JS = """
+function botWall(iframePatterns, containers, phrases, urlParts) {
+  var url = String(location.href).toLowerCase();
+  for (var u = 0; u < urlParts.length; u++) {
+    if (url.indexOf(urlParts[u]) !== -1) return ['url', urlParts[u]];
+  }
+  var frames = document.querySelectorAll('iframe[src]');
+  for (var i = 0; i < frames.length; i++) {
+    var src = (frames[i].getAttribute('src') || '').toLowerCase();
+    for (var p = 0; p < iframePatterns.length; p++) {
+      if (src.indexOf(iframePatterns[p]) !== -1) return ['iframe', src.slice(0, 200)];
+    }
+  }
+  var box = document.querySelector(containers);
+  if (box) return ['container', box.getAttribute('class') || box.tagName];
+  var text = document.body ? (document.body.innerText || '').toLowerCase() : '';
+  for (var t = 0; t < phrases.length; t++) {
+    if (text.indexOf(phrases[t]) !== -1) return ['text', phrases[t]];
+  }
+  return null;
+}
+"""
+
+_DETECT_BOT_WALL_JS = _BOT_WALL_FN_JS + """
+return botWall(arguments[0], arguments[1], arguments[2], arguments[3]);
+"""
+
+# Resolves 'cleared' the moment the wall is gone (re-checked on every DOM mutation, coalesced to
+# one check per microtask), 'navigated' when the URL changes, 'timeout' when the in-page timer expires.
+# A real navigation unloads the document under the script; the caller sees a WebDriverException.
+_WAIT_BOT_WALL_CLEARED_JS = _BOT_WALL_FN_JS + """
+var args = arguments, timeoutMs = arguments[4], done = arguments[arguments.length - 1];
+var startUrl = location.href, finished = false, scheduled = false, observer = null, timer = null;
+function finish(outcome) {
+  if (finished) return;
+  finished = true;
+  if (observer) observer.disconnect();
+  clearTimeout(timer);
+  window.removeEventListener('popstate', check);
+  window.removeEventListener('hashchange', check);
+  done(outcome);
+}
+function check() {
+  if (finished) return;
+  if (location.href !== startUrl) return finish('navigated');
+  if (!document.body) return;  // new document still parsing; DOMContentLoaded re-checks
+  if (!botWall(args[0], args[1], args[2], args[3])) finish('cleared');
+}
+check();
+if (!finished) {
+  observer = new MutationObserver(function () {
+    if (scheduled) return;
+    scheduled = true;
+    Promise.resolve().then(function () { scheduled = false; check(); });
+  });
+  observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+  document.addEventListener('DOMContentLoaded', check);
+  window.addEventListener('popstate', check);
+  window.addEventListener('hashchange', check);
+  timer = setTimeout(function () { finish('timeout'); }, timeoutMs);
+}
+"""
+
+
+class BotWallVerdict(namedtuple("BotWallVerdict", "detected reason detail")):
+    """
+    Result of detect_bot_wall. Truthy when a wall was found.
+    - reason: url | iframe | container | text (None when clear)
+    - detail: the matching URL part, iframe src, container class or phrase
+    """
+
+    __slots__ = ()
+
+    def __bool__(self):
+        return bool(self.detected)
+
+    def __str__(self):
+        return f"bot wall ({self.reason}: {self.detail})" if self.detected else "no bot wall"
+
+
+CLEAR = BotWallVerdict(False, None, "")
+
+
+class BotWallDetected(AssertionError):
+    """Raised by BaseDriver.guard_bot_wall(raise_on_wall=True)."""
+
+    def __init__(self, verdict, url=""):
+        super().__init__(f"{verdict} on {url}" if url else str(verdict))
+        self.verdict = verdict
+
+
+def _script_args():
+    return [list(CAPTCHA_IFRAME_PATTERNS), CAPTCHA_CONTAINERS, list(CAPTCHA_PHRASES), list(CAPTCHA_URL_PARTS)]
+
+
+def detect_bot_wall(driver):
+    """
+    One script call checking the current page for a CAPTCHA / verification wall:
+    challenge URL, captcha iframes, captcha containers, then the visible text.
+    Returns a BotWallVerdict (CLEAR if the page can't be inspected).
+    """
+    try:
+        hit = driver.execute_script(_DETECT_BOT_WALL_JS, *_script_args())
+    except Exception:
+        return CLEAR
+    if not hit:
+        return CLEAR
+    return BotWallVerdict(True, hit[0], str(hit[1]))
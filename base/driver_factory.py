@@ -0,0 +1,156 @@
+# base/driver_factory.py
+import os
+
+from base.driver_resolver import DriverResolver
+
+# selenium's browser modules are imported inside the functions below: collecting tests, unit-test
+# runs and --browser=fake never pay for them, and a chrome run never loads firefox / edge code
+
+SUPPORTED_BROWSERS = ("chrome", "firefox", "edge")
+
+
+def is_ci():
+    return bool(os.getenv("CI") or os.getenv("GITHUB_ACTIONS"))
+
+
+def uses_persistent_profile(browser):
+    """True when the browser runs on a real user profile whose cookies must survive between tests."""
+    return browser == "chrome" and not is_ci() and bool(os.getenv("CHROME_USER_DATA"))
+
+
+def build_options(browser):
+    """Browser options for chrome | firefox | edge (headless + CI flags on CI, visible locally)."""
+    # ---------- CHROME ----------
+    if browser == "chrome":
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+        options = ChromeOptions()
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option("useAutomationExtension", False)
+        options.add_argument(
+            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/120.0.0.0 Safari/537.36"
+        )
+
+        if is_ci():
+            # CI: use system-installed chromium
+            # Try to set binary_location sensibly for ubuntu runners
+            if os.path.exists("/usr/bin/chromium-browser"):
+                options.binary_location = "/usr/bin/chromium-browser"
+            elif os.path.exists("/usr/bin/chromium"):
+                options.binary_location = "/usr/bin/chromium"
+            # headless & CI-friendly flags
+            options.add_argument("--headless=new")
+            options.add_argument("--no-sandbox")
+            options.add_argument("--disable-dev-shm-usage")
+            options.add_argument("--disable-gpu")
+            options.add_argument("--window-size=1920,1080")
+        else:
+            # Local dev: allow using local Chrome profile
+            ud = os.getenv("CHROME_USER_DATA")
+            pd = os.getenv("CHROME_PROFILE_DIR")
+            if ud:
+                options.add_argument(f"--user-data-dir={ud}")
+            if pd:
+                options.add_argument(f"--profile-directory={pd}")
+            # do not start headless locally so you can manually solve captchas
+        return options
+
+    # ---------- FIREFOX ----------
+    if browser == "firefox":
+        from selenium.webdriver.firefox.options import Options as FirefoxOptions
+        options = FirefoxOptions()
+        options.set_preference("dom.webdriver.enabled", False)
+        options.set_preference("useAutomationExtension", False)
+        if is_ci():
+            options.add_argument("--headless")
+        return options
+
+    # ---------- EDGE ----------
+    if browser == "edge":
+        from selenium.webdriver.edge.options import Options as EdgeOptions
+        options = EdgeOptions()
+        if is_ci():
+            options.add_argument("--headless=new")
+            options.add_argument("--no-sandbox")
+            options.add_argument("--disable-dev-shm-usage")
+            options.add_argument("--window-size=1920,1080")
+        else:
+            options.add_argument("start-maximized")
+        return options
+
+    raise ValueError(f"Browser '{browser}' is not supported. Use chrome | firefox | edge.")
+
+
+def build_service(browser, resolver=None):
+    """
+    Unstarted driver service (chromedriver / geckodriver / msedgedriver) for the browser.
+    The binary comes from `resolver` (disk-cached lookup or --driver-path); CI uses the
+    system chromedriver unless a path is forced.
+    """
+    if browser == "chrome" and is_ci() and not (resolver and resolver.override_path):
+        from selenium.webdriver.chrome.service import Service as ChromeService
+        # Use system chromedriver path (installed on the runner)
+        return ChromeService(executable_path="/usr/bin/chromedriver")
+
+    path = (resolver or DriverResolver()).resolve(browser)
+    if browser == "chrome":
+        from selenium.webdriver.chrome.service import Service as ChromeService
+        return ChromeService(executable_path=path)
+    if browser == "firefox":
+        from selenium.webdriver.firefox.service import Service as FirefoxService
+        return FirefoxService(executable_path=path)
+    if browser == "edge":
+        from selenium.webdriver.edge.service import Service as EdgeService
+        return EdgeService(executable_path=path)
+    raise ValueError(f"Browser '{browser}' is not supported. Use chrome | firefox | edge.")
+
+
+def build_driver(browser, services=None, resolver=None, lean=None, page_load_strategy=None, proxy=None):
+    """
+    Launch a new browser session for the given browser name (chrome | firefox | edge | fake).
+    CI runs headless on the system chromium/chromedriver; local runs stay visible so
+    CAPTCHAs can be solved by hand.
+    - services: optional DriverServiceManager; the session then attaches to its shared
+      driver process instead of starting a new one
+    - resolver: DriverResolver used to find the driver binary for a per-session service
+    - lean: optional LeanMode blocking images/fonts/trackers (Chromium only)
+    - page_load_strategy: normal | eager | none; with eager/none driver.get() returns before the
+      load event and page objects wait for their own readiness locator instead
+    - proxy: optional TrafficProxy (--record / --replay) the browser is routed through
+    """
+    browser = (browser or "chrome").lower()
+    if browser == "fake":
+        # browserless: page objects run against a parsed DOM (see base/fake_driver.py)
+        from base.fake_driver import FakeDriver
+        return FakeDriver(proxy=proxy.address if proxy else None)
+
+    options = build_options(browser)
+    if page_load_strategy:
+        options.page_load_strategy = page_load_strategy
+    if lean:
+        lean.apply_to_options(browser, options)
+    if proxy:
+        proxy.apply_to_options(browser, options)
+
+    from selenium import webdriver
+
+    if services is not None:
+        driver = services.connect(browser, options)
+    elif browser == "chrome":
+        driver = webdriver.Chrome(service=build_service(browser, resolver), options=options)
+    elif browser == "firefox":
+        driver = webdriver.Firefox(service=build_service(browser, resolver), options=options)
+    else:
+        driver = webdriver.Edge(service=build_service(browser, resolver), options=options)
+
+    if lean:
+        lean.apply_to_driver(browser, driver)
+
+    try:
+        driver.maximize_window()
+    except Exception:
+        pass
+
+    return driver
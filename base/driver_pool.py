@@ -0,0 +1,215 @@
+# base/driver_pool.py
+import threading
+
+from base.storage_state import forget_storage_state
+
+_CLEAR_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+class DriverPool:
+    """
+    Keeps launched browsers alive between tests and hands them out again after a fast reset
+    (extra tabs closed, cookies + local/session storage cleared, blank page loaded).
+
+    - factory: zero-arg callable that launches a new driver
+    - max_uses: recycle (quit + relaunch) a browser after this many tests; 1 = fresh browser per test
+    - reset_cookies: set False when running on a persistent user profile whose login must survive
+    - standby_depth: number of spare browsers launched in background threads while tests run, so a
+      recycled or crashed browser is replaced by a hand-off instead of a synchronous launch
+    - slots: optional BrowserSlots; a slot is held for the whole life of every browser (standby included).
+      Standby launches only take a slot that is free right now and are skipped otherwise
+    """
+
+    def __init__(self, factory, max_uses=20, reset_cookies=True, standby_depth=0, slots=None):
+        self.factory = factory
+        self.max_uses = max(1, int(max_uses or 1))
+        self.reset_cookies = reset_cookies
+        self.standby_depth = max(0, int(standby_depth or 0))
+        self.slots = slots
+        self._idle = []
+        self._standby = []
+        self._warming = 0
+        self._warmers = []
+        self._uses = {}
+        self._slot_of = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._closed = False
+
+    def acquire(self):
+        """
+        Return a ready-to-use driver: an idle pooled one, else a warm standby one (waiting for a
+        launch already in flight), else a new synchronous launch.
+        """
+        driver = None
+        while True:
+            with self._changed:
+                while not self._idle and not self._standby and self._warming:
+                    self._changed.wait()
+                if self._idle:
+                    driver = self._idle.pop()
+                elif self._standby:
+                    driver = self._standby.pop(0)
+                else:
+                    driver = None
+            if driver is None or self._is_alive(driver):
+                break
+            self._discard(driver)
+
+        if driver is None:
+            driver = self._launch()
+
+        # the test is about to run: use that time to get the next browser ready
+        self._top_up_standby()
+        return driver
+
+    def release(self, driver, discard=False):
+        """
+        Give a driver back after a test. It is quit instead of pooled when asked to,
+        when it reached max_uses, when the pool is closed or when the reset fails.
+        """
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+            closed = self._closed
+
+        if discard or closed or uses >= self.max_uses or not self._reset(driver):
+            self._discard(driver)
+            return
+
+        with self._changed:
+            self._idle.append(driver)
+            self._changed.notify()
+
+    def close(self):
+        """Quit every idle and standby driver, then wait for in-flight launches (which quit their
+        browser themselves); drivers released afterwards are quit immediately."""
+        with self._changed:
+            self._closed = True
+            warmers, self._warmers = self._warmers, []
+            spare = self._idle + self._standby
+            self._idle, self._standby = [], []
+            self._changed.notify_all()
+        # free the slots first: a warmer may be waiting for exactly one of them
+        for driver in spare:
+            self._discard(driver)
+        for thread in warmers:
+            thread.join()
+
+    # ---------- standby ----------
+    def _top_up_standby(self):
+        with self._lock:
+            if self._closed:
+                return
+            missing = self.standby_depth - len(self._standby) - self._warming
+            self._warming += max(0, missing)
+            self._warmers = [t for t in self._warmers if t.is_alive()]
+            for _ in range(missing):
+                thread = threading.Thread(target=self._warm_one, name="driver-standby", daemon=True)
+                self._warmers.append(thread)
+                thread.start()
+
+    def _warm_one(self):
+        driver = None
+        try:
+            if not self._closed:
+                # a spare browser is only worth it when a slot is free right now; tests wait, warmers don't
+                driver = self._launch(wait_for_slot=False)
+        except Exception as e:
+            print("standby browser launch failed:", e)
+
+        with self._changed:
+            self._warming -= 1
+            if driver is not None and not self._closed:
+                self._standby.append(driver)
+                driver = None
+            self._changed.notify_all()
+
+        if driver is not None:
+            # pool closed while this browser was starting
+            self._discard(driver)
+
+    # ---------- internals ----------
+    def _launch(self, wait_for_slot=True):
+        """Start a browser in a slot of its own. Without wait_for_slot, returns None when no slot is free."""
+        slot = None
+        if self.slots:
+            slot = self.slots.acquire() if wait_for_slot else self.slots.try_acquire()
+            if slot is None:
+                return None
+        try:
+            driver = self.factory()
+        except Exception:
+            if slot:
+                self.slots.release(slot)
+            raise
+        with self._lock:
+            self._uses[id(driver)] = 0
+            self._slot_of[id(driver)] = slot
+        return driver
+
+    def _is_alive(self, driver):
+        try:
+            return bool(driver.window_handles)
+        except Exception:
+            return False
+
+    def _reset(self, driver):
+        """Bring a used browser back to a clean single blank tab. Returns False if the session is broken."""
+        try:
+            handles = driver.window_handles
+            if not handles:
+                return False
+
+            # clear storage of every tab's origin, closing all but the first tab
+            for handle in reversed(handles):
+                driver.switch_to.window(handle)
+                try:
+                    driver.execute_script(_CLEAR_STORAGE_JS)
+                except Exception:
+                    pass
+                if handle != handles[0]:
+                    driver.close()
+            driver.switch_to.window(handles[0])
+
+            if self.reset_cookies:
+                self._clear_cookies(driver)
+            # storage seeded for a signed-in test must not leak into the next one
+            forget_storage_state(driver)
+            # nor a script timeout raised by a long in-page wait
+            from base.base_driver import restore_script_timeout
+
+            restore_script_timeout(driver)
+
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+
+    def _clear_cookies(self, driver):
+        # Chromium can drop cookies of every domain in one call; WebDriver only sees the current domain
+        execute_cdp_cmd = getattr(driver, "execute_cdp_cmd", None)
+        if execute_cdp_cmd:
+            try:
+                execute_cdp_cmd("Network.clearBrowserCookies", {})
+                return
+            except Exception:
+                pass
+        try:
+            driver.delete_all_cookies()
+        except Exception:
+            pass
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            slot = self._slot_of.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        if slot:
+            self.slots.release(slot)
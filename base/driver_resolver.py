@@ -0,0 +1,132 @@
+# base/driver_resolver.py
+import json
+import os
+import subprocess
+import threading
+import time
+
+CACHE_DIR = os.getenv("DRIVER_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "ebay_capstone")
+CACHE_FILE = os.path.join(CACHE_DIR, "drivers.json")
+# when the installed browser version can't be read the driver is cached under "<browser>:unknown";
+# nothing tells us the browser was updated, so that entry is trusted for a day only
+UNKNOWN_VERSION = "unknown"
+UNKNOWN_VERSION_TTL = int(os.getenv("DRIVER_CACHE_UNKNOWN_TTL", str(24 * 3600)))
+
+# browser name -> webdriver_manager browser type used for the installed-version lookup
+_BROWSER_TYPES = {"chrome": "google-chrome", "edge": "edge", "firefox": "firefox"}
+
+
+def installed_browser_version(browser):
+    """Version of the locally installed browser (read from the OS, no network). None if unknown."""
+    try:
+        # imported lazily, like the downloaders below: only a real browser launch needs it
+        from webdriver_manager.core.os_manager import OperationSystemManager
+        return OperationSystemManager().get_browser_version_from_os(_BROWSER_TYPES[browser])
+    except Exception:
+        return None
+
+
+def _download_driver(browser):
+    # imported lazily: only needed on a cache miss
+    if browser == "chrome":
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    if browser == "edge":
+        from webdriver_manager.microsoft import EdgeChromiumDriverManager
+        return EdgeChromiumDriverManager().install()
+    if browser == "firefox":
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
+    raise ValueError(f"Browser '{browser}' is not supported. Use chrome | firefox | edge.")
+
+
+def _driver_version(path):
+    try:
+        out = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+        return (out or "").strip() or None
+    except Exception:
+        return None
+
+
+class DriverResolver:
+    """
+    Finds the driver binary for a browser once per session and remembers it on disk, keyed by
+    the installed browser version. After the first resolution no version check / network call
+    happens until the browser itself is updated.
+
+    - cache_file: JSON file holding {"<browser>:<browser version>": {"path", "driver_version", ...}};
+      the version is "unknown" when the OS can't tell it (that entry expires after UNKNOWN_VERSION_TTL)
+    - override_path: explicit driver binary (--driver-path), used as-is for every browser
+    """
+
+    def __init__(self, cache_file=CACHE_FILE, override_path=None):
+        self.cache_file = cache_file
+        self.override_path = override_path
+        self._resolved = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, browser):
+        """Path to the driver binary for `browser`."""
+        if self.override_path:
+            if not os.path.isfile(self.override_path):
+                raise ValueError(f"--driver-path is not a file: {self.override_path}")
+            return self.override_path
+
+        with self._lock:
+            if browser not in self._resolved:
+                self._resolved[browser] = self._resolve_uncached(browser)
+            return self._resolved[browser]
+
+    # ---------- internals ----------
+    def _resolve_uncached(self, browser):
+        version = installed_browser_version(browser)
+        cache = self._load()
+        key = f"{browser}:{version or UNKNOWN_VERSION}"
+
+        entry = cache.get(key)
+        if entry and os.path.isfile(entry.get("path", "")):
+            if version or time.time() - entry.get("resolved_at", 0) < UNKNOWN_VERSION_TTL:
+                return entry["path"]
+
+        try:
+            path = _download_driver(browser)
+        except Exception:
+            # offline and the browser version could not be matched: fall back to the newest known driver
+            fallback = self._latest_cached(cache, browser)
+            if fallback:
+                print(f"⚠️ Driver lookup failed, using cached {browser} driver: {fallback}")
+                return fallback
+            raise
+
+        cache[key] = {
+            "path": path,
+            "browser_version": version or UNKNOWN_VERSION,
+            "driver_version": _driver_version(path),
+            "resolved_at": int(time.time()),
+        }
+        self._save(cache)
+        return path
+
+    def _latest_cached(self, cache, browser):
+        entries = [e for k, e in cache.items() if k.startswith(browser + ":") and os.path.isfile(e.get("path", ""))]
+        if not entries:
+            return None
+        return max(entries, key=lambda e: e.get("resolved_at", 0))["path"]
+
+    def _load(self):
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save(self, cache):
+        # write-then-rename so parallel workers never read a half-written file
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp = f"{self.cache_file}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp, self.cache_file)
+        except Exception as e:
+            print("driver cache not saved:", e)
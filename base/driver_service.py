@@ -0,0 +1,167 @@
+# base/driver_service.py
+import threading
+
+# selenium is imported where a service is started / attached (see base/driver_factory.py)
+
+# geckodriver only serves one session at a time; chromedriver / msedgedriver serve many
+_SESSIONS_PER_SERVICE = {"chrome": None, "edge": None, "firefox": 1}
+
+
+class _ServiceEntry:
+    def __init__(self, service, browser_path):
+        self.service = service
+        self.browser_path = browser_path
+        self.sessions = 0
+
+
+class _ServiceLease:
+    """Stands in for driver.service on attached sessions: driver.quit() releases the lease
+    instead of stopping the shared driver process."""
+
+    def __init__(self, manager, browser, entry):
+        self._manager = manager
+        self._browser = browser
+        self._entry = entry
+        self._released = False
+
+    @property
+    def service_url(self):
+        return self._entry.service.service_url
+
+    def stop(self):
+        if not self._released:
+            self._released = True
+            self._manager._release(self._browser, self._entry)
+
+
+class DriverServiceManager:
+    """
+    Starts chromedriver / msedgedriver / geckodriver once per session and connects new browser
+    sessions to the already running process, instead of spawning one driver process per test.
+    A service is health-checked before every connect and restarted if it crashed.
+
+    - service_factory: callable(browser) -> unstarted selenium Service for that browser
+    """
+
+    def __init__(self, service_factory):
+        self.service_factory = service_factory
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def connect(self, browser, options):
+        """Open a new browser session on the shared driver service for `browser`."""
+        entry = self._lease(browser, options)
+        try:
+            driver = self._attach(browser, entry, options)
+        except Exception:
+            healthy = self._is_healthy(entry)
+            self._release(browser, entry, broken=not healthy)
+            if healthy:
+                raise
+            # the service died between the health check and the new-session call: restart once
+            entry = self._lease(browser, options)
+            try:
+                driver = self._attach(browser, entry, options)
+            except Exception:
+                self._release(browser, entry)
+                raise
+        driver.service = _ServiceLease(self, browser, entry)
+        return driver
+
+    def stop_all(self):
+        """Stop every driver process started by this manager."""
+        with self._lock:
+            entries, self._entries = self._entries, {}
+        for browser_entries in entries.values():
+            for entry in browser_entries:
+                self._stop(entry)
+
+    # ---------- internals ----------
+    def _lease(self, browser, options):
+        capacity = _SESSIONS_PER_SERVICE.get(browser)
+        with self._lock:
+            entries = self._entries.setdefault(browser, [])
+            for entry in list(entries):
+                if not self._is_healthy(entry):
+                    entries.remove(entry)
+                    self._stop(entry)
+                    continue
+                if capacity is None or entry.sessions < capacity:
+                    entry.sessions += 1
+                    return entry
+
+        # nothing running (or all busy): start a new service outside the lock, it takes a moment
+        entry = self._start(browser, options)
+        with self._lock:
+            entry.sessions += 1
+            self._entries.setdefault(browser, []).append(entry)
+        return entry
+
+    def _release(self, browser, entry, broken=False):
+        with self._lock:
+            entry.sessions = max(0, entry.sessions - 1)
+            entries = self._entries.get(browser, [])
+            if broken and entry in entries:
+                entries.remove(entry)
+            else:
+                return
+        self._stop(entry)
+
+    def _start(self, browser, options):
+        from selenium.webdriver.common.driver_finder import DriverFinder
+
+        service = self.service_factory(browser)
+        finder = DriverFinder(service, options)
+        service.path = service.env_path() or finder.get_driver_path()
+        browser_path = finder.get_browser_path()
+        service.start()
+        return _ServiceEntry(service, browser_path)
+
+    def _is_healthy(self, entry):
+        try:
+            process = entry.service.process
+            return process is not None and process.poll() is None and entry.service.is_connectable()
+        except Exception:
+            return False
+
+    def _stop(self, entry):
+        try:
+            entry.service.stop()
+        except Exception:
+            pass
+
+    def _attach(self, browser, entry, options):
+        from selenium import webdriver
+        from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+        from selenium.webdriver.firefox.remote_connection import FirefoxRemoteConnection
+        from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+        # mirror what webdriver.Chrome/Edge/Firefox do in __init__, minus starting the service
+        if entry.browser_path and not getattr(options, "binary_location", None):
+            options.binary_location = entry.browser_path
+            options.browser_version = None
+
+        url = entry.service.service_url
+        if browser == "firefox":
+            cls = webdriver.Firefox
+            executor = FirefoxRemoteConnection(
+                remote_server_addr=url, keep_alive=True, ignore_proxy=options._ignore_local_proxy
+            )
+        elif browser == "edge":
+            cls = webdriver.Edge
+            executor = ChromiumRemoteConnection(
+                remote_server_addr=url, vendor_prefix="ms", browser_name="MicrosoftEdge",
+                keep_alive=True, ignore_proxy=options._ignore_local_proxy,
+            )
+        else:
+            cls = webdriver.Chrome
+            executor = ChromiumRemoteConnection(
+                remote_server_addr=url, vendor_prefix="goog", browser_name="chrome",
+                keep_alive=True, ignore_proxy=options._ignore_local_proxy,
+            )
+
+        # keep the browser-specific class so execute_cdp_cmd & co. stay available
+        driver = cls.__new__(cls)
+        RemoteWebDriver.__init__(driver, command_executor=executor, options=options)
+        driver._is_remote = False
+        return driver
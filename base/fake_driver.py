@@ -0,0 +1,832 @@
+# base/fake_driver.py
+"""
+Browserless stand-in for the slice of the WebDriver API our page objects and tests use:
+find_element(s), element text / attributes / clicks / send_keys, forms, tabs (window_handles,
+switch_to, window.open), cookies and the handful of scripts we inject.
+
+Pages are fetched over plain HTTP (the --standin server, a --base-url host or a --replay proxy)
+or loaded straight from an HTML snapshot, and parsed with lxml. There is no JavaScript engine:
+scripts are answered by Python handlers registered per exact script text (see register_script).
+
+    driver = FakeDriver()                      # or: pytest --browser=fake
+    driver = FakeDriver.from_html(page_source, url="https://www.ebay.com/sch/i.html?_nkw=toys")
+"""
+import base64
+import html
+import http.cookiejar
+import itertools
+import re
+import ssl
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    NoAlertPresentException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    WebDriverException,
+)
+
+from base.base_driver import By
+
+BLANK_PAGE = "<html><head></head><body></body></html>"
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) FakeDriver/1.0"
+
+# 1x1 transparent PNG handed out for screenshots
+_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+_NEVER_RENDERED = {"head", "script", "style", "title", "meta", "link", "template", "noscript", "base"}
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "fieldset", "figcaption",
+    "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav",
+    "ol", "p", "pre", "section", "table", "tr", "ul",
+}
+_SUBMIT_KEYS = ("\ue006", "\ue007")  # Keys.RETURN, Keys.ENTER
+# lxml / cssselect load on first use: page objects import this module to register their script
+# twins, and that must cost nothing at collection
+_translator = None
+
+# exact script text -> handler(driver, *args); filled by register_script
+_SCRIPT_HANDLERS = {}
+_ASYNC_SCRIPT_HANDLERS = {}
+
+
+def register_script(script, handler, is_async=False):
+    """
+    Teach FakeDriver one injected script: handler(driver, *args) returns what the script would.
+    The scripts of base/ are registered below; a page object registers the twins of its own
+    scripts when it is imported (see pages/search_results_page.py).
+    """
+    (_ASYNC_SCRIPT_HANDLERS if is_async else _SCRIPT_HANDLERS)[script] = handler
+
+
+def _css_to_xpath(css, prefix):
+    global _translator
+    if _translator is None:
+        from cssselect import HTMLTranslator
+        _translator = HTMLTranslator()
+    return _translator.css_to_xpath(css, prefix=prefix)
+
+
+def _xpath_for(by, value, relative):
+    """(By, value) -> XPath evaluated against the document (or an element when relative)."""
+    from cssselect import SelectorError
+
+    prefix = "descendant::" if relative else "descendant-or-self::"
+    try:
+        if by == By.XPATH:
+            return value
+        if by == By.CSS_SELECTOR:
+            return _css_to_xpath(value, prefix)
+        if by == By.ID:
+            return f"{prefix}*[@id={_literal(value)}]"
+        if by == By.NAME:
+            return f"{prefix}*[@name={_literal(value)}]"
+        if by == By.TAG_NAME:
+            return f"{prefix}{value.lower()}"
+        if by == By.CLASS_NAME:
+            return _css_to_xpath("." + value, prefix)
+        if by == By.LINK_TEXT:
+            return f"{prefix}a[normalize-space(.)={_literal(value.strip())}]"
+        if by == By.PARTIAL_LINK_TEXT:
+            return f"{prefix}a[contains(., {_literal(value)})]"
+    except SelectorError as e:
+        raise InvalidSelectorException(f"Invalid selector {value!r}: {e}")
+    raise InvalidSelectorException(f"Unsupported locator strategy: {by}")
+
+
+def _literal(value):
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in value.split("'")) + ")"
+
+
+def _inline_hidden(node):
+    if node.tag in _NEVER_RENDERED or node.get("hidden") is not None:
+        return True
+    if node.tag == "input" and (node.get("type") or "").lower() == "hidden":
+        return True
+    style = (node.get("style") or "").replace(" ", "").lower()
+    return "display:none" in style or "visibility:hidden" in style
+
+
+class _Page:
+    """One loaded document: the parsed tree plus nodes hidden by its <style> rules."""
+
+    def __init__(self, url, source):
+        from lxml import html as lxml_html
+
+        self.url = url
+        source = source.strip() or BLANK_PAGE
+        try:
+            self.doc = lxml_html.document_fromstring(source)
+        except Exception:
+            self.doc = lxml_html.document_fromstring(BLANK_PAGE)
+        self._hidden = None
+
+    @property
+    def hidden_by_css(self):
+        if self._hidden is None:
+            from lxml.cssselect import CSSSelector
+
+            self._hidden = set()
+            for style in self.doc.iter("style"):
+                for selectors, body in re.findall(r"([^{}]+)\{([^}]*)\}", style.text or ""):
+                    body = body.replace(" ", "").lower()
+                    if "display:none" not in body and "visibility:hidden" not in body:
+                        continue
+                    for selector in selectors.split(","):
+                        try:
+                            self._hidden.update(CSSSelector(selector.strip(), translator="html")(self.doc))
+                        except Exception:
+                            continue
+        return self._hidden
+
+    def is_displayed(self, node):
+        hidden = self.hidden_by_css
+        while node is not None:
+            if not isinstance(node.tag, str):
+                return False
+            if _inline_hidden(node) or node in hidden:
+                return False
+            node = node.getparent()
+        return True
+
+
+class _Tab:
+    _ids = itertools.count(1)
+
+    def __init__(self):
+        self.handle = f"fake-window-{next(self._ids)}"
+        self.page = _Page("about:blank", BLANK_PAGE)
+        self.history = []
+        self.forward_stack = []
+        self.closed = False
+
+
+class FakeElement:
+    """WebElement look-alike over one lxml node of one loaded page."""
+
+    def __init__(self, driver, tab, page, node):
+        self._driver = driver
+        self._tab = tab
+        self._page = page
+        self._node = node
+
+    def __eq__(self, other):
+        return isinstance(other, FakeElement) and other._node is self._node
+
+    def __hash__(self):
+        return id(self._node)
+
+    def __repr__(self):
+        return f"<FakeElement {self._node.tag} id={self._node.get('id')!r}>"
+
+    # ---------- state ----------
+    def _live(self):
+        if self._tab.closed or self._tab.page is not self._page:
+            raise StaleElementReferenceException("element is not attached to the page document")
+        return self._node
+
+    @property
+    def parent(self):
+        return self._driver
+
+    @property
+    def id(self):
+        return str(id(self._node))
+
+    @property
+    def tag_name(self):
+        return self._live().tag
+
+    @property
+    def text(self):
+        node = self._live()
+        if not self._page.is_displayed(node):
+            return ""
+        return self._driver._visible_text(self._page, node)
+
+    @property
+    def location(self):
+        return {"x": 0, "y": 0}
+
+    @property
+    def size(self):
+        return {"width": 100, "height": 20}
+
+    @property
+    def rect(self):
+        return {"x": 0, "y": 0, "width": 100, "height": 20}
+
+    def get_dom_attribute(self, name):
+        return self._live().get(name)
+
+    def get_property(self, name):
+        node = self._live()
+        if name in ("href", "src", "action") and node.get(name) is not None:
+            return urllib.parse.urljoin(self._page.url, node.get(name))
+        if name == "value":
+            return self._value(node)
+        if name in ("checked", "selected", "disabled"):
+            return node.get(name) is not None
+        if name in ("textContent", "innerText"):
+            return node.text_content()
+        if name == "index" and node.tag == "option":
+            select = next(node.iterancestors("select"), None)
+            return select.xpath(".//option").index(node) if select is not None else 0
+        return node.get(name)
+
+    def get_attribute(self, name):
+        # same "property, then attribute" resolution as the real getAttribute atom
+        value = self.get_property(name)
+        if isinstance(value, bool):
+            return "true" if value else None
+        return None if value is None else str(value)
+
+    def value_of_css_property(self, name):
+        return ""
+
+    def _value(self, node):
+        if node.tag == "textarea":
+            return node.text or ""
+        if node.tag == "select":
+            chosen = [o for o in node.iter("option") if o.get("selected") is not None] or list(node.iter("option"))[:1]
+            return self._option_value(chosen[0]) if chosen else ""
+        if node.tag == "option":
+            return self._option_value(node)
+        return node.get("value") or ""
+
+    @staticmethod
+    def _option_value(option):
+        value = option.get("value")
+        return value if value is not None else " ".join(option.text_content().split())
+
+    def is_displayed(self):
+        return self._page.is_displayed(self._live())
+
+    def is_enabled(self):
+        node = self._live()
+        return node.get("disabled") is None and not any(a.get("disabled") is not None for a in node.iterancestors("fieldset"))
+
+    def is_selected(self):
+        node = self._live()
+        if node.get("checked") is not None or node.get("selected") is not None:
+            return True
+        if node.tag == "option":
+            # a single <select> without a selected option shows (and submits) its first one
+            select = next(node.iterancestors("select"), None)
+            if select is not None and select.get("multiple") is None:
+                options = list(select.iter("option"))
+                return options[0] is node and not any(o.get("selected") is not None for o in options)
+        return False
+
+    # ---------- finding ----------
+    def find_element(self, by=By.ID, value=None):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"Unable to locate element: {{'method': '{by}', 'selector': '{value}'}}")
+        return found[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        return self._driver._query(self._tab, self._page, self._live(), by, value)
+
+    # ---------- actions ----------
+    def clear(self):
+        node = self._live()
+        if node.tag == "textarea":
+            node.text = ""
+        else:
+            node.set("value", "")
+
+    def send_keys(self, *values):
+        node = self._live()
+        text = "".join(str(v) for v in values)
+        submit = any(k in text for k in _SUBMIT_KEYS)
+        typed = "".join(ch for ch in text if not ("\ue000" <= ch <= "\uf8ff"))
+        if node.tag == "textarea":
+            node.text = (node.text or "") + typed
+        elif typed:
+            node.set("value", (node.get("value") or "") + typed)
+        if submit and node.tag == "input":
+            self._driver._submit(self._tab, self._page, node)
+
+    def submit(self):
+        node = self._live()
+        form = node if node.tag == "form" else next(node.iterancestors("form"), None)
+        if form is not None:
+            self._driver._submit(self._tab, self._page, form)
+
+    def click(self):
+        self._driver._click(self._tab, self._page, self._live())
+
+    def screenshot_as_png(self):
+        return _PNG
+
+    def screenshot(self, filename):
+        with open(filename, "wb") as f:
+            f.write(_PNG)
+        return True
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        tab = self._driver._tabs.get(handle)
+        if tab is None or tab.closed:
+            raise NoSuchWindowException(f"no such window: {handle}")
+        self._driver._current = tab
+
+    def default_content(self):
+        pass
+
+    def parent_frame(self):
+        pass
+
+    def frame(self, frame_reference):
+        pass
+
+    def new_window(self, type_hint=None):
+        self._driver._current = self._driver._open_tab("about:blank")
+
+    @property
+    def active_element(self):
+        return self._driver.find_element(By.TAG_NAME, "body")
+
+    @property
+    def alert(self):
+        raise NoAlertPresentException("no such alert")
+
+
+class FakeDriver:
+    """
+    Drop-in for webdriver.Chrome in browserless runs.
+    - proxy: optional host:port of an HTTP proxy (e.g. the --replay traffic proxy)
+    - timeout: seconds per page fetch
+    """
+
+    name = "fake"
+
+    def __init__(self, proxy=None, timeout=30):
+        self.timeout = timeout
+        self.cookie_jar = http.cookiejar.CookieJar()
+        handlers = [urllib.request.HTTPCookieProcessor(self.cookie_jar)]
+        if proxy:
+            handlers.append(urllib.request.ProxyHandler({"http": f"http://{proxy}", "https": f"http://{proxy}"}))
+            # the proxy intercepts HTTPS with its own certificate, like --ignore-certificate-errors
+            handlers.append(urllib.request.HTTPSHandler(context=ssl._create_unverified_context()))
+        self._opener = urllib.request.build_opener(*handlers)
+        self._opener.addheaders = [("User-Agent", USER_AGENT)]
+        self._tabs = {}
+        self._current = self._open_tab(None)
+        self.switch_to = _SwitchTo(self)
+        self.session_id = f"fake-{id(self)}"
+        self.capabilities = {"browserName": "fake"}
+
+    @classmethod
+    def from_html(cls, source, url="about:blank", **kwargs):
+        """A driver whose first tab shows `source` as if it had been loaded from `url`."""
+        driver = cls(**kwargs)
+        driver.load_html(source, url)
+        return driver
+
+    def load_html(self, source, url="about:blank"):
+        """Replace the current tab's document with an HTML snapshot (no network)."""
+        tab = self._tab()
+        self._show(tab, _Page(url, source))
+
+    # ---------- tabs ----------
+    def _open_tab(self, url):
+        tab = _Tab()
+        self._tabs[tab.handle] = tab
+        if url:
+            self._navigate(tab, url)
+        return tab
+
+    def _tab(self):
+        tab = self._current
+        if tab is None or tab.closed:
+            raise NoSuchWindowException("no such window: target window already closed")
+        return tab
+
+    @property
+    def window_handles(self):
+        return [h for h, tab in self._tabs.items() if not tab.closed]
+
+    @property
+    def current_window_handle(self):
+        return self._tab().handle
+
+    def close(self):
+        tab = self._tab()
+        tab.closed = True
+        del self._tabs[tab.handle]
+        self._current = None
+
+    def quit(self):
+        for tab in self._tabs.values():
+            tab.closed = True
+        self._tabs.clear()
+        self._current = None
+
+    # ---------- navigation ----------
+    def get(self, url):
+        self._navigate(self._tab(), url)
+
+    def back(self):
+        tab = self._tab()
+        if tab.history:
+            tab.forward_stack.append(tab.page)
+            tab.page = tab.history.pop()
+
+    def forward(self):
+        tab = self._tab()
+        if tab.forward_stack:
+            tab.history.append(tab.page)
+            tab.page = tab.forward_stack.pop()
+
+    def refresh(self):
+        tab = self._tab()
+        if tab.page.url.startswith("http"):
+            tab.page = self._fetch(tab.page.url)
+
+    @property
+    def current_url(self):
+        return self._tab().page.url
+
+    @property
+    def title(self):
+        return " ".join((self._tab().page.doc.findtext(".//title") or "").split())
+
+    @property
+    def page_source(self):
+        from lxml import html as lxml_html
+
+        return lxml_html.tostring(self._tab().page.doc, encoding="unicode", doctype="<!DOCTYPE html>")
+
+    def _navigate(self, tab, url, data=None):
+        base = tab.page.url if tab.page.url.startswith("http") else None
+        url = urllib.parse.urljoin(base, url) if base else url
+        self._show(tab, self._fetch(url, data))
+
+    def _show(self, tab, page):
+        tab.history.append(tab.page)
+        tab.forward_stack.clear()
+        tab.page = page
+
+    def _fetch(self, url, data=None):
+        if not url.startswith(("http://", "https://")):
+            return _Page(url if url.startswith("about:") else "about:blank", BLANK_PAGE)
+        request = urllib.request.Request(url, data=data)
+        try:
+            with self._opener.open(request, timeout=self.timeout) as resp:
+                final_url, body, ctype = resp.geturl(), resp.read(), resp.headers.get("Content-Type", "")
+        except urllib.error.HTTPError as e:
+            # browsers render error pages too
+            final_url, body, ctype = e.geturl() or url, e.read(), e.headers.get("Content-Type", "")
+        except (urllib.error.URLError, OSError) as e:
+            return _Page(url, f"<html><head><title>{url}</title></head><body><h1>This site can't be reached</h1>"
+                              f"<p>{e}</p></body></html>")
+        text = body.decode("utf-8", errors="replace")
+        if "html" not in ctype and text.lstrip()[:1] != "<":
+            text = f"<html><body><pre>{html.escape(text)}</pre></body></html>"
+        return _Page(final_url, text)
+
+    # ---------- finding ----------
+    def find_element(self, by=By.ID, value=None):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"Unable to locate element: {{'method': '{by}', 'selector': '{value}'}}")
+        return found[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        tab = self._tab()
+        return self._query(tab, tab.page, tab.page.doc, by, value)
+
+    def _query(self, tab, page, node, by, value):
+        relative = node is not page.doc
+        try:
+            hits = node.xpath(_xpath_for(by, value, relative))
+        except Exception as e:
+            if isinstance(e, InvalidSelectorException):
+                raise
+            raise InvalidSelectorException(f"Invalid selector {value!r}: {e}")
+        if not isinstance(hits, list):
+            raise InvalidSelectorException(f"{value!r} does not select elements")
+        return [FakeElement(self, tab, page, n) for n in hits if isinstance(getattr(n, "tag", None), str)]
+
+    def _visible_text(self, page, node):
+        """Rendered text of a displayed node: hidden subtrees skipped, one line per block element."""
+        hidden = page.hidden_by_css
+        lines, current = [], []
+
+        def flush():
+            line = " ".join("".join(current).split())
+            if line:
+                lines.append(line)
+            current.clear()
+
+        def walk(n):
+            block = n.tag in _BLOCK_TAGS
+            if block:
+                flush()
+            if n.text:
+                current.append(n.text)
+            for child in n:
+                if isinstance(child.tag, str) and not _inline_hidden(child) and child not in hidden:
+                    walk(child)
+                if child.tail:
+                    current.append(child.tail)
+            if block:
+                flush()
+
+        walk(node)
+        flush()
+        return "\n".join(lines)
+
+    # ---------- interaction ----------
+    def _click(self, tab, page, node):
+        target = node
+        if node.tag not in ("a", "button", "input", "option", "label", "select"):
+            target = next((a for a in node.iterancestors() if a.tag in ("a", "button")), node)
+        tag = target.tag
+        if tag == "a" and target.get("href"):
+            href = target.get("href").strip()
+            if href.startswith(("#", "javascript:")):
+                return
+            url = urllib.parse.urljoin(page.url, href)
+            if (target.get("target") or "").lower() == "_blank":
+                self._open_tab(url)
+            else:
+                self._navigate(tab, url)
+        elif tag == "button" and (target.get("type") or "submit").lower() == "submit":
+            self._submit(tab, page, target)
+        elif tag == "input":
+            kind = (target.get("type") or "text").lower()
+            if kind in ("submit", "image"):
+                self._submit(tab, page, target)
+            elif kind == "checkbox":
+                if target.get("checked") is None:
+                    target.set("checked", "checked")
+                else:
+                    del target.attrib["checked"]
+            elif kind == "radio":
+                form = next(target.iterancestors("form"), page.doc)
+                for other in form.xpath(".//input[@type='radio'][@name=$n]", n=target.get("name") or ""):
+                    other.attrib.pop("checked", None)
+                target.set("checked", "checked")
+        elif tag == "option":
+            select = next(target.iterancestors("select"), None)
+            if select is not None and select.get("multiple") is None:
+                for other in select.iter("option"):
+                    other.attrib.pop("selected", None)
+            target.set("selected", "selected")
+        elif tag == "label" and target.get("for"):
+            for control in page.doc.xpath("//*[@id=$i]", i=target.get("for")):
+                self._click(tab, page, control)
+
+    def _submit(self, tab, page, node):
+        form = node if node.tag == "form" else next(node.iterancestors("form"), None)
+        if form is None:
+            return
+        fields = []
+        for field in form.iter("input", "select", "textarea", "button"):
+            name = field.get("name")
+            if not name or field.get("disabled") is not None:
+                continue
+            kind = (field.get("type") or "").lower()
+            if field.tag in ("button",) or kind in ("submit", "image", "reset"):
+                if field is node:
+                    fields.append((name, field.get("value") or ""))
+                continue
+            if kind in ("checkbox", "radio") and field.get("checked") is None:
+                continue
+            if field.tag == "select":
+                element = FakeElement(self, tab, page, field)
+                fields.append((name, element._value(field)))
+            elif field.tag == "textarea":
+                fields.append((name, field.text or ""))
+            else:
+                fields.append((name, field.get("value") or ("on" if kind in ("checkbox", "radio") else "")))
+        action = urllib.parse.urljoin(page.url, form.get("action") or page.url)
+        encoded = urllib.parse.urlencode(fields)
+        if (form.get("method") or "get").lower() == "post":
+            self._navigate(tab, action, data=encoded.encode("utf-8"))
+        else:
+            parts = urllib.parse.urlsplit(action)
+            self._navigate(tab, urllib.parse.urlunsplit(parts._replace(query=encoded, fragment="")))
+
+    # ---------- scripts ----------
+    def execute_script(self, script, *args):
+        handler = _SCRIPT_HANDLERS.get(script)
+        if handler is None:
+            handler = _match_pattern(script)
+        if handler is None:
+            raise WebDriverException(f"FakeDriver can't run this script: {' '.join(script.split())[:120]}")
+        return handler(self, *args)
+
+    def execute_async_script(self, script, *args):
+        handler = _ASYNC_SCRIPT_HANDLERS.get(script)
+        if handler is None:
+            raise WebDriverException("FakeDriver can't run this async script")
+        return handler(self, *args)
+
+    # ---------- cookies ----------
+    def get_cookies(self):
+        host = urllib.parse.urlsplit(self.current_url).hostname or ""
+        return [
+            {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path, "secure": c.secure,
+             **({"expiry": c.expires} if c.expires else {})}
+            for c in self.cookie_jar if host and host.endswith(c.domain.lstrip("."))
+        ]
+
+    def get_cookie(self, name):
+        return next((c for c in self.get_cookies() if c["name"] == name), None)
+
+    def add_cookie(self, cookie_dict):
+        host = urllib.parse.urlsplit(self.current_url).hostname
+        if not host:
+            raise WebDriverException("invalid cookie domain: no page loaded")
+        domain = cookie_dict.get("domain") or host
+        if not host.endswith(domain.lstrip(".")):
+            raise WebDriverException(f"invalid cookie domain: {domain}")
+        self.cookie_jar.set_cookie(http.cookiejar.Cookie(
+            0, cookie_dict["name"], cookie_dict["value"], None, False, domain, True, domain.startswith("."),
+            cookie_dict.get("path", "/"), True, bool(cookie_dict.get("secure")), cookie_dict.get("expiry"),
+            False, None, None, {},
+        ))
+
+    def delete_cookie(self, name):
+        for c in list(self.cookie_jar):
+            if c.name == name:
+                self.cookie_jar.clear(c.domain, c.path, c.name)
+
+    def delete_all_cookies(self):
+        self.cookie_jar.clear()
+
+    # ---------- no-ops of a headless, instant "browser" ----------
+    def maximize_window(self):
+        pass
+
+    def set_window_size(self, width, height, windowHandle="current"):
+        pass
+
+    def get_window_size(self, windowHandle="current"):
+        return {"width": 1920, "height": 1080}
+
+    def set_script_timeout(self, time_to_wait):
+        pass
+
+    def set_page_load_timeout(self, time_to_wait):
+        pass
+
+    def implicitly_wait(self, time_to_wait):
+        pass
+
+    def get_screenshot_as_png(self):
+        return _PNG
+
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(_PNG).decode("ascii")
+
+    def save_screenshot(self, filename):
+        with open(filename, "wb") as f:
+            f.write(_PNG)
+        return True
+
+    get_screenshot_as_file = save_screenshot
+
+
+# ---------- script handlers ----------
+def _noop(driver, *args):
+    return None
+
+
+def _js_click(driver, element, *args):
+    element.click()
+
+
+def _window_open(driver, url="about:blank", *args):
+    current = driver._tab().page.url
+    if url and current.startswith("http"):
+        url = urllib.parse.urljoin(current, url)
+    driver._open_tab(url or "about:blank")
+
+
+def _set_value(driver, element, value, *args):
+    node = element._live()
+    node.set("value", str(value))
+    return True
+
+
+# small scripts scattered through tests and page objects, matched by shape
+_PATTERNS = [
+    (re.compile(r"^arguments\[0\]\.scrollIntoView\(.*\);?$"), _noop),
+    (re.compile(r"^window\.scroll(To|By)\(.*\);?$"), _noop),
+    (re.compile(r"^arguments\[0\]\.click\(\);?$"), _js_click),
+    (re.compile(r"^window\.open\(arguments\[0\], ?['\"]_blank['\"]\);?$"), _window_open),
+    (re.compile(r"^return document\.readyState;?$"), lambda d, *a: "complete"),
+    (re.compile(r"getBoundingClientRect\(\)"), lambda d, *a: {"x": 0, "y": 0}),
+    (re.compile(r"document\.elementFromPoint"), _noop),
+    (re.compile(r"el\.value = v;"), _set_value),
+]
+
+
+def _match_pattern(script):
+    flat = " ".join(script.split())
+    literal_open = re.match(r"^window\.open\(['\"]([^'\"]*)['\"], ?['\"]_blank['\"]\);?$", flat)
+    if literal_open:
+        return lambda driver, *args: _window_open(driver, literal_open.group(1))
+    for pattern, handler in _PATTERNS:
+        if pattern.search(flat):
+            return handler
+    return None
+
+
+def _locator_nodes(driver, kind, query):
+    by = By.XPATH if kind == "xpath" else By.CSS_SELECTOR
+    try:
+        return driver.find_elements(by, query)
+    except InvalidSelectorException:
+        return []
+
+
+def _wait_for_locator(driver, kind, query, want_all, timeout_ms, *args):
+    # a static DOM: either it matches now or it never will (None = the in-page timer expired)
+    try:
+        hits = driver.find_elements(By.XPATH if kind == "xpath" else By.CSS_SELECTOR, query)
+    except InvalidSelectorException as e:
+        return {"invalidSelector": str(e)}
+    if not hits:
+        return None
+    return hits if want_all else hits[0]
+
+
+def _first_visible(driver, locators, *args):
+    for index, (kind, query) in enumerate(locators):
+        for element in _locator_nodes(driver, kind, query):
+            if element.is_displayed():
+                return [element, index]
+    return None
+
+
+def _detect_bot_wall(driver, iframe_patterns, containers, phrases, url_parts, *args):
+    # Python twin of base.bot_wall's _DETECT_BOT_WALL_JS
+    url = driver.current_url.lower()
+    for part in url_parts:
+        if part in url:
+            return ["url", part]
+    for frame in driver.find_elements(By.CSS_SELECTOR, "iframe[src]"):
+        src = (frame.get_attribute("src") or "").lower()
+        if any(pattern in src for pattern in iframe_patterns):
+            return ["iframe", src[:200]]
+    boxes = driver.find_elements(By.CSS_SELECTOR, containers)
+    if boxes:
+        return ["container", boxes[0].get_attribute("class") or boxes[0].tag_name]
+    bodies = driver.find_elements(By.TAG_NAME, "body")
+    text = bodies[0].text.lower() if bodies else ""
+    for phrase in phrases:
+        if phrase in text:
+            return ["text", phrase]
+    return None
+
+
+def _wait_bot_wall_cleared(driver, iframe_patterns, containers, phrases, url_parts, timeout_ms, *args):
+    # a static DOM: nobody can solve a wall here, so it is either clear now or never
+    if _detect_bot_wall(driver, iframe_patterns, containers, phrases, url_parts) is None:
+        return "cleared"
+    return "timeout"
+
+
+def _read_storage(driver, *args):
+    # no JavaScript engine, so no web storage either
+    parts = urllib.parse.urlsplit(driver.current_url)
+    return {"origin": f"{parts.scheme}://{parts.netloc}", "localStorage": {}, "sessionStorage": {}}
+
+
+def _register_builtin_scripts():
+    # base/ scripts only: pages/ builds on base/, never the other way round
+    from base.auth_session import _READ_STORAGE_JS, _WRITE_STORAGE_JS
+    from base.base_driver import _FIRST_VISIBLE_JS, _WAIT_FOR_LOCATOR_JS
+    from base.bot_wall import _DETECT_BOT_WALL_JS, _WAIT_BOT_WALL_CLEARED_JS
+    from base.driver_pool import _CLEAR_STORAGE_JS
+
+    register_script(_WAIT_FOR_LOCATOR_JS, _wait_for_locator, is_async=True)
+    register_script(_FIRST_VISIBLE_JS, _first_visible)
+    register_script(_CLEAR_STORAGE_JS, _noop)
+    register_script(_DETECT_BOT_WALL_JS, _detect_bot_wall)
+    register_script(_READ_STORAGE_JS, _read_storage)
+    register_script(_WRITE_STORAGE_JS, lambda driver, *args: True)
+    register_script(_WAIT_BOT_WALL_CLEARED_JS, _wait_bot_wall_cleared, is_async=True)
+
+
+_register_builtin_scripts()
@@ -0,0 +1,94 @@
+# base/lean_mode.py
+
+# URL patterns (Network.setBlockedURLs syntax, '*' wildcard) per resource type
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*.ogg*"],
+    "stylesheet": ["*.css*"],
+}
+
+# ads / analytics / third-party trackers seen on eBay pages; none of them carry DOM we assert on
+TRACKER_HOSTS = [
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "adnxs.com",
+    "criteo.com",
+    "criteo.net",
+    "scorecardresearch.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "bat.bing.com",
+    "amazon-adsystem.com",
+    "taboola.com",
+    "outbrain.com",
+]
+
+# scripts, stylesheets and documents are never blocked by default: locators need the DOM they build.
+# Blocking image *bytes* keeps the <img> elements (and their alt text, e.g. img.s-card__image) in place.
+DEFAULT_BLOCKED_TYPES = ("image", "font", "media")
+
+
+def _split_csv(value):
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+
+class LeanMode:
+    """
+    "Lean page load" for Chromium browsers: skips downloading images, fonts, media, ads and
+    trackers that no assertion needs.
+
+    - blocked_types: resource types from RESOURCE_TYPE_PATTERNS to drop
+    - extra_patterns: additional URL patterns to block ('*' wildcard)
+    - block_trackers: also drop the ad/analytics hosts in TRACKER_HOSTS
+    """
+
+    def __init__(self, blocked_types=DEFAULT_BLOCKED_TYPES, extra_patterns=(), block_trackers=True):
+        unknown = [t for t in blocked_types if t not in RESOURCE_TYPE_PATTERNS]
+        if unknown:
+            raise ValueError(f"Unknown resource type(s) for --lean-types: {', '.join(unknown)}. "
+                             f"Use {' | '.join(RESOURCE_TYPE_PATTERNS)}.")
+        self.blocked_types = tuple(blocked_types)
+        self.extra_patterns = [p for p in extra_patterns if p]
+        self.block_trackers = block_trackers
+
+    @classmethod
+    def from_cli(cls, types, patterns):
+        """Build from the comma separated --lean-types / --lean-block values."""
+        return cls(blocked_types=_split_csv(types) or DEFAULT_BLOCKED_TYPES, extra_patterns=_split_csv(patterns))
+
+    def blocked_url_patterns(self):
+        patterns = []
+        for resource_type in self.blocked_types:
+            patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+        if self.block_trackers:
+            patterns.extend(f"*{host}*" for host in TRACKER_HOSTS)
+        patterns.extend(self.extra_patterns)
+        return patterns
+
+    def apply_to_options(self, browser, options):
+        """
+        Browser-wide part, applied at launch. CDP blocking below only covers the tab it is sent
+        to, so tabs opened later by window.open() rely on these switches.
+        """
+        if browser not in ("chrome", "edge"):
+            return
+        if "image" in self.blocked_types:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        if self.block_trackers:
+            rules = ", ".join(f"MAP *.{host} ~NOTFOUND, MAP {host} ~NOTFOUND" for host in TRACKER_HOSTS)
+            options.add_argument(f"--host-resolver-rules={rules}")
+
+    def apply_to_driver(self, browser, driver):
+        """Per-tab DevTools blocking of every configured pattern (the session's first tab)."""
+        if browser not in ("chrome", "edge"):
+            print(f"⚠️ --lean needs Chrome DevTools Protocol; ignored for {browser}.")
+            return
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_url_patterns()})
+        except Exception as e:
+            print("lean mode: could not enable network blocking:", e)
@@ -0,0 +1,202 @@
+# base/parallel.py
+import os
+import shutil
+import tempfile
+import time
+
+# rough footprint of one automated browser (renderer + GPU + driver processes)
+BROWSER_MEMORY_MB = 1000
+# slot files without an owner pid (older runs) count as abandoned after this long
+UNOWNED_SLOT_MAX_AGE = 24 * 3600
+
+
+def worker_id():
+    """pytest-xdist worker name ("gw0", "gw1", ...) or "master" for a serial run."""
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
+
+
+def worker_index():
+    wid = worker_id()
+    return int(wid[2:]) if wid.startswith("gw") and wid[2:].isdigit() else 0
+
+
+def run_id():
+    """Id shared by all workers of one pytest run (falls back to this process for serial runs)."""
+    return os.getenv("PYTEST_XDIST_TESTRUNUID") or f"pid{os.getpid()}"
+
+
+def browser_for_worker(spec):
+    """
+    Pick this worker's browser from a --browser value. A comma separated list fans out
+    round-robin over the workers: --browser=chrome,firefox -> gw0 chrome, gw1 firefox, gw2 chrome...
+    """
+    browsers = [b.strip().lower() for b in (spec or "chrome").split(",") if b.strip()] or ["chrome"]
+    return browsers[worker_index() % len(browsers)]
+
+
+def pid_alive(pid):
+    """Whether process `pid` is still running (True when we can't tell, so nothing live gets reclaimed)."""
+    if pid <= 0:
+        return False
+    if os.name == "nt":
+        # os.kill(pid, 0) would terminate the process on Windows
+        try:
+            import ctypes
+
+            kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+            handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+            if not handle:
+                return ctypes.get_last_error() == 5  # access denied: exists, just not ours
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            kernel32.CloseHandle(handle)
+            return code.value == 259  # STILL_ACTIVE
+        except Exception:
+            return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # e.g. EPERM: someone else's process
+    return True
+
+
+def _total_memory_mb():
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        pass
+    try:
+        # Windows
+        import ctypes
+
+        class _MemoryStatus(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = _MemoryStatus()
+        status.dwLength = ctypes.sizeof(_MemoryStatus)
+        ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+        return status.ullTotalPhys // (1024 * 1024)
+    except Exception:
+        return None
+
+
+def machine_browser_capacity():
+    """How many browsers this machine can run side by side: one per CPU core, bounded by RAM
+    (keeping a quarter of it for the OS and the test processes)."""
+    cpus = os.cpu_count() or 1
+    memory = _total_memory_mb()
+    if memory:
+        cpus = min(cpus, int(memory * 0.75) // BROWSER_MEMORY_MB)
+    return max(1, cpus)
+
+
+class BrowserSlots:
+    """
+    Cross-process cap on live browsers for one pytest run. Every worker takes a slot (a lock file
+    created with O_EXCL in a directory shared by the run) before launching a browser and gives
+    it back when the browser quits.
+    Slot files hold the owner's pid: a slot whose owner died (crashed worker) is taken over, and
+    slot directories of finished runs with no live owner left are removed.
+    """
+
+    def __init__(self, limit, slot_dir=None, timeout=600):
+        self.limit = max(1, int(limit))
+        self.timeout = timeout
+        if slot_dir is None:
+            root = os.path.join(tempfile.gettempdir(), "ebay_browser_slots")
+            slot_dir = os.path.join(root, run_id())
+            self._reap_finished_runs(root, slot_dir)
+        self.slot_dir = slot_dir
+        os.makedirs(self.slot_dir, exist_ok=True)
+
+    @staticmethod
+    def _owner_alive(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                owner = f.read().split()
+            age = time.time() - os.path.getmtime(path)
+        except OSError:
+            return False  # released meanwhile
+        if owner and owner[0].isdigit():
+            return pid_alive(int(owner[0]))
+        # no pid: written by an older version (or still being written)
+        return age < UNOWNED_SLOT_MAX_AGE
+
+    @classmethod
+    def _reap_finished_runs(cls, root, keep):
+        try:
+            runs = os.listdir(root)
+        except OSError:
+            return
+        for name in runs:
+            run_dir = os.path.join(root, name)
+            if run_dir == keep or not os.path.isdir(run_dir):
+                continue
+            try:
+                if not any(cls._owner_alive(os.path.join(run_dir, slot)) for slot in os.listdir(run_dir)):
+                    shutil.rmtree(run_dir, ignore_errors=True)
+            except OSError:
+                pass
+
+    def _take(self, path):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        except FileNotFoundError:
+            # another run found our directory empty and cleaned it up
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            return self._take(path)
+        with os.fdopen(fd, "w") as f:
+            f.write(f"{os.getpid()} {worker_id()}")
+        return True
+
+    def try_acquire(self):
+        """Take a free slot without waiting; returns the slot file path, or None when all are taken."""
+        for n in range(self.limit):
+            path = os.path.join(self.slot_dir, f"slot{n}")
+            if self._take(path):
+                return path
+            if not self._owner_alive(path) and self._reclaim(path):
+                return path
+        return None
+
+    def _reclaim(self, path):
+        """Take over a slot whose worker crashed without giving it back."""
+        guard = path + ".reclaim"
+        # only one worker at a time may remove it, or a second one could remove the new owner's file
+        if not self._take(guard):
+            return False
+        try:
+            if self._owner_alive(path):
+                return False
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return self._take(path)
+        finally:
+            self.release(guard)
+
+    def acquire(self):
+        """Block until a slot is free; returns the slot file path."""
+        end = time.time() + self.timeout
+        while True:
+            path = self.try_acquire()
+            if path:
+                return path
+            if time.time() > end:
+                raise TimeoutError(f"No free browser slot (limit {self.limit}) within {self.timeout}s")
+            time.sleep(0.2)
+
+    def release(self, slot):
+        try:
+            os.remove(slot)
+        except OSError:
+            pass
@@ -0,0 +1,245 @@
+# base/profiler.py
+"""
+Opt-in WebDriver command profiler (pytest --profile-webdriver).
+
+Every command a driver sends to chromedriver / geckodriver / msedgedriver goes through
+driver.command_executor.execute(); the profiler wraps that one method and records, per command:
+  - the command name (findElements, w3cExecuteScript, getElementText, get, ...)
+  - its target: the locator, the url, or the script (a short hash; Selenium's own atoms by name,
+    e.g. getAttribute:href)
+  - latency, request / response payload size
+  - the call site: the page-object method that caused it (else the test, else the base helper)
+
+At session end each worker writes reports/webdriver_profile_<worker>.json with a per-test summary,
+the slowest call sites and the round-trip count. A loop doing one round trip per element shows up
+as a single call site with a huge count.
+
+The fake driver has no remote connection, so --browser=fake runs are not profiled.
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from base.parallel import run_id, worker_id
+
+REPORT_DIR = "reports"
+DEFAULT_TOP = 15
+NO_TEST = "(outside tests)"
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# our own code, most useful first: page objects, then tests, then shared helpers
+_CALLER_DIRS = ("pages", "tests", "base", "Utilities")
+_THIS_FILE = os.path.abspath(__file__)
+# Selenium's injected atoms start with a marker comment, e.g. "/* getAttribute */return (..."
+_ATOM = re.compile(r"/\*\s*(\w+)\s*\*/")
+
+Command = namedtuple("Command", "test command target started seconds sent received caller error")
+
+
+def _size(value):
+    try:
+        return len(json.dumps(value, default=str))
+    except Exception:
+        return 0
+
+
+def script_key(script):
+    return "script:" + hashlib.sha1(script.encode("utf-8", "replace")).hexdigest()[:10]
+
+
+def command_target(command, params):
+    """What a command acted on: locator, url, attribute / property name or script key ("" when nothing)."""
+    params = params or {}
+    if "using" in params and "value" in params:
+        return f"{params['using']}={params['value']}"
+    if "script" in params:
+        script = params.get("script") or ""
+        atom = _ATOM.match(script)
+        if atom:
+            args = params.get("args") or []
+            name = args[1] if atom.group(1) == "getAttribute" and len(args) > 1 else None
+            return f"{atom.group(1)}:{name}" if name else atom.group(1)
+        return script_key(script)
+    for key in ("url", "name", "cmd"):
+        if params.get(key):
+            return str(params[key])
+    return ""
+
+
+def call_site(frame):
+    """
+    'pages/search_results_page.py:91 SearchResultsPage.snapshot_products' for the innermost page-object
+    frame on the stack; the innermost test frame, then base/ or Utilities/ frame when there is none.
+    """
+    best = {}
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if path.startswith(_ROOT) and path != _THIS_FILE:
+            rel = os.path.relpath(path, _ROOT)
+            top = rel.split(os.sep, 1)[0]
+            if top in _CALLER_DIRS and top not in best:
+                best[top] = f"{rel.replace(os.sep, '/')}:{frame.f_lineno} {frame.f_code.co_qualname}"
+                if top == "pages":
+                    break
+        frame = frame.f_back
+    for top in _CALLER_DIRS:
+        if top in best:
+            return best[top]
+    return "?"
+
+
+class WebDriverProfiler:
+    """
+    Collects WebDriver commands for one session (one xdist worker). Per-test and per-call-site
+    totals are added up as commands come in, so a long run doesn't hold every command in memory.
+    - top: number of slowest call sites kept in the report
+    - report_dir: where write_report() puts webdriver_profile_<worker>.json
+    - keep_commands: also keep each test's Command records until pop_test_commands() takes them
+      (the time breakdown does, right after every test)
+    """
+
+    def __init__(self, top=DEFAULT_TOP, report_dir=REPORT_DIR, clock=time.perf_counter, keep_commands=False):
+        self.top = top
+        self.report_dir = report_dir
+        self.keep_commands = keep_commands
+        self.round_trips = 0
+        self.scripts = {}  # script key -> first line of the script, to read the report
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._test = None
+        self._test_thread = None
+        self._test_started = None
+        self._walls = {}
+        self._tests = {}     # nodeid -> running totals of its commands
+        self._sites = {}     # (caller, command, target) -> [count, seconds, slowest]
+        self._commands = {}  # nodeid -> [Command] (keep_commands only)
+
+    # ---------- hooking ----------
+    def attach(self, driver):
+        """Wrap the driver's command executor (once). False when the driver has none (fake driver)."""
+        executor = getattr(driver, "command_executor", None)
+        if executor is None or not hasattr(executor, "execute"):
+            return False
+        if getattr(executor, "_webdriver_profiler", None) is self:
+            return True
+
+        execute = executor.execute
+
+        def profiled_execute(command, params=None):
+            started = self._clock()
+            error = None
+            response = None
+            try:
+                response = execute(command, params)
+                return response
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                self.record(command, params, self._clock() - started, started=started,
+                            response=response, error=error, frame=sys._getframe(1))
+
+        executor.execute = profiled_execute
+        executor._webdriver_profiler = self
+        return True
+
+    def record(self, command, params, seconds, started=None, response=None, error=None, frame=None):
+        if started is None:
+            started = self._clock() - seconds
+        target = command_target(command, params)
+        if target.startswith("script:") and target not in self.scripts:
+            lines = params["script"].strip().splitlines()
+            self.scripts[target] = lines[0][:120] if lines else ""
+        # commands from standby launches / other threads don't belong to the running test
+        test = self._test if threading.get_ident() == self._test_thread else NO_TEST
+        value = response.get("value") if isinstance(response, dict) else response
+        entry = Command(test, command, target, started, seconds, _size(params), _size(value),
+                        call_site(frame) if frame is not None else "?", error)
+        with self._lock:
+            self.round_trips += 1
+            t = self._tests.get(test)
+            if t is None:
+                t = self._tests[test] = {"round_trips": 0, "webdriver_seconds": 0.0, "sent_bytes": 0,
+                                         "received_bytes": 0, "errors": 0, "commands": {}}
+            t["round_trips"] += 1
+            t["webdriver_seconds"] += seconds
+            t["sent_bytes"] += entry.sent
+            t["received_bytes"] += entry.received
+            t["errors"] += 1 if error else 0
+            per = t["commands"].setdefault(command, {"count": 0, "seconds": 0.0})
+            per["count"] += 1
+            per["seconds"] += seconds
+            site = self._sites.setdefault((entry.caller, command, target), [0, 0.0, 0.0])
+            site[0] += 1
+            site[1] += seconds
+            site[2] = max(site[2], seconds)
+            if self.keep_commands:
+                self._commands.setdefault(test, []).append(entry)
+        return entry
+
+    # ---------- per test ----------
+    def start_test(self, nodeid):
+        self._test = nodeid
+        self._test_thread = threading.get_ident()
+        self._test_started = self._clock()
+
+    def end_test(self):
+        if self._test is not None and self._test_started is not None:
+            self._walls[self._test] = self._walls.get(self._test, 0.0) + self._clock() - self._test_started
+        self._test = self._test_thread = self._test_started = None
+
+    def pop_test_commands(self, nodeid):
+        """The Command records of one test, handed over once (needs keep_commands)."""
+        with self._lock:
+            commands = self._commands.pop(nodeid, [])
+            # nothing else will ask for commands made outside a test
+            self._commands.pop(NO_TEST, None)
+        return commands
+
+    # ---------- report ----------
+    def summary(self):
+        with self._lock:
+            tests = {}
+            for nodeid, t in self._tests.items():
+                tests[nodeid] = dict(
+                    t,
+                    wall_seconds=round(self._walls.get(nodeid, 0.0), 4),
+                    webdriver_seconds=round(t["webdriver_seconds"], 4),
+                    commands={name: {"count": per["count"], "seconds": round(per["seconds"], 4)}
+                              for name, per in t["commands"].items()},
+                )
+            slowest = sorted(self._sites.items(), key=lambda kv: kv[1][1], reverse=True)[:self.top]
+            round_trips = self.round_trips
+            webdriver_seconds = sum(t["webdriver_seconds"] for t in self._tests.values())
+
+        return {
+            "worker": worker_id(),
+            "run_id": run_id(),
+            "round_trips": round_trips,
+            "webdriver_seconds": round(webdriver_seconds, 4),
+            "tests": tests,
+            "slowest_call_sites": [
+                {"caller": caller, "command": command, "target": target, "count": count,
+                 "total_seconds": round(total, 4), "mean_ms": round(total / count * 1000, 2),
+                 "max_ms": round(worst * 1000, 2)}
+                for (caller, command, target), (count, total, worst) in slowest
+            ],
+            "scripts": dict(self.scripts),
+        }
+
+    def report_path(self):
+        return os.path.join(self.report_dir, f"webdriver_profile_{worker_id()}.json")
+
+    def write_report(self):
+        """Write the summary as JSON; returns (path, summary)."""
+        summary = self.summary()
+        path = self.report_path()
+        os.makedirs(self.report_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        return path, summary
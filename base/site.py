@@ -0,0 +1,58 @@
+# base/site.py
+from urllib.parse import quote_plus
+
+LIVE_HOME = "https://www.ebay.com"
+LIVE_SIGNIN = "https://signin.ebay.com/"
+LIVE_CART = "https://cart.ebay.com"
+
+
+class Site:
+    """
+    Where the suite points its browsers. Default is the live eBay hosts; with a base_url
+    (--base-url / --standin) every page lives under that one origin:
+      home = <base>/, signin = <base>/signin, cart = <base>/cart
+    """
+
+    def __init__(self, base_url=None):
+        self.base_url = base_url.rstrip("/") if base_url else None
+
+    @property
+    def is_live(self):
+        return self.base_url is None
+
+    @property
+    def home(self):
+        return LIVE_HOME if self.is_live else self.base_url + "/"
+
+    @property
+    def signin(self):
+        return LIVE_SIGNIN if self.is_live else self.base_url + "/signin"
+
+    @property
+    def cart(self):
+        return LIVE_CART if self.is_live else self.base_url + "/cart"
+
+    def search(self, keyword):
+        root = LIVE_HOME if self.is_live else self.base_url
+        return f"{root}/sch/i.html?_nkw={quote_plus(keyword)}"
+
+    def item(self, item_id):
+        root = LIVE_HOME if self.is_live else self.base_url
+        return f"{root}/itm/{item_id}"
+
+    def __repr__(self):
+        return f"Site({self.base_url or 'live'})"
+
+
+_current = Site()
+
+
+def current_site():
+    """The Site configured for this run (conftest sets it from --base-url / --standin)."""
+    return _current
+
+
+def set_site(site):
+    global _current
+    _current = site or Site()
+    return _current
@@ -0,0 +1,92 @@
+# base/storage_state.py
+"""
+Loads a saved browser state (cookies + web storage) into a Chromium browser through DevTools,
+before it has navigated anywhere:
+  - every cookie, sameSite included, in one Network.setCookies call (no "open the domain first",
+    no add_cookie round trip per cookie)
+  - local / session storage seeded by a script registered with Page.addScriptToEvaluateOnNewDocument,
+    so it is in place when the site's own scripts first run
+Browsers without CDP (Firefox, the fake driver) get False back and the caller falls back to WebDriver.
+"""
+import json
+import time
+import weakref
+
+_SEED_STORAGE_JS = """
+(function (origin, data) {
+  if (location.origin !== origin) return;
+  ['localStorage', 'sessionStorage'].forEach(function (kind) {
+    try {
+      var items = data[kind] || {};
+      Object.keys(items).forEach(function (k) {
+        if (window[kind].getItem(k) === null) window[kind].setItem(k, items[k]);
+      });
+    } catch (e) {}
+  });
+})(%s, %s);
+"""
+
+# driver -> identifiers of the storage seeding scripts we registered (removed when the pool resets it)
+_seed_scripts = weakref.WeakKeyDictionary()
+
+
+def all_expired(cookies, now=None):
+    """Offline pre-check: True when there are cookies and every one of them has an expiry in the past
+    (session cookies without an expiry count as alive)."""
+    now = now or time.time()
+    return bool(cookies) and all(c.get("expiry") and c["expiry"] < now for c in cookies)
+
+
+def to_cdp_cookie(cookie):
+    """WebDriver cookie dict -> CDP Network.CookieParam. Host-only cookies are set by url, so they
+    stay host-only instead of becoming domain cookies."""
+    domain = cookie.get("domain") or ""
+    path = cookie.get("path") or "/"
+    param = {"name": cookie["name"], "value": cookie["value"], "path": path,
+             "secure": bool(cookie.get("secure")), "httpOnly": bool(cookie.get("httpOnly"))}
+    if domain.startswith("."):
+        param["domain"] = domain
+    else:
+        param["url"] = f"{'https' if cookie.get('secure') else 'http'}://{domain}{path}"
+    if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+        param["sameSite"] = cookie["sameSite"]
+    if cookie.get("expiry"):
+        param["expires"] = cookie["expiry"]
+    return param
+
+
+def load_storage_state(driver, cookies, origins=None):
+    """
+    Put cookies (and origin -> {"localStorage": {...}, "sessionStorage": {...}}) into the browser
+    through CDP. Call it before the first navigation. Returns False when the browser has no CDP.
+    """
+    execute_cdp_cmd = getattr(driver, "execute_cdp_cmd", None)
+    if not execute_cdp_cmd:
+        return False
+    now = time.time()
+    live = [to_cdp_cookie(c) for c in cookies if not (c.get("expiry") and c["expiry"] < now)]
+    try:
+        if live:
+            execute_cdp_cmd("Network.setCookies", {"cookies": live})
+        for origin, storage in (origins or {}).items():
+            source = _SEED_STORAGE_JS % (json.dumps(origin), json.dumps(storage))
+            added = execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+            _seed_scripts.setdefault(driver, []).append(added["identifier"])
+    except Exception as e:
+        print("CDP storage state load failed, falling back to WebDriver:", e)
+        return False
+    return True
+
+
+def forget_storage_state(driver):
+    """Unregister the storage seeding scripts (DriverPool does this before handing a browser out again)."""
+    try:
+        identifiers = _seed_scripts.pop(driver, [])
+    except TypeError:  # not weak-referenceable: never had scripts registered
+        return
+    for identifier in identifiers:
+        try:
+            driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
+        except Exception:
+            pass
+
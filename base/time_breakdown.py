@@ -0,0 +1,195 @@
+# base/time_breakdown.py
+"""
+Where the wall time of a test goes (pytest --time-breakdown):
+
+    sleep      deliberate pauses: pacing points, rate-control waits, raw time.sleep() in tests / pages
+    webdriver  WebDriver round trips (finds, clicks, scripts, ...), from the command profiler
+    load_wait  navigation (get / back / refresh), WebDriverWait.until and async wait scripts
+    python     the rest: our own code, the fake driver, pytest fixtures
+
+Every slice of time goes to one bucket only. When spans overlap the outer, more specific one wins
+(load_wait > sleep > webdriver): the polling sleeps and finds inside a WebDriverWait are waiting,
+not work.
+
+Each test gets a text attachment in Allure, and each worker writes reports/time_breakdown_<worker>.json.
+"""
+import json
+import os
+import threading
+import time
+
+from base.parallel import run_id, worker_id
+from base.profiler import REPORT_DIR
+
+CATEGORIES = ("sleep", "webdriver", "load_wait", "python")
+# which bucket owns time covered by several spans
+_PRECEDENCE = ("load_wait", "sleep", "webdriver")
+NAVIGATION_COMMANDS = {"get", "refresh", "goBack", "goForward"}
+WAIT_COMMANDS = {"w3cExecuteScriptAsync", "executeAsyncScript"}
+
+
+def attribute(spans, start, end):
+    """
+    Split [start, end] into CATEGORIES. spans: (started, ended, category) triples; overlaps are
+    resolved by _PRECEDENCE and whatever no span covers is python.
+    """
+    events = []
+    for s, e, category in spans:
+        s, e = max(s, start), min(e, end)
+        if e > s:
+            events.append((s, 1, category))
+            events.append((e, -1, category))
+    events.sort(key=lambda ev: (ev[0], ev[1]))
+
+    totals = dict.fromkeys(CATEGORIES, 0.0)
+    active = dict.fromkeys(_PRECEDENCE, 0)
+    last = start
+    for at, delta, category in events:
+        if at > last:
+            owner = next((c for c in _PRECEDENCE if active[c]), "python")
+            totals[owner] += at - last
+            last = at
+        active[category] += delta
+    totals["python"] += max(0.0, end - last)
+    return totals
+
+
+class TimeLedger:
+    """
+    Per-test time accounting for one session (one xdist worker).
+    - profiler: the WebDriverProfiler whose commands give the round-trip spans
+    - clock: must be the profiler's clock (both default to time.perf_counter)
+    """
+
+    def __init__(self, profiler=None, clock=time.perf_counter, report_dir=REPORT_DIR):
+        self.profiler = profiler
+        self.report_dir = report_dir
+        self.results = []
+        self._clock = clock
+        self._spans = []
+        self._counts = {}
+        self._test = None
+        self._test_thread = None
+        self._started = None
+        self._restore = []
+
+    # ---------- hooks ----------
+    def install(self):
+        """Route time.sleep and WebDriverWait.until / until_not through the ledger (until uninstall())."""
+        from selenium.webdriver.support.wait import WebDriverWait
+
+        self._patch(time, "sleep", "sleep")
+        self._patch(WebDriverWait, "until", "load_wait", count="waits")
+        self._patch(WebDriverWait, "until_not", "load_wait", count="waits")
+        return self
+
+    def uninstall(self):
+        while self._restore:
+            owner, name, original = self._restore.pop()
+            setattr(owner, name, original)
+
+    def _patch(self, owner, name, category, count=None):
+        original = getattr(owner, name)
+        setattr(owner, name, self.timed(category, original, count=count or f"{category}s"))
+        self._restore.append((owner, name, original))
+
+    def timed(self, category, fn, count=None):
+        """fn, with the time of every call made during a test (on the test's thread) charged to category."""
+        ledger = self
+
+        def wrapper(*args, **kwargs):
+            if ledger._test is None or threading.get_ident() != ledger._test_thread:
+                return fn(*args, **kwargs)
+            started = ledger._clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                ledger.add(category, started, ledger._clock(), count=count)
+
+        return wrapper
+
+    def add(self, category, started, ended, count=None):
+        self._spans.append((started, ended, category))
+        if count:
+            self._counts[count] = self._counts.get(count, 0) + 1
+
+    # ---------- per test ----------
+    def start_test(self, nodeid):
+        self._spans, self._counts = [], {}
+        self._test = nodeid
+        self._test_thread = threading.get_ident()
+        self._started = self._clock()
+
+    def end_test(self):
+        """Close the running test; returns its breakdown (None when no test was started)."""
+        if self._test is None:
+            return None
+        ended = self._clock()
+        spans, counts = list(self._spans), dict(self._counts)
+        for c in (self.profiler.pop_test_commands(self._test) if self.profiler else []):
+            if c.started is None or c.started < self._started:
+                continue
+            if c.command in NAVIGATION_COMMANDS:
+                category, key = "load_wait", "navigations"
+            elif c.command in WAIT_COMMANDS:
+                category, key = "load_wait", "waits"
+            else:
+                category, key = "webdriver", "round_trips"
+            spans.append((c.started, c.started + c.seconds, category))
+            counts[key] = counts.get(key, 0) + 1
+
+        wall = ended - self._started
+        seconds = attribute(spans, self._started, ended)
+        result = {
+            "test": self._test,
+            "wall_seconds": round(wall, 4),
+            "seconds": {k: round(v, 4) for k, v in seconds.items()},
+            "share": {k: round(v / wall, 4) if wall > 0 else 0.0 for k, v in seconds.items()},
+            "counts": counts,
+        }
+        self.results.append(result)
+        self._test = self._test_thread = self._started = None
+        self._spans, self._counts = [], {}
+        return result
+
+    # ---------- output ----------
+    @staticmethod
+    def format(result):
+        """Text table of one breakdown (the Allure attachment)."""
+        counts = result["counts"]
+        notes = {
+            "sleep": f"{counts.get('sleeps', 0)} sleeps",
+            "webdriver": f"{counts.get('round_trips', 0)} round trips",
+            "load_wait": f"{counts.get('navigations', 0)} navigations, {counts.get('waits', 0)} waits",
+            "python": "",
+        }
+        lines = [f"{result['test']}: {result['wall_seconds']:.2f}s wall"]
+        for category in CATEGORIES:
+            lines.append(f"  {category:<10}{result['seconds'][category]:>9.2f}s {result['share'][category]:>6.0%}"
+                         f"  {notes[category]}".rstrip())
+        return "\n".join(lines)
+
+    def summary(self):
+        totals = dict.fromkeys(CATEGORIES, 0.0)
+        for result in self.results:
+            for category in CATEGORIES:
+                totals[category] += result["seconds"][category]
+        return {
+            "worker": worker_id(),
+            "run_id": run_id(),
+            "wall_seconds": round(sum(r["wall_seconds"] for r in self.results), 4),
+            "seconds": {k: round(v, 4) for k, v in totals.items()},
+            "tests": list(self.results),
+        }
+
+    def report_path(self):
+        return os.path.join(self.report_dir, f"time_breakdown_{worker_id()}.json")
+
+    def write_report(self):
+        """Write the summary as JSON; returns (path, summary)."""
+        summary = self.summary()
+        path = self.report_path()
+        os.makedirs(self.report_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        return path, summary
@@ -14,19 +14,24 @@
 #         search_box.send_keys(item_name)
 #         search_box.send_keys(Keys.RETURN)
 import allure
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from base.base_driver import BaseDriver
+from base.base_driver import BaseDriver, By
 
 
 class HomePage(BaseDriver):
     SEARCH_BOX = (By.ID, "gh-ac")
+    READY_LOCATOR = SEARCH_BOX
 
-    def __init__(self, driver):
-        super().__init__(driver)
+    def __init__(self, driver, site=None):
+        super().__init__(driver, site)
+
+    @allure.step("Opening home page")
+    def open_home(self, timeout=30):
+        return self.open(self.site.home, timeout)
 
     @allure.step("Searching for item: {item_name}")
     def search_item(self, item_name):
+        from selenium.webdriver.common.keys import Keys
+
         search_box = self.wait_for_element(self.SEARCH_BOX)
         search_box.clear()
         search_box.send_keys(item_name)
@@ -0,0 +1,15 @@
+# pages/product_page.py
+from base.base_driver import BaseDriver, By
+
+
+class ProductPage(BaseDriver):
+    TITLE = (By.CSS_SELECTOR, "h1, #itemTitle, .x-item-title__main, .it-ttl")
+    # ready = item title rendered, or a verification wall that replaced the product (nothing else will load)
+    READY_LOCATOR = (
+        By.CSS_SELECTOR,
+        "h1, #itemTitle, .x-item-title__main, .it-ttl, "
+        "iframe[src*='captcha'], .h-captcha, .g-recaptcha, .captcha",
+    )
+
+    def __init__(self, driver, site=None):
+        super().__init__(driver, site)
@@ -1,14 +1,99 @@
 # pages/search_results_page.py
 import allure
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
-
-
-class SearchResultsPage:
-    def __init__(self, driver):
-        self.driver = driver
+from base.base_driver import BaseDriver, By
+from base.fake_driver import register_script
+from pages.search_results_parser import item_id_from_href, parse_search_results
+from Utilities.pacing import pause
+
+
+# Collects result anchors of every layout in one pass (same order of preference as the old
+# per-locator loops) and returns plain records, deduplicated by eBay item id (href if none).
+_COLLECT_CANDIDATES_JS = """
+var limit = arguments[0], productsOnly = arguments[1];
+var seen = {}, out = [];
+function itemId(href) {
+  var m = /\\/itm\\/(?:[^\\/?#]*\\/)?(\\d{6,})/.exec(href || '');
+  return m ? m[1] : null;
+}
+function add(a, layout) {
+  if (!a || !a.href) return;
+  var id = itemId(a.href), key = id || a.href;
+  if (seen[key] || (productsOnly && !id)) return;
+  seen[key] = true;
+  var img = a.querySelector('img');
+  out.push({
+    element: a,
+    href: a.href,
+    text: (a.innerText || '').trim(),
+    alt: img ? (img.getAttribute('alt') || '').trim() : '',
+    item_id: id,
+    layout: layout
+  });
+}
+function each(selector, layout) {
+  document.querySelectorAll(selector).forEach(function (a) { add(a, layout); });
+}
+each('a.s-item__link', 'list');
+each('li.s-item a', 'list');
+each('.srp-results a, .s-item__wrapper a, .s-list .s-item a', 'results');
+document.querySelectorAll('img.s-card__image').forEach(function (img) { add(img.closest('a'), 'card'); });
+each("a[href*='/itm/']", 'link');
+return limit ? out.slice(0, limit) : out;
+"""
+
+
+def _collect_candidates_twin(driver, limit=0, products_only=False, *args):
+    # Python twin of _COLLECT_CANDIDATES_JS for the fake driver, which has no JavaScript engine
+    seen, out = set(), []
+
+    def add(anchor, layout):
+        if anchor is None:
+            return
+        href = anchor.get_attribute("href")
+        if not href:
+            return
+        item_id = item_id_from_href(href)
+        key = item_id or href
+        if key in seen or (products_only and not item_id):
+            return
+        seen.add(key)
+        imgs = anchor.find_elements(By.TAG_NAME, "img")
+        out.append({
+            "element": anchor,
+            "href": href,
+            "text": anchor.text.strip(),
+            "alt": (imgs[0].get_attribute("alt") or "").strip() if imgs else "",
+            "item_id": item_id,
+            "layout": layout,
+        })
+
+    for selector, layout in (
+        ("a.s-item__link", "list"),
+        ("li.s-item a", "list"),
+        (".srp-results a, .s-item__wrapper a, .s-list .s-item a", "results"),
+    ):
+        for anchor in driver.find_elements(By.CSS_SELECTOR, selector):
+            add(anchor, layout)
+    for img in driver.find_elements(By.CSS_SELECTOR, "img.s-card__image"):
+        anchors = img.find_elements(By.XPATH, "./ancestor::a[1]")
+        add(anchors[0] if anchors else None, "card")
+    for anchor in driver.find_elements(By.CSS_SELECTOR, "a[href*='/itm/']"):
+        add(anchor, "link")
+    return out[:limit] if limit else out
+
+
+register_script(_COLLECT_CANDIDATES_JS, _collect_candidates_twin)
+
+
+class SearchResultsPage(BaseDriver):
+    # any of the result layouts (classic list, card grid) being rendered
+    READY_LOCATOR = (
+        By.CSS_SELECTOR,
+        "a.s-item__link, li.s-item, .srp-results a, img.s-card__image, .s-item__wrapper",
+    )
+
+    def __init__(self, driver, site=None):
+        super().__init__(driver, site)
 
     def _dismiss_common_overlays(self):
         """
@@ -16,7 +101,7 @@ class SearchResultsPage:
         It's safe to call this; if nothing is present it just continues.
         """
         try:
-            # common accept/close buttons — we try a few selectors
+            # common accept/close buttons — checked together in one browser round trip
             candidates = [
                 "button[aria-label='Close']",
                 "button[aria-label='Accept']",
@@ -25,18 +110,40 @@ class SearchResultsPage:
                 "button.privacy-accept",     # generic
                 "button.btn--primary",       # generic
             ]
-            for sel in candidates:
-                try:
-                    el = self.driver.find_element(By.CSS_SELECTOR, sel)
-                    if el and el.is_displayed():
-                        el.click()
-                        time.sleep(0.5)
-                        return
-                except Exception:
-                    continue
+            el, _ = self.find_first_visible(candidates)
+            if el:
+                el.click()
+                pause("after_click")
         except Exception:
             pass
 
+    @allure.step("Collecting search result candidates")
+    def collect_candidates(self, limit=None, products_only=False):
+        """
+        Every result anchor on the page as a list of dicts:
+          {element, href, text, alt, item_id, layout}
+        layout is list | card | results | link (which pattern found it); item_id is the numeric
+        eBay id from /itm/ links (None otherwise). One script call replaces the per-anchor
+        get_attribute / .text / find_element(img) round trips.
+        - limit: keep only the first N records
+        - products_only: drop anchors without an item id (filters, pagination, seller links)
+        """
+        records = self.driver.execute_script(_COLLECT_CANDIDATES_JS, limit or 0, bool(products_only))
+        return records or []
+
+    @allure.step("Parsing search results snapshot")
+    def snapshot_products(self, products_only=False):
+        """
+        Product cards (title, price, href, item_id, alt, layout) parsed in Python from a single
+        page_source snapshot; the browser is only needed again to click.
+        - products_only: drop cards without an item id (see parse_search_results)
+        """
+        try:
+            base_url = self.driver.current_url
+        except Exception:
+            base_url = self.site.home
+        return parse_search_results(self.driver.page_source, base_url=base_url, products_only=products_only)
+
     @allure.step("Clicking item containing keyword: {keyword}")
     def click_item_with_keyword(self, keyword):
         """
@@ -50,77 +157,18 @@ class SearchResultsPage:
         try:
             self._dismiss_common_overlays()
 
-            wait = WebDriverWait(self.driver, 30)
-
             # Wait for any of the likely patterns to appear on the page
-            wait.until(EC.presence_of_all_elements_located((
-                By.CSS_SELECTOR,
-                "a.s-item__link, li.s-item, .srp-results a, img.s-card__image, .s-item__wrapper"
-            )))
+            self.wait_until_ready(timeout=30)
 
             keyword_lower = keyword.lower() if isinstance(keyword, str) else str(keyword).lower()
-            candidates = []
-
-            # 1) Preferred: anchors with class s-item__link
-            try:
-                anchors = self.driver.find_elements(By.CSS_SELECTOR, "a.s-item__link")
-                for a in anchors:
-                    candidates.append(a)
-            except Exception:
-                pass
 
-            # 2) Anchors under li.s-item
-            try:
-                anchors2 = self.driver.find_elements(By.CSS_SELECTOR, "li.s-item a")
-                for a in anchors2:
-                    if a not in candidates:
-                        candidates.append(a)
-            except Exception:
-                pass
-
-            # 3) Anchors in srp-results or s-item__wrapper
-            try:
-                anchors3 = self.driver.find_elements(By.CSS_SELECTOR, ".srp-results a, .s-item__wrapper a, .s-list .s-item a")
-                for a in anchors3:
-                    if a not in candidates:
-                        candidates.append(a)
-            except Exception:
-                pass
-
-            # 4) Cards: find images and resolve to ancestor anchor (newer layout)
-            try:
-                imgs = self.driver.find_elements(By.CSS_SELECTOR, "img.s-card__image")
-                for img in imgs:
-                    try:
-                        a = img.find_element(By.XPATH, "./ancestor::a[1]")
-                        if a and a not in candidates:
-                            candidates.append(a)
-                    except Exception:
-                        continue
-            except Exception:
-                pass
-
-            # 5) Fallback: any anchors that look like product links (/itm/)
-            try:
-                all_anchors = self.driver.find_elements(By.XPATH, "//a[contains(@href,'/itm/')]")
-                for a in all_anchors:
-                    if a not in candidates:
-                        candidates.append(a)
-            except Exception:
-                pass
+            # all layouts extracted in one browser round trip, deduplicated by item id
+            candidates = self.collect_candidates()
 
             # Try each candidate: check its visible text, child image alt, or href
-            for idx, a in enumerate(candidates):
+            for idx, c in enumerate(candidates):
                 try:
-                    href = a.get_attribute("href") or ""
-                    text = (a.text or "").strip()
-                    alt_text = ""
-                    try:
-                        img = a.find_element(By.TAG_NAME, "img")
-                        alt_text = (img.get_attribute("alt") or "").strip()
-                    except Exception:
-                        alt_text = ""
-
+                    a, href, text, alt_text = c["element"], c["href"], c["text"], c["alt"]
                     combined = " ".join([text, alt_text, href]).lower()
 
                     # match keyword or prefer explicit product links
@@ -130,7 +178,7 @@ class SearchResultsPage:
                             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", a)
                         except Exception:
                             pass
-                        time.sleep(0.4)
+                        pause("after_scroll")
                         try:
                             a.click()
                         except Exception:
@@ -139,7 +187,7 @@ class SearchResultsPage:
                                 self.driver.execute_script("arguments[0].click();", a)
                             except Exception:
                                 pass
-                        time.sleep(2)
+                        pause("page_react")
                         return True
                 except Exception:
                     # if a candidate fails (stale element, click intercepted), continue to next
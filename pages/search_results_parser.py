@@ -0,0 +1,110 @@
+# pages/search_results_parser.py
+import re
+from urllib.parse import urljoin
+
+
+_ITEM_ID = re.compile(r"/itm/(?:[^/?#]*/)?(\d{6,})")
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# result containers of the two layouts SearchResultsPage handles
+_LIST_ITEMS = f"//li[{_has_class('s-item')}]"
+_CARD_ITEMS = f"//*[{_has_class('s-card')}]"
+
+
+def item_id_from_href(href):
+    m = _ITEM_ID.search(href or "")
+    return m.group(1) if m else None
+
+
+def _text(node):
+    return " ".join((node.text_content() or "").split()) if node is not None else ""
+
+
+def _first(node, *xpaths):
+    """First match of the first xpath that matches anything (later ones are fallbacks)."""
+    for xpath in xpaths:
+        found = node.xpath(xpath)
+        if found:
+            return found[0]
+    return None
+
+
+def _record(container, layout, base_url):
+    if layout == "list":
+        link = _first(container, f".//a[{_has_class('s-item__link')}]", ".//a[contains(@href, '/itm/')]")
+        title = _first(container, f".//*[{_has_class('s-item__title')}]")
+        price = _first(container, f".//*[{_has_class('s-item__price')}]")
+        img = _first(container, ".//img")
+    else:
+        link = _first(container, ".//a[contains(@href, '/itm/')]", ".//a[@href]")
+        title = _first(container, f".//*[{_has_class('s-card__title')}]")
+        price = _first(container, f".//*[{_has_class('s-card__price')}]")
+        img = _first(container, f".//img[{_has_class('s-card__image')}]", ".//img")
+
+    if link is None or not link.get("href"):
+        return None
+    href = urljoin(base_url, link.get("href"))
+    title_text = _text(title) or _text(link)
+    # eBay prefixes fresh items with a "New Listing" badge inside the title element
+    title_text = re.sub(r"^New Listing\s*", "", title_text)
+    return {
+        "title": title_text,
+        "price": _text(price),
+        "href": href,
+        "item_id": item_id_from_href(href),
+        "alt": (img.get("alt") or "").strip() if img is not None else "",
+        "layout": layout,
+    }
+
+
+def parse_search_results(page_source, base_url="https://www.ebay.com", products_only=False):
+    """
+    Product cards from one search results page snapshot, parsed in-process (no WebDriver calls).
+    Handles the classic list layout (li.s-item) and the card layout (.s-card / img.s-card__image),
+    plus stray /itm/ links outside both. Returns a list of dicts:
+      {title, price, href, item_id, alt, layout}
+    deduplicated by item id (href when there is none), in page order.
+    - products_only: drop records without an item id (a card whose only link is a seller,
+      sponsored or "see more" link), like SearchResultsPage.collect_candidates(products_only=True)
+    """
+    if not page_source:
+        return []
+    from lxml import html as lxml_html  # imported on first parse, not when the page objects load
+
+    doc = lxml_html.fromstring(page_source)
+
+    products = []
+    seen = set()
+
+    def add(record):
+        if not record or (products_only and not record["item_id"]):
+            return
+        key = record["item_id"] or record["href"]
+        if key in seen:
+            return
+        seen.add(key)
+        # eBay renders a hidden "Shop on eBay" template as the first s-item (its links stay skipped too)
+        if record["title"].lower() == "shop on ebay":
+            return
+        products.append(record)
+
+    for container in doc.xpath(_LIST_ITEMS):
+        add(_record(container, "list", base_url))
+    for container in doc.xpath(_CARD_ITEMS):
+        add(_record(container, "card", base_url))
+    for link in doc.xpath("//a[contains(@href, '/itm/')]"):
+        href = urljoin(base_url, link.get("href"))
+        img = _first(link, ".//img")
+        add({
+            "title": _text(link),
+            "price": "",
+            "href": href,
+            "item_id": item_id_from_href(href),
+            "alt": (img.get("alt") or "").strip() if img is not None else "",
+            "layout": "link",
+        })
+    return products
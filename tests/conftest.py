@@ -194,102 +194,577 @@
 
 ############ idhar se fresh code for github ####
 # conftest.py
+import json
 import os
-import time
+import tempfile
+
 import pytest
 import allure
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.edge.options import Options as EdgeOptions
 
-# local manager (used only outside CI)
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
+from base.auth_session import DEFAULT_MAX_AGE, AuthSession, AuthState
+from base.driver_factory import build_driver, build_service, uses_persistent_profile
+from base.driver_pool import DriverPool
+from base.driver_resolver import DriverResolver
+from base.driver_service import DriverServiceManager
+from base.lean_mode import DEFAULT_BLOCKED_TYPES, LeanMode
+from base.parallel import BrowserSlots, browser_for_worker, machine_browser_capacity, run_id
+from base.profiler import DEFAULT_TOP as PROFILE_TOP, WebDriverProfiler
+from base.site import Site, set_site
+from base.time_breakdown import TimeLedger
+from Utilities.notify import MODES as NOTIFY_MODES, Notifier, set_notifier
+from Utilities.pacing import PROFILES as PACING_PROFILES, Pacing, parse_points, set_pacing
+from Utilities.rate_control import NoRateControl, RateController
+from Utilities.search_cases import DEFAULT_DATA_FILE, case_id, parse_shard, select_cases
+from Utilities.standin_server import LAYOUTS, StandinServer
+from Utilities.traffic_proxy import DEFAULT_IGNORED_PARAMS, MatchRules, TrafficProxy, archive_path_for_worker
+
+AUTH_STATE_FILE = "auth_state.json"
+COOKIES_FILE = "cookies.json"      # written by tests/save_login_cookies.py
+
 
 def pytest_addoption(parser):
     parser.addoption(
         "--browser",
         action="store",
         default="chrome",
-        help="Browser to run tests: chrome | firefox | edge",
+        help="Browser to run tests: chrome | firefox | edge | fake (browserless, implies --standin). "
+             "A comma separated list (chrome,firefox) is spread round-robin over xdist workers",
+    )
+    parser.addoption(
+        "--max-browsers",
+        action="store",
+        type=int,
+        default=0,
+        help="Cap on browsers alive at once across all xdist workers (0 = derive from CPU cores / RAM)",
+    )
+    parser.addoption(
+        "--max-driver-uses",
+        action="store",
+        type=int,
+        default=20,
+        help="Recycle a pooled browser after this many tests (1 = fresh browser for every test)",
+    )
+    parser.addoption(
+        "--standby-depth",
+        action="store",
+        type=int,
+        default=0,
+        help="Spare browsers to pre-launch in the background while tests run (0 = off)",
+    )
+    parser.addoption(
+        "--driver-service",
+        action="store",
+        default="shared",
+        choices=("shared", "per-session"),
+        help="shared: one chromedriver/geckodriver/msedgedriver process for the whole run | "
+             "per-session: a new driver process for every browser",
+    )
+    parser.addoption(
+        "--driver-path",
+        action="store",
+        default=None,
+        help="Use this chromedriver/geckodriver/msedgedriver binary instead of resolving one",
+    )
+    parser.addoption(
+        "--page-load-strategy",
+        action="store",
+        default="normal",
+        choices=("normal", "eager", "none"),
+        help="When driver.get() returns: normal (load event) | eager (DOMContentLoaded) | none (immediately). "
+             "Page objects wait for their own readiness locators either way",
+    )
+    parser.addoption(
+        "--lean",
+        action="store_true",
+        default=False,
+        help="Lean page loads (Chrome/Edge): block images, fonts, media, ads and trackers via DevTools",
+    )
+    parser.addoption(
+        "--lean-types",
+        action="store",
+        default=",".join(DEFAULT_BLOCKED_TYPES),
+        help="Resource types blocked by --lean: image,font,media,stylesheet",
+    )
+    parser.addoption(
+        "--lean-block",
+        action="store",
+        default="",
+        help="Extra comma separated URL patterns blocked by --lean, e.g. '*rover.ebay.com*,*/beacon/*'",
+    )
+    parser.addoption(
+        "--base-url",
+        action="store",
+        default=None,
+        help="Run against this host instead of live eBay (home /, sign-in /signin, cart /cart), "
+             "e.g. a stand-in started with `python -m Utilities.standin_server`",
+    )
+    parser.addoption(
+        "--standin",
+        action="store_true",
+        default=False,
+        help="Start the bundled local eBay stand-in (one per worker) and run against it: offline and repeatable",
+    )
+    parser.addoption(
+        "--standin-layout",
+        action="store",
+        default="list",
+        choices=LAYOUTS,
+        help="Search results layout served by --standin: list (li.s-item) | card (.s-card)",
+    )
+    parser.addoption(
+        "--record",
+        action="store",
+        default=None,
+        metavar="ARCHIVE",
+        help="Route browsers through a local proxy and record all traffic to ARCHIVE (.jsonl.gz)",
+    )
+    parser.addoption(
+        "--replay",
+        action="store",
+        default=None,
+        metavar="ARCHIVE",
+        help="Answer every browser request from a --record archive instead of the network",
+    )
+    parser.addoption(
+        "--replay-ignore-params",
+        action="store",
+        default=",".join(DEFAULT_IGNORED_PARAMS),
+        help="Comma separated query parameters ignored when matching replayed requests",
+    )
+    parser.addoption(
+        "--replay-ignore-query",
+        action="store_true",
+        default=False,
+        help="Match replayed requests on scheme, host and path only",
+    )
+    parser.addoption(
+        "--replay-match-body",
+        action="store_true",
+        default=False,
+        help="Also match the request body (tell apart POSTs to the same URL)",
+    )
+    parser.addoption(
+        "--replay-on-miss",
+        action="store",
+        default="error",
+        choices=("error", "passthrough"),
+        help="Request not in the archive: error (404) | passthrough (fetch it live)",
+    )
+    parser.addoption(
+        "--pacing",
+        action="store",
+        default="auto",
+        choices=("auto",) + PACING_PROFILES,
+        help="Pauses between actions: human (randomized, live site) | zero (none) | custom (--pacing-points). "
+             "auto = zero for --standin / --base-url / --replay / fake, human for live eBay",
+    )
+    parser.addoption(
+        "--pacing-scale",
+        action="store",
+        type=float,
+        default=1.0,
+        help="Multiply every pause of the human / custom profile (0.5 = twice as fast)",
+    )
+    parser.addoption(
+        "--pacing-points",
+        action="store",
+        default="",
+        help="custom profile overrides, e.g. 'between_products=0.5-1,after_click=0' (see Utilities/pacing.py)",
+    )
+    parser.addoption(
+        "--rate",
+        action="store",
+        default="auto",
+        choices=("auto", "adaptive", "off"),
+        help="adaptive: page loads share one AIMD token bucket across workers that backs off on CAPTCHAs "
+             "and speeds up while clean | off | auto = adaptive against live eBay only",
+    )
+    parser.addoption(
+        "--rate-start",
+        action="store",
+        type=float,
+        default=0.5,
+        help="Starting page loads per second of --rate=adaptive",
+    )
+    parser.addoption(
+        "--rate-max",
+        action="store",
+        type=float,
+        default=2.0,
+        help="Upper bound of the learned page loads per second",
+    )
+    parser.addoption(
+        "--captcha-notify",
+        action="store",
+        default="bell",
+        choices=NOTIFY_MODES,
+        help="How to call for a human when a CAPTCHA needs solving: bell (print + terminal bell) | off (print only)",
+    )
+    parser.addoption(
+        "--captcha-notify-cmd",
+        action="store",
+        default=None,
+        help="Command to run as well, e.g. \"notify-send eBay {message}\" ({message} is replaced, else appended)",
+    )
+    parser.addoption(
+        "--auth-state",
+        action="store",
+        default=None,
+        help="Signed-in state file shared by all workers (default: auth_state.json for live eBay, "
+             "a per-run temp file for the stand-in)",
+    )
+    parser.addoption(
+        "--auth-max-age",
+        action="store",
+        type=float,
+        default=DEFAULT_MAX_AGE / 3600,
+        help="Hours a saved sign-in is trusted before signing in again",
+    )
+    parser.addoption(
+        "--search-data",
+        action="store",
+        default=DEFAULT_DATA_FILE,
+        help="Workbook with one search case per row (keyword, match_tokens, max_products); "
+             "see Utilities/search_cases.py",
+    )
+    parser.addoption(
+        "--search-sheet",
+        action="store",
+        default=None,
+        help="Sheet of --search-data to read (default: the active one)",
+    )
+    parser.addoption(
+        "--data-shard",
+        action="store",
+        default=None,
+        help="K/N: run only the search cases whose keyword hashes to shard K of N (stable across runs)",
+    )
+    parser.addoption(
+        "--data-limit",
+        action="store",
+        type=int,
+        default=None,
+        help="Stop reading search cases after this many (after sharding)",
+    )
+    parser.addoption(
+        "--profile-webdriver",
+        action="store_true",
+        default=False,
+        help="Record every WebDriver command (latency, payload, calling page-object method) and write "
+             "reports/webdriver_profile_<worker>.json at the end of the session",
+    )
+    parser.addoption(
+        "--profile-top",
+        action="store",
+        type=int,
+        default=PROFILE_TOP,
+        help="Slowest call sites listed in the --profile-webdriver report",
+    )
+    parser.addoption(
+        "--time-breakdown",
+        action="store_true",
+        default=False,
+        help="Split every test's wall time into sleep / WebDriver round trips / load waits / Python; "
+             "attached to the Allure report and written to reports/time_breakdown_<worker>.json",
     )
 
-def _is_ci():
-    return bool(os.getenv("CI") or os.getenv("GITHUB_ACTIONS"))
 
-@pytest.fixture(scope="function")
-def setup_driver(request):
-    browser = request.config.getoption("--browser").lower()
-
-    # ---------- CHROME ----------
-    if browser == "chrome":
-        options = ChromeOptions()
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option("useAutomationExtension", False)
-        options.add_argument(
-            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        )
-
-        if _is_ci():
-            # CI: use system-installed chromium & chromedriver
-            # Try to set binary_location sensibly for ubuntu runners
-            if os.path.exists("/usr/bin/chromium-browser"):
-                options.binary_location = "/usr/bin/chromium-browser"
-            elif os.path.exists("/usr/bin/chromium"):
-                options.binary_location = "/usr/bin/chromium"
-            # headless & CI-friendly flags
-            options.add_argument("--headless=new")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--window-size=1920,1080")
-            # Use system chromedriver path (installed on the runner)
-            service = ChromeService(executable_path="/usr/bin/chromedriver")
-        else:
-            # Local dev: allow using local Chrome profile, webdriver-manager for chromedriver
-            ud = os.getenv("CHROME_USER_DATA")
-            pd = os.getenv("CHROME_PROFILE_DIR")
-            if ud:
-                options.add_argument(f"--user-data-dir={ud}")
-            if pd:
-                options.add_argument(f"--profile-directory={pd}")
-            # do not start headless locally so you can manually solve captchas
-            service = ChromeService(ChromeDriverManager().install())
-
-        driver = webdriver.Chrome(service=service, options=options)
-
-    # ---------- FIREFOX ----------
-    elif browser == "firefox":
-        options = FirefoxOptions()
-        options.set_preference("dom.webdriver.enabled", False)
-        options.set_preference("useAutomationExtension", False)
-        if _is_ci():
-            options.add_argument("--headless")
-        driver = webdriver.Firefox(options=options)
-
-    # ---------- EDGE ----------
-    elif browser == "edge":
-        options = EdgeOptions()
-        if _is_ci():
-            options.add_argument("--headless=new")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--window-size=1920,1080")
-        else:
-            options.add_argument("start-maximized")
-        driver = webdriver.Edge(options=options)
-
-    else:
-        raise ValueError(f"Browser '{browser}' is not supported. Use chrome | firefox | edge.")
+def pytest_generate_tests(metafunc):
+    """One search test per workbook row; rows are streamed, sharded and limited while collecting."""
+    if "search_case" not in metafunc.fixturenames:
+        return
+    config = metafunc.config
+    try:
+        shard = parse_shard(config.getoption("--data-shard"))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    cases = list(select_cases(
+        config.getoption("--search-data"),
+        config.getoption("--search-sheet"),
+        shard=shard,
+        limit=config.getoption("--data-limit"),
+    ))
+    metafunc.parametrize("search_case", cases, ids=[case_id(case) for case in cases])
+
+
+def _max_browsers(config):
+    return config.getoption("--max-browsers") or machine_browser_capacity()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """`-n auto`: never start more workers than the machine can run browsers for."""
+    return _max_browsers(config)
+
 
+def pytest_configure(config):
+    """
+    A --pacing-points typo stops the run before any test starts.
+    An explicit `-n` above the browser cap is lowered to it: every worker keeps its pooled browser
+    (and that browser's slot) until its session ends, so the extra workers would only wait for a
+    slot until BrowserSlots times out and then fail all of their tests.
+    """
     try:
-        driver.maximize_window()
-    except Exception:
-        pass
+        parse_points(config.getoption("--pacing-points"))
+    except ValueError as e:
+        raise pytest.UsageError(f"--pacing-points: {e}")
+    if hasattr(config, "workerinput"):
+        return
+    workers = getattr(config.option, "numprocesses", None)
+    limit = _max_browsers(config)
+    # xdist has already turned -n N into N "popen" gateways; --tx specs of your own are left alone
+    if isinstance(workers, int) and workers > limit and getattr(config.option, "tx", None) == ["popen"] * workers:
+        print(f"⚠️ -n {workers} is more than the {limit} browsers allowed at once "
+              f"(--max-browsers / CPU / RAM): running {limit} workers")
+        config.option.numprocesses = limit
+        config.option.tx = ["popen"] * limit
+
+
+@pytest.fixture(scope="session")
+def browser_name(request):
+    """This worker's browser (see --browser fan-out)."""
+    return browser_for_worker(request.config.getoption("--browser"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def site(request, browser_name):
+    """Live eBay by default; --standin / --base-url point every page object and test at one local host."""
+    server = None
+    base_url = request.config.getoption("--base-url")
+    # the fake driver has no JavaScript engine, so it can't drive live eBay
+    if request.config.getoption("--standin") or (browser_name == "fake" and not base_url):
+        server = StandinServer(layout=request.config.getoption("--standin-layout")).start()
+        base_url = server.base_url
+        print(f"🧪 eBay stand-in running at {base_url}")
+    current = set_site(Site(base_url))
+    yield current
+    set_site(None)
+    if server:
+        server.stop()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def pacing(request, site):
+    """Active pacing profile; every pause in page objects and tests goes through it."""
+    name = request.config.getoption("--pacing")
+    if name == "auto":
+        name = "human" if site.is_live and not request.config.getoption("--replay") else "zero"
+    current = set_pacing(Pacing.profile(
+        name,
+        scale=request.config.getoption("--pacing-scale"),
+        points=request.config.getoption("--pacing-points"),
+    ))
+    yield current
+    if current.slept:
+        print(f"⏱️ pacing '{current.name}': {current.slept:.1f}s spent in deliberate pauses")
+    set_pacing(None)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def notifier(request):
+    """Who gets called when a run needs a human (see Utilities/notify.py)."""
+    current = set_notifier(Notifier(
+        bell=request.config.getoption("--captcha-notify") == "bell",
+        command=request.config.getoption("--captcha-notify-cmd"),
+    ))
+    yield current
+    set_notifier(None)
+
+
+@pytest.fixture(scope="session")
+def rate_controller(request, site, pacing):
+    """Shared page-load rate for the live site (a no-op object with --rate=off)."""
+    mode = request.config.getoption("--rate")
+    if mode == "auto":
+        mode = "adaptive" if site.is_live and not request.config.getoption("--replay") else "off"
+    if mode == "off":
+        yield NoRateControl()
+        return
+    controller = RateController(
+        rate=request.config.getoption("--rate-start"),
+        max_rate=request.config.getoption("--rate-max"),
+    )
+    # the controller spaces page loads now; the fixed jitter it replaces goes away
+    pacing.without("between_products", "after_product")
+    yield controller
+    print(f"🚦 {controller.summary()}")
+    controller.close()
+
+
+@pytest.fixture(scope="session")
+def driver_resolver(request):
+    """Resolves the driver binary once per session; the path is cached on disk per browser version."""
+    return DriverResolver(override_path=request.config.getoption("--driver-path"))
+
+
+@pytest.fixture(scope="session")
+def driver_services(request, driver_resolver):
+    """Session-level driver process manager (None when --driver-service=per-session)."""
+    if request.config.getoption("--driver-service") != "shared":
+        yield None
+        return
+    services = DriverServiceManager(service_factory=lambda browser: build_service(browser, driver_resolver))
+    yield services
+    services.stop_all()
+
+
+@pytest.fixture(scope="session")
+def traffic_proxy(request):
+    """Record/replay proxy in front of the browsers (None unless --record / --replay)."""
+    record, replay = request.config.getoption("--record"), request.config.getoption("--replay")
+    if record and replay:
+        raise pytest.UsageError("--record and --replay can't be used together")
+    if not (record or replay):
+        yield None
+        return
+    rules = MatchRules(
+        ignore_params=[p.strip() for p in request.config.getoption("--replay-ignore-params").split(",") if p.strip()],
+        ignore_query=request.config.getoption("--replay-ignore-query"),
+        match_body=request.config.getoption("--replay-match-body"),
+    )
+    proxy = TrafficProxy(
+        mode="record" if record else "replay",
+        archive_path=archive_path_for_worker(record) if record else replay,
+        rules=rules,
+        on_miss=request.config.getoption("--replay-on-miss"),
+    ).start()
+    yield proxy
+    proxy.stop()
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request, browser_name, driver_services, driver_resolver, traffic_proxy):
+    """One pool per session (per xdist worker): browsers are launched once and reused across tests."""
+    browser = browser_name
+    lean = None
+    if request.config.getoption("--lean"):
+        lean = LeanMode.from_cli(request.config.getoption("--lean-types"), request.config.getoption("--lean-block"))
+    pool = DriverPool(
+        factory=lambda: build_driver(
+            browser,
+            services=driver_services,
+            resolver=driver_resolver,
+            lean=lean,
+            page_load_strategy=request.config.getoption("--page-load-strategy"),
+            proxy=traffic_proxy,
+        ),
+        max_uses=request.config.getoption("--max-driver-uses"),
+        # a real Chrome profile keeps its login between tests, so don't wipe its cookies
+        reset_cookies=not uses_persistent_profile(browser),
+        # a persistent profile can only be opened by one browser at a time
+        standby_depth=0 if uses_persistent_profile(browser) else request.config.getoption("--standby-depth"),
+        # shared across workers so the whole run stays under the CPU/RAM budget
+        slots=BrowserSlots(_max_browsers(request.config)),
+    )
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def webdriver_profiler(request):
+    """WebDriver command profiler (None unless --profile-webdriver / --time-breakdown); see base/profiler.py."""
+    report = request.config.getoption("--profile-webdriver")
+    if not (report or request.config.getoption("--time-breakdown")):
+        yield None
+        return
+    # the time breakdown reads each test's commands back; the profile report alone only needs totals
+    profiler = WebDriverProfiler(top=request.config.getoption("--profile-top"),
+                                 keep_commands=request.config.getoption("--time-breakdown"))
+    yield profiler
+    if not report:
+        return
+    try:
+        path, summary = profiler.write_report()
+        print(f"🔬 WebDriver profile: {summary['round_trips']} round trips, "
+              f"{summary['webdriver_seconds']:.1f}s in WebDriver -> {path}")
+    except Exception as e:
+        print("could not write the WebDriver profile:", e)
+
+
+@pytest.fixture(scope="session")
+def time_ledger(request, webdriver_profiler):
+    """Per-test wall time accounting (None unless --time-breakdown); see base/time_breakdown.py."""
+    if not request.config.getoption("--time-breakdown"):
+        yield None
+        return
+    ledger = TimeLedger(profiler=webdriver_profiler).install()
+    yield ledger
+    ledger.uninstall()
+    try:
+        path, summary = ledger.write_report()
+        seconds = summary["seconds"]
+        print(f"⏱️ time breakdown over {summary['wall_seconds']:.1f}s: sleep {seconds['sleep']:.1f}s, "
+              f"webdriver {seconds['webdriver']:.1f}s, load waits {seconds['load_wait']:.1f}s, "
+              f"python {seconds['python']:.1f}s -> {path}")
+    except Exception as e:
+        print("could not write the time breakdown:", e)
+
+
+@pytest.fixture(autouse=True)
+def time_breakdown(request, time_ledger):
+    """Opens / closes this test in the ledger and attaches its breakdown to the Allure report."""
+    if time_ledger is None:
+        yield
+        return
+    time_ledger.start_test(request.node.nodeid)
+    yield
+    result = time_ledger.end_test()
+    if result:
+        try:
+            allure.attach(TimeLedger.format(result), name="time_breakdown",
+                          attachment_type=allure.attachment_type.TEXT)
+            allure.attach(json.dumps(result, indent=2), name="time_breakdown.json",
+                          attachment_type=allure.attachment_type.JSON)
+        except Exception:
+            pass
+
+
+@pytest.fixture(scope="session")
+def auth_session(request, site):
+    """Signed-in state for the whole run: saved state, cookies.json, or one real sign-in (see base/auth_session.py)."""
+    path = request.config.getoption("--auth-state")
+    if not path:
+        path = AUTH_STATE_FILE if site.is_live else os.path.join(tempfile.gettempdir(), "ebay_auth", f"{run_id()}.json")
+    max_age = request.config.getoption("--auth-max-age") * 3600
+
+    def login(driver):
+        # page objects pull in selenium; only a run that actually signs in needs them
+        from pages.signin_page import SignInPage, credentials
+
+        email, password = credentials(site)
+        if not email or not password:
+            return None
+        if SignInPage(driver, site).sign_in(email, password):
+            return AuthState.capture(driver, site.home, max_age)
+        print("⚠️ sign-in for the shared auth state failed")
+        return None
+
+    return AuthSession(path, site.home, login=login, import_paths=[COOKIES_FILE] if site.is_live else [],
+                       max_age=max_age)
+
+
+@pytest.fixture(scope="function")
+def signed_in_driver(request, auth_session, site):
+    """A pooled driver that already carries the signed-in state (no sign-in flow per test)."""
+    from pages.signin_page import credentials
+
+    reason = "No signed-in state: set EBAY_EMAIL / EBAY_PASSWORD in .env or run tests/save_login_cookies.py"
+    # skip before a browser is handed out when there is nothing to inject and nobody to sign in as
+    if auth_session.state() is None and not all(credentials(site)):
+        pytest.skip(reason)
+    driver = request.getfixturevalue("setup_driver")
+    if not auth_session.apply(driver):
+        pytest.skip(reason)
+    return driver
+
+
+@pytest.fixture(scope="function")
+def setup_driver(request, driver_pool, webdriver_profiler):
+    if webdriver_profiler:
+        webdriver_profiler.start_test(request.node.nodeid)
+    driver = driver_pool.acquire()
+    if webdriver_profiler:
+        webdriver_profiler.attach(driver)
 
     yield driver
 
@@ -309,15 +784,13 @@ def setup_driver(request):
     except Exception:
         pass
 
-    try:
-        driver.quit()
-    except Exception:
-        pass
+    # hand the browser back to the pool (reset, or quit if it is broken / used up)
+    driver_pool.release(driver)
+    if webdriver_profiler:
+        webdriver_profiler.end_test()
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
     setattr(item, "rep_" + rep.when, rep)
-
-
@@ -0,0 +1,104 @@
+# tests/test_auth_session.py
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import allure
+import pytest
+
+from base import auth_session as auth_module
+from base.auth_session import AuthSession, AuthState, _LoginLock
+from base.base_driver import By
+from base.fake_driver import FakeDriver
+from base.site import Site
+from pages.signin_page import STANDIN_EMAIL, STANDIN_PASSWORD, SignInPage
+from Utilities.standin_server import StandinServer
+
+
+@pytest.fixture
+def standin():
+    with StandinServer() as server:
+        yield server
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Shared signed-in state")
+def test_signs_in_once_then_injects_into_fresh_drivers(standin, tmp_path):
+    site = Site(standin.base_url)
+    logins = []
+
+    def login(driver):
+        assert SignInPage(driver, site).sign_in(STANDIN_EMAIL, STANDIN_PASSWORD)
+        logins.append(driver)
+        return AuthState.capture(driver, site.home)
+
+    path = str(tmp_path / "auth_state.json")
+    auth = AuthSession(path, site.home, login=login)
+    for _ in range(2):
+        driver = FakeDriver()
+        try:
+            assert auth.apply(driver)
+            driver.get(site.home)
+            assert driver.find_elements(By.ID, "gh-ug")
+        finally:
+            driver.quit()
+    assert len(logins) == 1
+
+    # another worker (new provider, same file) reuses the state without signing in
+    assert AuthSession(path, site.home, login=login).state().cookies == auth.state().cookies
+    assert len(logins) == 1
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Shared signed-in state")
+def test_expired_or_foreign_state_is_not_used(tmp_path):
+    cookie = {"name": "s", "value": "1", "domain": ".ebay.com", "path": "/", "expiry": int(time.time()) + 3600}
+    fresh = AuthState([cookie], base_url="https://www.ebay.com")
+    assert fresh.is_fresh("https://www.ebay.com")
+    assert not fresh.is_fresh("http://127.0.0.1:8000")
+    assert not fresh.is_fresh(now=cookie["expiry"] + 1)
+
+    dump = tmp_path / "cookies.json"
+    dump.write_text(json.dumps([dict(cookie, expiry=int(time.time()) - 60)]), encoding="utf-8")
+    auth = AuthSession(str(tmp_path / "state.json"), "https://www.ebay.com", import_paths=[str(dump)])
+    assert auth.state() is None
+
+    dump.write_text(json.dumps([cookie]), encoding="utf-8")
+    assert auth.state().source == "cookies.json"
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Shared signed-in state")
+def test_login_lock_is_kept_while_its_holder_lives(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth_module, "LOGIN_LOCK_HEARTBEAT_SECONDS", 0.05)
+    monkeypatch.setattr(auth_module, "LOGIN_LOCK_STALE_SECONDS", 0.2)
+    path = str(tmp_path / "auth_state.json.lock")
+    acquired = threading.Event()
+
+    def waiter():
+        with _LoginLock(path):
+            acquired.set()
+
+    with _LoginLock(path):
+        os.utime(path, (0, 0))  # looks ancient, but the holder (this process) is alive
+        thread = threading.Thread(target=waiter, daemon=True)
+        thread.start()
+        time.sleep(0.5)
+        assert not acquired.is_set()
+        assert time.time() - os.path.getmtime(path) < 1  # the heartbeat keeps touching it
+    thread.join(5)
+    assert acquired.is_set()
+
+    # a lock whose holder is gone is taken over at once
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(str(proc.pid))
+    started = time.monotonic()
+    with _LoginLock(path):
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == str(os.getpid())
+    assert time.monotonic() - started < 2 and not os.path.exists(path)
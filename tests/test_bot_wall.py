@@ -0,0 +1,99 @@
+# tests/test_bot_wall.py
+import io
+
+import allure
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from base.base_driver import BaseDriver
+from base.bot_wall import CLEAR, BotWallDetected, detect_bot_wall
+from base.fake_driver import FakeDriver
+from Utilities.notify import Notifier
+from Utilities.standin_server import StandinServer
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Bot wall detection")
+@pytest.mark.parametrize("html, url, reason, detail", [
+    ('<body><iframe src="https://newassets.hcaptcha.com/captcha/v1"></iframe></body>', "https://www.ebay.com/itm/1",
+     "iframe", "https://newassets.hcaptcha.com/captcha/v1"),
+    ('<body><div class="g-recaptcha"></div></body>', "https://www.ebay.com/itm/1", "container", "g-recaptcha"),
+    ("<body><h1>Please verify yourself to continue</h1></body>", "https://www.ebay.com/itm/1",
+     "text", "please verify yourself"),
+    ("<body>loading</body>", "https://www.ebay.com/splashui/captcha?ru=/itm/1", "url", "/splashui/captcha"),
+])
+def test_each_heuristic_reports_its_reason(html, url, reason, detail):
+    verdict = detect_bot_wall(FakeDriver.from_html(html, url=url))
+    assert verdict and (verdict.reason, verdict.detail) == (reason, detail)
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Bot wall detection")
+def test_clean_and_unreadable_pages_are_clear():
+    clean = FakeDriver.from_html("<body><h1>Outdoor toys</h1><p style='display:none'>please verify</p></body>",
+                                 url="https://www.ebay.com/itm/1")
+    assert detect_bot_wall(clean) == CLEAR and not CLEAR
+
+    class Gone:
+        def execute_script(self, *args):
+            raise RuntimeError("no such window")
+
+    assert detect_bot_wall(Gone()) == CLEAR
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Bot wall detection")
+def test_guard_after_navigation_on_standin_challenge():
+    with StandinServer(challenge_every=1) as server:
+        driver = FakeDriver()
+        try:
+            page = BaseDriver(driver)
+            driver.get(f"{server.base_url}/")
+            assert not page.guard_bot_wall(raise_on_wall=True)
+
+            driver.get(f"{server.base_url}/itm/296512337401")
+            with pytest.raises(BotWallDetected) as wall:
+                page.guard_bot_wall(raise_on_wall=True)
+            assert wall.value.verdict.reason == "url"
+        finally:
+            driver.quit()
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Bot wall detection")
+def test_wait_for_bot_wall_cleared_survives_navigation():
+    class Solving:
+        """Wall solved by hand: the form submits (document unloads), the next page is clear."""
+
+        def __init__(self):
+            self.calls = 0
+
+        def set_script_timeout(self, seconds):
+            pass
+
+        def execute_async_script(self, script, *args):
+            self.calls += 1
+            if self.calls == 1:
+                raise WebDriverException("javascript error: document unloaded while waiting for result")
+            return "cleared"
+
+    solving = Solving()
+    assert BaseDriver(solving).wait_for_bot_wall_cleared(timeout=5) is True
+    assert solving.calls == 2
+
+    walled = FakeDriver.from_html('<body><div class="h-captcha"></div></body>', url="https://www.ebay.com/")
+    assert BaseDriver(walled).wait_for_bot_wall_cleared(timeout=5) is False
+    clean = FakeDriver.from_html("<body>Sign in</body>", url="https://signin.ebay.com/")
+    assert BaseDriver(clean).wait_for_bot_wall_cleared(timeout=5) is True
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Bot wall detection")
+def test_notifier_rings_and_builds_command():
+    bell = io.StringIO()
+    notifier = Notifier(bell=True, stream=bell)
+    notifier("solve the CAPTCHA")
+    assert bell.getvalue() == "\a" and notifier.sent == ["solve the CAPTCHA"]
+
+    assert Notifier(command="notify-send eBay '{message}!'").argv("hi") == ["notify-send", "eBay", "hi!"]
+    assert Notifier(command="say").argv("hi") == ["say", "hi"]
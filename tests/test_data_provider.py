@@ -0,0 +1,116 @@
+# tests/test_data_provider.py
+import datetime
+import json
+import os
+
+import allure
+import pytest
+
+from Utilities import data_provider
+from Utilities.Dataread import Dataread
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_provider, "CACHE_DIR", str(tmp_path / "cache"))
+    data_provider.clear_cache()
+    yield
+    data_provider.clear_cache()
+
+
+def _workbook(path, rows):
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    for row in rows:
+        wb.active.append(row)
+    wb.save(path)
+    return str(path)
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Test data provider")
+def test_records_are_typed_and_cached_by_mtime(tmp_path, monkeypatch):
+    path = _workbook(tmp_path / "searches.xlsx", [
+        ("Keyword", "Match Tokens", "Max Products"),
+        ("outdoor toys", "toy, outdoor", "3"),
+        (None, None, None),
+        ("headphones", None, 2),
+    ])
+    reads = []
+    real_iter = data_provider.iter_sheet_rows
+    monkeypatch.setattr(data_provider, "iter_sheet_rows", lambda *a: reads.append(a) or real_iter(*a))
+
+    rows = data_provider.records(path, converters={"max_products": int})
+    assert [tuple(r) for r in rows] == [("outdoor toys", "toy, outdoor", 3), ("headphones", None, 2)]
+    assert rows[0].max_products == 3 and rows[1].match_tokens is None
+    assert data_provider.records(path, converters={"max_products": int}) is rows
+    assert data_provider.cell(path, "A2") == "outdoor toys" and data_provider.cell(path, "Z99") is None
+    assert len(reads) == 1
+
+    # a new process (empty memory cache) reads the disk cache, not the workbook
+    data_provider.clear_cache()
+    assert data_provider.cell(path, "C4") == 2
+    assert len(reads) == 1
+
+    # editing the workbook invalidates both caches
+    _workbook(path, [("Keyword",), ("garden hose",)])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert [r.keyword for r in data_provider.records(path)] == ["garden hose"]
+    assert len(reads) == 2
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Test data provider")
+def test_dataread_keyword_from_default_workbook():
+    assert Dataread().dataread() == "outdoor toys"
+    with pytest.raises(ValueError):
+        data_provider.cell(os.path.join("Utilities", "Testdata1.xlsx"), "1A")
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Test data provider")
+def test_streamed_sheet_is_cached_once_fully_read(tmp_path, monkeypatch):
+    path = _workbook(tmp_path / "big.xlsx", [("Keyword",)] + [(f"k{n}",) for n in range(50)])
+    assert next(data_provider.iter_rows(path)) == ("Keyword",)  # abandoned stream: nothing cached
+    assert len(list(data_provider.iter_rows(path))) == 51
+
+    def no_workbook(*args):
+        raise AssertionError("workbook opened again")
+
+    monkeypatch.setattr(data_provider, "iter_sheet_rows", no_workbook)
+    assert list(data_provider.iter_rows(path))[-1] == ("k49",)
+
+    # over the limit the stream is served but not kept
+    monkeypatch.undo()
+    monkeypatch.setattr(data_provider, "CACHE_DIR", str(tmp_path / "cache2"))
+    monkeypatch.setattr(data_provider, "STREAM_CACHE_ROWS", 10)
+    assert len(list(data_provider.iter_rows(path))) == 51
+    assert not os.path.exists(str(tmp_path / "cache2"))
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Test data provider")
+def test_disk_cache_is_private_json(tmp_path, monkeypatch):
+    when = datetime.datetime(2026, 10, 17, 9, 30)
+    path = _workbook(tmp_path / "dated.xlsx", [("Keyword", "Since"), ("garden hose", when)])
+    assert data_provider.rows(path)[1] == ("garden hose", when)
+
+    cache_dir = data_provider.CACHE_DIR
+    if hasattr(os, "getuid"):
+        assert os.stat(cache_dir).st_mode & 0o777 == 0o700
+    (cache_file,) = os.listdir(cache_dir)
+    with open(os.path.join(cache_dir, cache_file), encoding="utf-8") as f:
+        assert json.load(f)["rows"][1] == ["garden hose", {"$datetime": "2026-10-17T09:30:00"}]
+
+    # served back from disk with the datetime intact
+    data_provider.clear_cache()
+    monkeypatch.setattr(data_provider, "iter_sheet_rows", lambda *a: iter(()))
+    assert data_provider.rows(path)[1] == ("garden hose", when)
+
+    if hasattr(os, "getuid"):
+        # a cache directory others can write to is not trusted
+        os.chmod(cache_dir, 0o777)
+        data_provider.clear_cache()
+        assert data_provider.rows(path) == ()
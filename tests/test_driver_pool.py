@@ -0,0 +1,166 @@
+# tests/test_driver_pool.py
+import os
+import time
+
+import allure
+
+from base.base_driver import BaseDriver
+from base.driver_pool import DriverPool
+from base.parallel import BrowserSlots
+
+
+class _StubSwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        self._driver.current = handle
+
+
+class _StubDriver:
+    """Just enough of the WebDriver API for the pool's reset/health checks."""
+
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.current = "main"
+        self.switch_to = _StubSwitchTo(self)
+        self.cookies_cleared = 0
+        self.quit_called = False
+        self.last_url = None
+
+    def execute_script(self, script, *args):
+        return None
+
+    def close(self):
+        self.window_handles.remove(self.current)
+
+    def delete_all_cookies(self):
+        self.cookies_cleared += 1
+
+    def get(self, url):
+        self.last_url = url
+
+    def quit(self):
+        self.quit_called = True
+        self.window_handles = []
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Driver pool")
+def test_pool_reuses_and_resets_driver():
+    launched = []
+    pool = DriverPool(factory=lambda: launched.append(_StubDriver()) or launched[-1], max_uses=5)
+
+    first = pool.acquire()
+    first.window_handles.append("product_tab")
+    pool.release(first)
+
+    assert first.window_handles == ["main"]
+    assert first.cookies_cleared == 1
+    assert first.last_url == "about:blank"
+    assert pool.acquire() is first
+    assert len(launched) == 1
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Driver pool")
+def test_pool_recycles_after_max_uses_and_on_close():
+    pool = DriverPool(factory=_StubDriver, max_uses=2)
+
+    driver = pool.acquire()
+    pool.release(driver)
+    assert pool.acquire() is driver
+    pool.release(driver)
+    assert driver.quit_called  # second use reached max_uses
+
+    fresh = pool.acquire()
+    assert fresh is not driver
+    pool.release(fresh)
+    pool.close()
+    assert fresh.quit_called
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Driver pool")
+def test_pool_replaces_dead_driver():
+    pool = DriverPool(factory=_StubDriver, max_uses=10, reset_cookies=False)
+
+    driver = pool.acquire()
+    pool.release(driver)
+    assert driver.cookies_cleared == 0
+    driver.window_handles = []  # browser crashed while idle
+
+    assert pool.acquire() is not driver
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Driver pool")
+def test_standby_browser_replaces_recycled_one():
+    launched = []
+
+    def factory():
+        launched.append(_StubDriver())
+        return launched[-1]
+
+    pool = DriverPool(factory=factory, max_uses=1, standby_depth=1)
+
+    first = pool.acquire()  # synchronous launch + one standby warming in the background
+    pool.release(first)     # max_uses=1 -> quit
+    second = pool.acquire()  # hand-off of the standby browser
+    assert second is launched[1]
+    assert first.quit_called
+
+    pool.release(second)
+    pool.close()
+    assert all(d.quit_called for d in launched)
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Driver pool")
+def test_close_does_not_wait_for_a_warmer_stuck_on_a_full_pool(tmp_path):
+    launched = []
+
+    def factory():
+        launched.append(_StubDriver())
+        return launched[-1]
+
+    slots = BrowserSlots(1, slot_dir=str(tmp_path), timeout=5)
+    pool = DriverPool(factory=factory, standby_depth=1, slots=slots)
+
+    driver = pool.acquire()  # holds the only slot; the standby warmer can't get one
+    for warmer in list(pool._warmers):
+        warmer.join(timeout=10)
+    pool.release(driver)     # idle, still holding the slot
+
+    started = time.monotonic()
+    pool.close()
+    assert time.monotonic() - started < 2
+    assert all(d.quit_called for d in launched)
+    assert len(launched) == 1  # no free slot: the warmer skipped instead of waiting
+    assert not os.listdir(str(tmp_path))  # every slot given back
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Driver pool")
+def test_release_restores_the_script_timeout_raised_by_a_wait():
+    class _Timeouts:
+        script = 30
+
+    class _TimedDriver(_StubDriver):
+        def __init__(self):
+            super().__init__()
+            self.timeouts = _Timeouts()
+
+        def set_script_timeout(self, seconds):
+            self.timeouts.script = seconds
+
+    pool = DriverPool(factory=_TimedDriver)
+    driver = pool.acquire()
+    page = BaseDriver(driver)
+    page._ensure_script_timeout(185)
+    page._ensure_script_timeout(20)  # already long enough: unchanged
+    assert driver.timeouts.script == 185
+
+    pool.release(driver)
+    assert driver.timeouts.script == 30
+    assert pool.acquire() is driver
@@ -0,0 +1,72 @@
+# tests/test_driver_resolver.py
+import sys
+import allure
+import pytest
+
+from base import driver_resolver
+from base.driver_resolver import DriverResolver
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Driver binary resolution")
+def test_resolution_is_cached_on_disk_per_browser_version(tmp_path, monkeypatch):
+    downloads = []
+
+    def fake_download(browser):
+        downloads.append(browser)
+        return sys.executable
+
+    monkeypatch.setattr(driver_resolver, "installed_browser_version", lambda browser: "120.0.6099.109")
+    monkeypatch.setattr(driver_resolver, "_download_driver", fake_download)
+    cache_file = str(tmp_path / "drivers.json")
+
+    resolver = DriverResolver(cache_file=cache_file)
+    assert resolver.resolve("chrome") == sys.executable
+    assert resolver.resolve("chrome") == sys.executable
+    assert downloads == ["chrome"]
+
+    # a new session (fresh resolver) must not touch the network at all
+    def offline(browser):
+        raise ConnectionError("no network")
+
+    monkeypatch.setattr(driver_resolver, "_download_driver", offline)
+    assert DriverResolver(cache_file=cache_file).resolve("chrome") == sys.executable
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Driver binary resolution")
+def test_driver_path_override(tmp_path):
+    resolver = DriverResolver(cache_file=str(tmp_path / "drivers.json"), override_path=sys.executable)
+    assert resolver.resolve("firefox") == sys.executable
+
+    with pytest.raises(ValueError):
+        DriverResolver(override_path=str(tmp_path / "missing")).resolve("chrome")
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Driver binary resolution")
+def test_unknown_browser_version_is_cached_for_a_while(tmp_path, monkeypatch):
+    downloads = []
+
+    def fake_download(browser):
+        downloads.append(browser)
+        return sys.executable
+
+    monkeypatch.setattr(driver_resolver, "installed_browser_version", lambda browser: None)
+    monkeypatch.setattr(driver_resolver, "_download_driver", fake_download)
+    cache_file = str(tmp_path / "drivers.json")
+
+    assert DriverResolver(cache_file=cache_file).resolve("edge") == sys.executable
+    assert DriverResolver(cache_file=cache_file).resolve("edge") == sys.executable
+    assert downloads == ["edge"]
+
+    # past the TTL it is looked up again, and offline the stale entry is still the fallback
+    monkeypatch.setattr(driver_resolver, "UNKNOWN_VERSION_TTL", 0)
+    assert DriverResolver(cache_file=cache_file).resolve("edge") == sys.executable
+    assert downloads == ["edge", "edge"]
+
+    def offline(browser):
+        raise ConnectionError("no network")
+
+    monkeypatch.setattr(driver_resolver, "_download_driver", offline)
+    assert DriverResolver(cache_file=cache_file).resolve("edge") == sys.executable
@@ -0,0 +1,93 @@
+# tests/test_driver_service.py
+import sys
+import allure
+
+from base.driver_service import DriverServiceManager
+
+
+class _StubProcess:
+    def __init__(self):
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+
+class _StubService:
+    """Pretends to be a driver service; the executable path just has to exist."""
+
+    def __init__(self):
+        self.path = sys.executable
+        self.process = None
+        self.stopped = False
+        self.service_url = "http://localhost:0"
+
+    def env_path(self):
+        return None
+
+    def start(self):
+        self.process = _StubProcess()
+
+    def is_connectable(self):
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self):
+        self.stopped = True
+
+
+class _StubDriver:
+    pass
+
+
+def _manager():
+    started = []
+
+    def factory(browser):
+        started.append(_StubService())
+        return started[-1]
+
+    manager = DriverServiceManager(service_factory=factory)
+    manager._attach = lambda browser, entry, options: _StubDriver()
+    return manager, started
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Shared driver service")
+def test_sessions_share_one_service_and_restart_after_crash():
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+    manager, started = _manager()
+
+    first = manager.connect("chrome", ChromeOptions())
+    second = manager.connect("chrome", ChromeOptions())
+    assert len(started) == 1
+    assert first.service.service_url == second.service.service_url
+
+    first.service.stop()
+    second.service.stop()
+    assert not started[0].stopped  # quitting sessions keeps the shared process alive
+
+    started[0].process.returncode = 1  # chromedriver crashed
+    manager.connect("chrome", ChromeOptions())
+    assert len(started) == 2
+    assert started[0].stopped
+
+    manager.stop_all()
+    assert started[1].stopped
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Shared driver service")
+def test_geckodriver_serves_one_session_at_a_time():
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
+    manager, started = _manager()
+
+    first = manager.connect("firefox", FirefoxOptions())
+    manager.connect("firefox", FirefoxOptions())
+    assert len(started) == 2  # first service busy -> second process
+
+    first.service.stop()
+    manager.connect("firefox", FirefoxOptions())
+    assert len(started) == 2  # released service reused
+    manager.stop_all()
@@ -0,0 +1,156 @@
+# tests/test_fake_driver.py
+import os
+import subprocess
+import sys
+import time
+
+import allure
+import pytest
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException, StaleElementReferenceException
+
+from base.base_driver import BaseDriver, By
+from base.fake_driver import FakeDriver
+from base.site import Site
+from pages.home_page import HomePage
+from pages.product_page import ProductPage
+from pages.search_results_page import SearchResultsPage
+from Utilities.standin_server import StandinServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNAPSHOT = """
+<html><head><style>.gone, .s-item__pl-on-bottom { display: none; }</style></head><body>
+  <button class="gone" id="hidden-atc">Add to cart</button>
+  <div style="display:none"><button id="also-hidden">Add to cart</button></div>
+  <form action="/cart/add" method="post">
+    <label for="colour">Colour: Select</label>
+    <select id="colour" name="colour"><option value="">Select</option><option value="red">Red</option></select>
+    <button id="atcRedesignId_btn"><span class="ux-call-to-action__text">Add to cart</span></button>
+  </form>
+  <p>Ships <b>free</b><br>Returns accepted</p>
+</body></html>
+"""
+
+
+@pytest.fixture(scope="module")
+def standin():
+    with StandinServer() as server:
+        yield server
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Fake WebDriver")
+def test_snapshot_queries_visibility_and_text():
+    from selenium.webdriver.support.ui import Select
+
+    driver = FakeDriver.from_html(SNAPSHOT, url="https://www.ebay.com/itm/1")
+    page = ProductPage(driver)
+
+    btn, selector = page.find_first_visible(["#hidden-atc", "#also-hidden", "//button[contains(., 'Add to cart')]"])
+    assert selector.startswith("//") and btn.get_attribute("id") == "atcRedesignId_btn"
+    assert driver.find_element(By.ID, "hidden-atc").text == ""
+    assert driver.find_element(By.TAG_NAME, "p").text == "Ships free\nReturns accepted"
+
+    colour = Select(driver.find_element(By.ID, "colour"))
+    assert colour.first_selected_option.text == "Select"
+    colour.select_by_value("red")
+    assert colour.first_selected_option.text == "Red"
+
+    with pytest.raises(NoSuchElementException):
+        driver.find_element(By.CSS_SELECTOR, ".s-item__link")
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Fake WebDriver")
+def test_search_open_tab_and_add_to_cart(standin):
+    site = Site(standin.base_url)
+    driver = FakeDriver()
+
+    home = HomePage(driver, site).open_home(timeout=1)
+    box = driver.find_element(*HomePage.SEARCH_BOX)
+    home.search_item("outdoor toys")
+    with pytest.raises(StaleElementReferenceException):
+        box.click()
+
+    results = SearchResultsPage(driver, site).wait_until_ready(timeout=1)
+    placeholder, *candidates = results.collect_candidates(limit=4, products_only=True)
+    # like innerText in a browser, the hidden "Shop on eBay" template item has no text
+    assert placeholder["text"] == ""
+    assert [c["item_id"] for c in candidates] == [p["item_id"] for p in results.snapshot_products()[:3]]
+    assert "outdoor toys" in candidates[0]["text"].lower()
+
+    original = driver.current_window_handle
+    handles_before = driver.window_handles
+    driver.execute_script("window.open(arguments[0], '_blank');", candidates[0]["href"])
+    driver.switch_to.window(results.wait_for_new_window(handles_before, timeout=1))
+    product = ProductPage(driver, site).wait_until_ready(timeout=1)
+
+    btn, _ = product.find_first_visible(["#atcRedesignId_btn"])
+    driver.execute_script("arguments[0].click();", btn)
+    assert driver.find_elements(By.XPATH, "//span[contains(., 'See in cart')]")
+
+    driver.close()
+    driver.switch_to.window(original)
+    driver.get(site.cart)
+    removes = driver.find_elements(By.XPATH, "//button[contains(normalize-space(.), 'Remove')]")
+    assert len(removes) == 1
+    removes[0].click()
+    assert not driver.find_elements(By.XPATH, "//button[contains(normalize-space(.), 'Remove')]")
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Fake WebDriver")
+def test_sign_in_form_and_cookies(standin):
+    site = Site(standin.base_url)
+    driver = FakeDriver()
+    driver.get(site.signin)
+
+    driver.find_element(By.ID, "userid").send_keys("buyer@example.com")
+    driver.find_element(By.ID, "signin-continue-btn").click()
+    driver.find_element(By.ID, "pass").send_keys("secret")
+    driver.find_element(By.ID, "sgnBt").click()
+
+    assert "signin" not in driver.current_url
+    assert driver.find_element(By.ID, "gh-ug").is_displayed()
+    assert [c["name"] for c in driver.get_cookies()] == ["standin_sid"]
+
+    driver.delete_all_cookies()
+    driver.refresh()
+    assert not driver.find_elements(By.ID, "gh-ug")
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Fake WebDriver")
+def test_wait_for_element_fails_fast_on_a_bad_selector():
+    class Browser:
+        """Answers the in-page wait the way Chrome does for a selector querySelectorAll rejects."""
+
+        def set_script_timeout(self, seconds):
+            pass
+
+        def execute_async_script(self, script, *args):
+            return {"invalidSelector": f"'{args[1]}' is not a valid selector."}
+
+    started = time.monotonic()
+    with pytest.raises(InvalidSelectorException):
+        BaseDriver(Browser()).wait_for_element((By.CSS_SELECTOR, "div[[broken"), timeout=30)
+    with pytest.raises(InvalidSelectorException):
+        BaseDriver(FakeDriver.from_html(SNAPSHOT)).wait_for_elements((By.XPATH, "//button[@id="), timeout=30)
+    assert time.monotonic() - started < 5
+    assert BaseDriver(FakeDriver.from_html(SNAPSHOT)).wait_for_element((By.ID, "colour"), timeout=1).tag_name == "select"
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Fake WebDriver")
+def test_page_objects_register_their_own_script_twins():
+    # base/ must not reach up into pages/: the page registers its twin when it is imported
+    result = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, base.fake_driver as fd; n = len(fd._SCRIPT_HANDLERS)\n"
+         "print(sorted(m for m in sys.modules if m.split('.')[0] == 'pages'))\n"
+         "import pages.search_results_page as page\n"
+         "print(len(fd._SCRIPT_HANDLERS) - n, page._COLLECT_CANDIDATES_JS in fd._SCRIPT_HANDLERS)"],
+        cwd=ROOT, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert result.stdout.split("\n")[:2] == ["[]", "1 True"]
@@ -0,0 +1,64 @@
+# tests/test_import_time.py
+import json
+import os
+import re
+import subprocess
+import sys
+
+import allure
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# collection must not pay for these; they load when a browser / workbook / parser is actually used
+HEAVY_MODULES = ("selenium.webdriver", "webdriver_manager", "openpyxl", "lxml")
+# budget for importing conftest itself (pytest + allure are already loaded by the plugins)
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", "150"))
+
+
+def _heavy(modules):
+    return sorted(m for m in modules if any(m == h or m.startswith(h + ".") for h in HEAVY_MODULES))
+
+
+def _import_times(statement):
+    """Run `statement` in a fresh interpreter with -X importtime -> {module: cumulative ms}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if match:
+            times[match.group(3)] = int(match.group(1)) / 1000.0
+    return times
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Import time budget")
+def test_conftest_imports_no_browser_or_workbook_stack():
+    times = _import_times("import pytest, allure; import tests.conftest")
+    assert "tests.conftest" in times
+    loaded = _heavy(times)
+    assert not loaded, f"imported while loading conftest: {loaded}"
+    assert times["tests.conftest"] < IMPORT_BUDGET_MS, (
+        f"conftest import took {times['tests.conftest']:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)"
+    )
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Import time budget")
+def test_collection_imports_no_browser_or_workbook_stack():
+    # conftest alone isn't enough: page objects and test modules are imported while collecting too
+    statement = (
+        "import json, sys, pytest\n"
+        "import pages.home_page, pages.product_page, pages.search_results_page, pages.signin_page\n"
+        "code = pytest.main(['--collect-only', '-q', '-p', 'no:cacheprovider', 'tests'])\n"
+        "print(json.dumps({'code': int(code), 'modules': sorted(sys.modules)}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", statement], cwd=ROOT, capture_output=True, text=True, timeout=120,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report["code"] == 0, result.stdout[-2000:]
+    loaded = _heavy(report["modules"])
+    assert not loaded, f"imported while collecting: {loaded}"
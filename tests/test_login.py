@@ -1,43 +1,26 @@
 # tests/test_login.py
 import os
 import time
-import datetime
 import pytest
 import allure
 from dotenv import load_dotenv
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import ElementNotInteractableException, TimeoutException
+from selenium.common.exceptions import ElementNotInteractableException, NoSuchElementException, TimeoutException
+
+from base.base_driver import BaseDriver, By
+from base.bot_wall import detect_bot_wall
+from pages.signin_page import STANDIN_EMAIL, STANDIN_PASSWORD
+from Utilities.artifacts import artifact_path, artifact_stamp
+from Utilities.notify import notify
+from Utilities.pacing import pause, poll
 
 load_dotenv()  # loads EBAY_EMAIL & EBAY_PASSWORD from project root .env
 
 # Config
 CAPTCHA_WAIT_TIMEOUT_SECONDS = 180   # how long to wait for manual CAPTCHA (adjust as needed)
-CAPTCHA_POLL_INTERVAL = 3            # poll interval while waiting
 EMAIL_RETRY_ON_OOPS = True
 VERIFY_LOGIN_TIMEOUT = 20            # strict verification wait for account UI
 
 
-def _has_captcha(driver):
-    """Heuristic detection of captcha / verification step"""
-    try:
-        if driver.find_elements(By.CSS_SELECTOR, "iframe[src*='hcaptcha'], iframe[src*='recaptcha']"):
-            return True
-        body = ""
-        try:
-            body = (driver.find_element(By.TAG_NAME, "body").text or "").lower()
-        except Exception:
-            body = ""
-        if any(token in body for token in ("please verify yourself", "please verify", "verify yourself", "security check", "select the images", "i am not a robot")):
-            return True
-        if driver.find_elements(By.CSS_SELECTOR, ".h-captcha, .h-captcha-checkbox, .g-recaptcha, .captcha"):
-            return True
-    except Exception:
-        return False
-    return False
-
-
 def _email_oops_present(driver):
     try:
         el = driver.find_elements(By.XPATH, "//*[contains(., \"Oops, that's not a match\") or contains(., \"Oops, that isn't a match\") or contains(., 'not a match')]")
@@ -53,12 +36,15 @@ def _verify_logged_in_strict(driver, timeout=VERIFY_LOGIN_TIMEOUT):
       - And current URL should not contain 'signin'
     Returns True only if confident.
     """
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
     try:
         wait = WebDriverWait(driver, timeout)
         # Wait for any of the account UI elements to be visible
         wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "button[aria-label*='Account'], a[title*='My eBay'], #gh-ug")))
         # also ensure url moved away from signin
-        time.sleep(0.5)
+        pause("after_click")
         cur = ""
         try:
             cur = driver.current_url.lower()
@@ -72,9 +58,9 @@ def _verify_logged_in_strict(driver, timeout=VERIFY_LOGIN_TIMEOUT):
 
 
 def _save_debug(driver, prefix="login"):
-    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    png = f"tests/{prefix}_screenshot_{ts}.png"
-    html = f"tests/{prefix}_page_{ts}.html"
+    ts = artifact_stamp()
+    png = artifact_path(f"{prefix}_screenshot", "png", ts)
+    html = artifact_path(f"{prefix}_page", "html", ts)
     try:
         driver.save_screenshot(png)
     except Exception:
@@ -101,16 +87,16 @@ def _wait_for_userid_clickable(driver, timeout=20):
         try:
             els = driver.find_elements(By.ID, "userid")
             if not els:
-                time.sleep(0.4)
+                time.sleep(poll(0.4))
                 continue
             el = els[0]
             # element must be displayed & enabled
             try:
                 if not (el.is_displayed() and el.is_enabled()):
-                    time.sleep(0.4)
+                    time.sleep(poll(0.4))
                     continue
             except Exception:
-                time.sleep(0.4)
+                time.sleep(poll(0.4))
                 continue
 
             # Try to ensure it's not covered by some overlay: check elementFromPoint at element's center
@@ -136,7 +122,7 @@ def _wait_for_userid_clickable(driver, timeout=20):
                         )
                         if not is_child:
                             # covered by overlay, wait and retry
-                            time.sleep(0.6)
+                            time.sleep(poll(0.6))
                             continue
             except Exception:
                 # if this check fails for any reason, ignore and proceed
@@ -144,7 +130,7 @@ def _wait_for_userid_clickable(driver, timeout=20):
 
             return el
         except Exception:
-            time.sleep(0.4)
+            time.sleep(poll(0.4))
             continue
     raise TimeoutException("userid element not clickable/visible within timeout")
 
@@ -173,7 +159,7 @@ def _robust_set_input_value(driver, el, value):
             return true;
             """
             driver.execute_script(js, el, value)
-            time.sleep(0.3)
+            pause("after_typing")
             return True
         except Exception:
             return False
@@ -205,9 +191,8 @@ def _pre_email_wait_and_enter(driver, EMAIL):
                 pass
 
             # If captcha present, screenshot and wait for manual solve
-            if _has_captcha(driver):
-                ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                path = f"tests/login_pre_captcha_{ts}.png"
+            if detect_bot_wall(driver):
+                path = artifact_path("login_pre_captcha", "png")
                 try:
                     driver.save_screenshot(path)
                 except Exception:
@@ -222,17 +207,16 @@ def _pre_email_wait_and_enter(driver, EMAIL):
                     pass
 
                 print("⚠️ CAPTCHA detected BEFORE email step. Please solve it manually in the opened browser.")
-                # poll captcha disappearance
-                captcha_start = time.time()
-                while time.time() - captcha_start < PRE_EMAIL_TIMEOUT:
-                    if not _has_captcha(driver):
-                        time.sleep(1.0)
-                        break
-                    time.sleep(CAPTCHA_POLL_INTERVAL)
+                notify("eBay sign-in: CAPTCHA before the email step - solve it in the browser")
+                # returns as soon as the page drops the wall (no polling interval to sit out);
+                # only the time left of PRE_EMAIL_TIMEOUT, the loop is bounded by it already
+                remaining = PRE_EMAIL_TIMEOUT - (time.time() - start)
+                if remaining > 0 and BaseDriver(driver).wait_for_bot_wall_cleared(remaining):
+                    pause("after_captcha")
             else:
-                time.sleep(0.8)
+                time.sleep(poll(0.8))
         except Exception:
-            time.sleep(0.8)
+            time.sleep(poll(0.8))
             continue
 
     if not found:
@@ -262,7 +246,7 @@ def _pre_email_wait_and_enter(driver, EMAIL):
                 ok = _robust_set_input_value(driver, el, EMAIL)
                 if not ok:
                     last_exc = Exception("Could not set email into userid via send_keys or JS fallback")
-                    time.sleep(0.8)
+                    pause("retry")
                     continue
 
                 # click continue
@@ -279,15 +263,15 @@ def _pre_email_wait_and_enter(driver, EMAIL):
                         pass
 
                 # small pause to let page react
-                time.sleep(1.2)
+                pause("after_submit")
                 return True
             except TimeoutException as te:
                 last_exc = te
-                time.sleep(0.6)
+                pause("retry")
                 continue
             except Exception as e:
                 last_exc = e
-                time.sleep(0.6)
+                pause("retry")
                 continue
 
         # exhausted attempts -> fail with evidence
@@ -311,25 +295,32 @@ def _pre_email_wait_and_enter(driver, EMAIL):
 @allure.story("Login functionality verification (strict)")
 @allure.severity(allure.severity_level.CRITICAL)
 @allure.title("Verify user login on eBay (strict — fail on CAPTCHA/loop)")
-def test_user_login(setup_driver):
+def test_user_login(setup_driver, site, auth_session):
     """
     Strict login test:
       - reads credentials from .env
       - attempts login, handles captcha by waiting (manual) up to CAPTCHA_WAIT_TIMEOUT_SECONDS
       - verifies success strictly; if not successful -> fail with screenshot + page html
     """
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
     driver = setup_driver
     wait = WebDriverWait(driver, 15)
 
     EMAIL = os.getenv("EBAY_EMAIL")
     PASSWORD = os.getenv("EBAY_PASSWORD")
+    if not site.is_live:
+        # the local stand-in accepts any account; no real credentials needed
+        EMAIL = EMAIL or STANDIN_EMAIL
+        PASSWORD = PASSWORD or STANDIN_PASSWORD
 
     if not EMAIL or not PASSWORD:
         pytest.skip("⚠️ Please set EBAY_EMAIL and EBAY_PASSWORD in your .env file.")
 
     # navigate to signin
     try:
-        driver.get("https://signin.ebay.com/")
+        driver.get(site.signin)
     except Exception:
         pytest.fail("Could not open eBay signin URL.")
 
@@ -337,16 +328,11 @@ def test_user_login(setup_driver):
     _pre_email_wait_and_enter(driver, EMAIL)
 
     # If captcha/verification occurs after entering email — wait for manual solve (strict)
-    if _has_captcha(driver):
+    if detect_bot_wall(driver):
         print("⚠️ CAPTCHA detected after entering email. Please solve it manually in the opened browser.")
-        start = time.time()
-        solved = False
-        while time.time() - start < CAPTCHA_WAIT_TIMEOUT_SECONDS:
-            if not _has_captcha(driver):
-                # sometimes after solving captcha, the signin page may reload — break to re-evaluate
-                solved = True
-                break
-            time.sleep(CAPTCHA_POLL_INTERVAL)
+        notify("eBay sign-in: CAPTCHA after the email step - solve it in the browser")
+        # sometimes after solving captcha, the signin page reloads — the wait re-checks the new page
+        solved = BaseDriver(driver).wait_for_bot_wall_cleared(CAPTCHA_WAIT_TIMEOUT_SECONDS)
         if not solved:
             png, html = _save_debug(driver, prefix="login_captcha")
             try:
@@ -359,9 +345,9 @@ def test_user_login(setup_driver):
     # If "Oops" banner present — optionally retry email once slowly
     if _email_oops_present(driver) and EMAIL_RETRY_ON_OOPS:
         print("🔁 Email error banner seen — retrying email once slowly.")
-        time.sleep(1)
+        pause("retry")
         _pre_email_wait_and_enter(driver, EMAIL)
-        time.sleep(1)
+        pause("page_react")
 
     # Wait for password field (if not present, fail)
     try:
@@ -405,10 +391,13 @@ def test_user_login(setup_driver):
 
     # Click sign in button reliably
     try:
-        try:
-            sign_in_btn = driver.find_element(By.ID, "sgnBt")
-        except Exception:
-            sign_in_btn = driver.find_element(By.XPATH, "//button[@type='submit' or contains(., 'Sign in')]")
+        # both candidates checked in one round trip; first visible match wins
+        sign_in_btn, _ = BaseDriver(driver).find_first_visible([
+            (By.ID, "sgnBt"),
+            "//button[@type='submit' or contains(., 'Sign in')]",
+        ])
+        if sign_in_btn is None:
+            raise NoSuchElementException("Sign in button not found")
         try:
             sign_in_btn.click()
         except Exception:
@@ -426,8 +415,7 @@ def test_user_login(setup_driver):
     if _verify_logged_in_strict(driver, timeout=VERIFY_LOGIN_TIMEOUT):
         # success: save screenshot for proof
         try:
-            ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            s = f"tests/login_success_{ts}.png"
+            s = artifact_path("login_success", "png")
             driver.save_screenshot(s)
             try:
                 allure.attach.file(s, name="login_success", attachment_type=allure.attachment_type.PNG)
@@ -436,6 +424,11 @@ def test_user_login(setup_driver):
             print("✅ Login successful — saved screenshot:", s)
         except Exception:
             pass
+        # tests using signed_in_driver reuse this sign-in instead of repeating the flow
+        try:
+            auth_session.store(driver, source="test_user_login")
+        except Exception as e:
+            print("⚠️ could not save the signed-in state:", e)
         assert True
     else:
         png, html = _save_debug(driver, prefix="login_failed_final")
@@ -1,77 +1,83 @@
 # tests/test_login_with_cookies.py
-import os
-import json
-import time
 import allure
 import pytest
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+
+from base.auth_session import AuthState
+from base.base_driver import By
+from base.storage_state import all_expired
+from Utilities.artifacts import artifact_path
 
 COOKIES_FILE = "cookies.json"
+ACCOUNT_UI = (By.CSS_SELECTOR, "button[aria-label*='Account'], a[title*='My eBay'], #gh-ug")
+
+
+def _wait_for_account_ui(driver, timeout=20):
+    # selenium.webdriver loads every browser's bindings: only pay for it when a test runs
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    WebDriverWait(driver, timeout).until(EC.presence_of_element_located(ACCOUNT_UI))
+
+
+@pytest.fixture
+def saved_cookies(site):
+    """cookies.json as an AuthState; skips (before any browser is handed out) when it can't sign anyone in."""
+    if not site.is_live:
+        pytest.skip("cookies.json holds live eBay cookies; nothing to check against the stand-in.")
+    state = AuthState.from_cookies_file(COOKIES_FILE, site.home)
+    if state is None:
+        pytest.skip("cookies.json not found — run tests/save_login_cookies.py first (manual login).")
+    # offline pre-check: an all-expired dump costs no browser work at all
+    if all_expired(state.cookies):
+        pytest.skip("Every cookie in cookies.json has expired — run tests/save_login_cookies.py again.")
+    return state
 
-def _open_driver():
-    options = ChromeOptions()
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option("useAutomationExtension", False)
-    # options.add_argument(r"--user-data-dir=C:\temp\selenium_profile")  # optional
-    driver = webdriver.Chrome(options=options)
-    driver.maximize_window()
-    return driver
 
 @allure.epic("E-Commerce Testing")
 @allure.feature("User Login")
 @allure.severity(allure.severity_level.CRITICAL)
-def test_login_using_saved_cookies():
+def test_login_using_saved_cookies(saved_cookies, setup_driver, site):
     """
     Load cookies saved earlier, open ebay and assert account UI visible.
     Make sure you ran tests/save_login_cookies.py once before running this.
     """
-    if not os.path.exists(COOKIES_FILE):
-        pytest.skip("cookies.json not found — run tests/save_login_cookies.py first (manual login).")
+    driver = setup_driver
+    # all cookies (sameSite included) in one DevTools call before the first navigation;
+    # browsers without CDP fall back to add_cookie per domain
+    added = saved_cookies.apply(driver)
+    print(f"Added {added} cookies from {COOKIES_FILE}")
 
-    driver = _open_driver()
-    wait = WebDriverWait(driver, 20)
+    driver.get(site.home)  # first real page load, already as the logged-in user
+
+    # check heuristics: account menu / my ebay
     try:
-        # navigate to ebay root first to set domain
-        driver.get("https://www.ebay.com")
-        time.sleep(1)
-        # load cookies
-        with open(COOKIES_FILE, "r", encoding="utf-8") as f:
-            cookies = json.load(f)
-        added = 0
-        for c in cookies:
-            # sanitize cookie fields for Selenium (no 'sameSite' -> older drivers may complain)
-            cookie = {k: c[k] for k in c if k in ("name", "value", "path", "domain", "secure", "httpOnly", "expiry")}
-            try:
-                driver.add_cookie(cookie)
-                added += 1
-            except Exception:
-                # ignore cookie errors (domain mismatch, expiry)
-                continue
+        _wait_for_account_ui(driver)
+        # Save screenshot
+        path = artifact_path("login_using_cookies", "png")
+        driver.save_screenshot(path)
+        allure.attach.file(path, name="login_using_cookies", attachment_type=allure.attachment_type.PNG)
+        print("Login via cookies succeeded.")
+    except Exception:
+        path = artifact_path("login_using_cookies_failed", "png")
+        driver.save_screenshot(path)
+        allure.attach.file(path, name="login_using_cookies_failed", attachment_type=allure.attachment_type.PNG)
+        pytest.fail("Login via cookies did not detect account UI — cookies may be invalid/expired.")
 
-        print(f"Added {added} cookies from {COOKIES_FILE}")
-        driver.get("https://www.ebay.com")  # reload as logged-in user
-        time.sleep(2)
 
-        # check heuristics: account menu / my ebay
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "button[aria-label*='Account'], a[title*='My eBay'], #gh-ug")))
-            # Save screenshot
-            path = "tests/login_using_cookies.png"
-            driver.save_screenshot(path)
-            allure.attach.file(path, name="login_using_cookies", attachment_type=allure.attachment_type.PNG)
-            print("Login via cookies succeeded.")
-        except Exception:
-            path = "tests/login_using_cookies_failed.png"
-            driver.save_screenshot(path)
-            allure.attach.file(path, name="login_using_cookies_failed", attachment_type=allure.attachment_type.PNG)
-            pytest.fail("Login via cookies did not detect account UI — cookies may be invalid/expired.")
-    finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
+@allure.epic("E-Commerce Testing")
+@allure.feature("User Login")
+@allure.severity(allure.severity_level.CRITICAL)
+def test_shared_signed_in_state_opens_account(signed_in_driver, site):
+    """
+    The run's shared signed-in state (auth_state.json, cookies.json or one sign-in for the whole run)
+    is injected into a pooled browser: the home page shows the account UI without any sign-in flow.
+    """
+    driver = signed_in_driver
+    driver.get(site.home)
+    try:
+        _wait_for_account_ui(driver)
+    except Exception:
+        path = artifact_path("shared_sign_in_failed", "png")
+        driver.save_screenshot(path)
+        allure.attach.file(path, name="shared_sign_in_failed", attachment_type=allure.attachment_type.PNG)
+        pytest.fail("Shared signed-in state did not reach the account UI — it may be stale; delete it to sign in again.")
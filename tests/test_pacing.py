@@ -0,0 +1,42 @@
+# tests/test_pacing.py
+import allure
+import pytest
+
+from Utilities.pacing import HUMAN_PAUSES, Pacing, parse_points
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Pacing profiles")
+def test_zero_profile_never_sleeps_but_polls_with_a_floor():
+    slept = []
+    zero = Pacing.profile("zero")
+    zero._sleep = slept.append
+    for point in HUMAN_PAUSES:
+        assert zero.pause(point) == 0
+    assert slept == []
+    assert zero.poll(3) == zero.poll_floor > 0
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Pacing profiles")
+def test_human_and_custom_profiles():
+    slept = []
+    human = Pacing("human", HUMAN_PAUSES, sleep=slept.append)
+    low, high = HUMAN_PAUSES["between_products"]
+    assert low <= human.pause("between_products") <= high
+    assert human.poll(0.4) == 0.4
+
+    custom = Pacing.profile("custom", scale=0.5, points="between_products=2,after_click=0")
+    assert custom.duration("between_products") == 1.0
+    assert custom.duration("after_click") == 0
+    assert custom.duration("after_skip") >= HUMAN_PAUSES["after_skip"][0] * 0.5
+
+    with pytest.raises(ValueError):
+        human.pause("no_such_point")
+    with pytest.raises(ValueError):
+        parse_points("between_products=fast")
+    # a typo must not silently leave the real point at its human delay
+    with pytest.raises(ValueError, match="Known: between_products"):
+        parse_points("betwen_products=0")
+    with pytest.raises(ValueError):
+        Pacing.profile("custom", points={"betwen_products": (0, 0)})
@@ -0,0 +1,106 @@
+# tests/test_parallel.py
+import os
+import subprocess
+import sys
+import tempfile
+import types
+
+import allure
+import pytest
+
+from base.parallel import BrowserSlots, browser_for_worker, pid_alive
+from Utilities.artifacts import artifact_path
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Parallel runs")
+def test_browser_list_fans_out_per_worker(monkeypatch):
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    assert browser_for_worker("chrome,firefox") == "firefox"
+    assert browser_for_worker("Chrome") == "chrome"
+    monkeypatch.delenv("PYTEST_XDIST_WORKER")
+    assert browser_for_worker("edge,chrome") == "edge"
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Parallel runs")
+def test_artifact_names_are_unique_per_worker(monkeypatch):
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    paths = {artifact_path("captcha", "png") for _ in range(50)}
+    assert len(paths) == 50
+    assert all("_gw1_" in p for p in paths)
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Parallel runs")
+def test_browser_slots_cap_live_browsers(tmp_path):
+    slots = BrowserSlots(limit=2, slot_dir=str(tmp_path), timeout=0)
+    first = slots.acquire()
+    slots.acquire()
+    with pytest.raises(TimeoutError):
+        slots.acquire()
+    assert slots.try_acquire() is None
+    slots.release(first)
+    assert slots.try_acquire() == first
+
+
+def _dead_pid():
+    # a child that already exited and was reaped: its pid is free
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Parallel runs")
+def test_slots_of_crashed_workers_are_reclaimed(tmp_path):
+    slots = BrowserSlots(limit=2, slot_dir=str(tmp_path), timeout=0)
+    mine = slots.acquire()
+    with open(mine, encoding="utf-8") as f:
+        assert f.read().split()[0] == str(os.getpid())
+    crashed = str(tmp_path / "slot1")
+    with open(crashed, "w", encoding="utf-8") as f:
+        f.write(f"{_dead_pid()} gw1")
+    assert slots.try_acquire() == crashed  # dead owner: taken over
+    assert slots.try_acquire() is None     # live owners (this process) are left alone
+    assert not pid_alive(_dead_pid()) and pid_alive(os.getpid())
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Parallel runs")
+def test_slot_dirs_of_finished_runs_are_removed(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    root = tmp_path / "ebay_browser_slots"
+    finished, running = root / "run-finished", root / "run-running"
+    finished.mkdir(parents=True)
+    running.mkdir()
+    (finished / "slot0").write_text(f"{_dead_pid()} gw0")
+    (running / "slot0").write_text(f"{os.getpid()} gw0")
+    monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", "run-new")
+    slots = BrowserSlots(limit=1)
+    assert slots.slot_dir == str(root / "run-new")
+    assert not finished.exists() and running.exists()
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Parallel runs")
+def test_explicit_worker_count_is_capped_to_browser_limit():
+    from tests.conftest import pytest_configure
+
+    class _Config:
+        def __init__(self, workers, tx=None):
+            self.option = types.SimpleNamespace(numprocesses=workers,
+                                                tx=["popen"] * workers if tx is None else tx)
+
+        def getoption(self, name):
+            return 2 if name == "--max-browsers" else None
+
+    config = _Config(6)
+    pytest_configure(config)
+    assert config.option.numprocesses == 2 and config.option.tx == ["popen", "popen"]
+    config = _Config(2)
+    pytest_configure(config)
+    assert config.option.tx == ["popen", "popen"]
+    config = _Config(3, tx=["ssh=host//python=python3"] * 3)  # own gateways: not touched
+    pytest_configure(config)
+    assert config.option.numprocesses == 3
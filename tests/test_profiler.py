@@ -0,0 +1,106 @@
+# tests/test_profiler.py
+import json
+import os
+
+import allure
+
+from base.profiler import NO_TEST, WebDriverProfiler, command_target, script_key
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _StubExecutor:
+    """Answers commands like a remote connection would, without a browser."""
+
+    def execute(self, command, params):
+        if command == "findElements":
+            return {"value": [{"element-6066-11e4-a52e-4f735466cecf": str(n)} for n in range(3)]}
+        if command == "getElementText":
+            raise RuntimeError("stale element")
+        return {"value": None}
+
+
+class _StubDriver:
+    """WebDriver.execute in miniature: everything goes through command_executor.execute."""
+
+    def __init__(self):
+        self.command_executor = _StubExecutor()
+
+    def execute(self, command, params=None):
+        return self.command_executor.execute(command, dict(params or {}, sessionId="s1"))
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 0.01
+        return self.now
+
+
+def _page_method():
+    """A function compiled as if it lived in pages/, to stand in for a page-object method."""
+    namespace = {}
+    source = (
+        "def snapshot_products(driver):\n"
+        "    driver.execute('findElements', {'using': 'css selector', 'value': 'li.s-item'})\n"
+        "    for n in range(3):\n"
+        "        driver.execute('w3cExecuteScript', {'script': '/* getAttribute */return 1', 'args': [n, 'href']})\n"
+    )
+    exec(compile(source, os.path.join(ROOT, "pages", "stub_results_page.py"), "exec"), namespace)
+    return namespace["snapshot_products"]
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("WebDriver profiler")
+def test_commands_are_attributed_to_tests_and_page_methods(tmp_path):
+    profiler = WebDriverProfiler(top=2, report_dir=str(tmp_path), clock=_Clock(), keep_commands=True)
+    driver = _StubDriver()
+    assert profiler.attach(driver) and profiler.attach(driver)  # a pooled driver is only wrapped once
+    assert not profiler.attach(object())
+
+    driver.execute("get", {"url": "http://127.0.0.1/"})  # between tests (pool reset, standby launch)
+    profiler.start_test("tests/test_search_item.py::test_search")
+    _page_method()(driver)
+    driver.execute("w3cExecuteScript", {"script": "return document.readyState;", "args": []})
+    try:
+        driver.execute("getElementText", {"id": "1"})
+    except RuntimeError:
+        pass
+    profiler.end_test()
+
+    commands = profiler.pop_test_commands("tests/test_search_item.py::test_search")
+    assert [c.command for c in commands] == ["findElements"] + ["w3cExecuteScript"] * 4 + ["getElementText"]
+    assert commands[0].target == "css selector=li.s-item" and commands[0].received > 100
+    assert commands[0].caller == "pages/stub_results_page.py:2 snapshot_products"
+    assert {c.target for c in commands[1:4]} == {"getAttribute:href"}
+    assert commands[4].caller.startswith("tests/test_profiler.py:")
+    assert commands[5].error == "RuntimeError"
+    # handed over once, and the totals don't depend on the records being kept
+    assert profiler.pop_test_commands("tests/test_search_item.py::test_search") == []
+
+    path, summary = profiler.write_report()
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == summary
+    assert summary["round_trips"] == 7
+    assert summary["tests"][NO_TEST]["commands"] == {"get": {"count": 1, "seconds": 0.01}}
+    test = summary["tests"]["tests/test_search_item.py::test_search"]
+    assert test["round_trips"] == 6 and test["errors"] == 1
+    assert test["commands"]["w3cExecuteScript"]["count"] == 4
+    # the per-element loop is the top call site
+    top = summary["slowest_call_sites"][0]
+    assert (top["caller"], top["target"], top["count"]) == ("pages/stub_results_page.py:4 snapshot_products",
+                                                            "getAttribute:href", 3)
+    assert len(summary["slowest_call_sites"]) == 2
+    assert summary["scripts"][script_key("return document.readyState;")] == "return document.readyState;"
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("WebDriver profiler")
+def test_command_targets():
+    assert command_target("get", {"url": "https://www.ebay.com/"}) == "https://www.ebay.com/"
+    assert command_target("findChildElement", {"using": "xpath", "value": ".//a"}) == "xpath=.//a"
+    assert command_target("w3cExecuteScript", {"script": "/* isDisplayed */return x", "args": []}) == "isDisplayed"
+    assert command_target("executeCdpCommand", {"cmd": "Network.setCookies", "params": {}}) == "Network.setCookies"
+    assert command_target("getTitle", None) == ""
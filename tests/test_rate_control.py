@@ -0,0 +1,70 @@
+# tests/test_rate_control.py
+import os
+
+import allure
+
+from Utilities.rate_control import RateController
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _controller(tmp_path, clock, **kwargs):
+    return RateController(state_dir=str(tmp_path), sleep=clock.sleep, clock=clock, **kwargs)
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Adaptive rate control")
+def test_tokens_space_page_loads(tmp_path):
+    clock = _Clock()
+    rate = _controller(tmp_path, clock, rate=0.5)
+    assert rate.acquire() == 0          # the bucket starts full
+    assert rate.acquire() == 2.0        # then one token every 1 / 0.5 s
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Adaptive rate control")
+def test_aimd_backs_off_on_captcha_and_recovers(tmp_path):
+    clock = _Clock()
+    rate = _controller(tmp_path, clock, rate=1.0, increase=0.1, decrease=0.5, min_rate=0.2, max_rate=1.2)
+
+    rate.on_captcha()
+    assert rate.snapshot()["rate"] == 0.5
+    rate.on_captcha()
+    rate.on_captcha()
+    assert rate.snapshot()["rate"] == 0.2           # never below min_rate
+
+    for _ in range(20):
+        rate.on_clean_page()
+    assert rate.snapshot()["rate"] == 1.2           # additive recovery, capped
+
+    # a second worker of the same run sees the same bucket
+    other = _controller(tmp_path, clock)
+    assert other.snapshot()["captchas"] == 3 and other.snapshot()["clean"] == 20
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Adaptive rate control")
+def test_last_worker_to_close_removes_the_state_file(tmp_path, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw0")
+    first = _controller(tmp_path, clock)
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    second = _controller(tmp_path, clock)
+    second.on_captcha()
+
+    second.close()
+    assert os.listdir(str(tmp_path)) == [os.path.basename(first.state_file)]
+    assert first.snapshot()["workers"] == ["gw0"] and first.snapshot()["captchas"] == 1
+
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw0")
+    first.close()
+    assert os.listdir(str(tmp_path)) == []
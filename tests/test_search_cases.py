@@ -0,0 +1,48 @@
+# tests/test_search_cases.py
+import allure
+import pytest
+
+from Utilities import data_provider
+from Utilities.search_cases import (DEFAULT_DATA_FILE, DEFAULT_MAX_PRODUCTS, SearchCase, case_id,
+                                    iter_search_cases, parse_shard, select_cases)
+
+
+@pytest.fixture
+def sheet(tmp_path, monkeypatch):
+    from openpyxl import Workbook
+
+    monkeypatch.setattr(data_provider, "CACHE_DIR", str(tmp_path / "cache"))
+    wb = Workbook()
+    wb.active.append(("Keyword", "Match Tokens", "Max Products"))
+    for n in range(1000):
+        wb.active.append((f"keyword {n}", "kw, word" if n == 0 else None, n % 7 or None))
+    path = str(tmp_path / "searches.xlsx")
+    wb.save(path)
+    return path
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Data-driven search cases")
+def test_rows_become_cases_and_shards_partition_them(sheet):
+    first = next(iter_search_cases(sheet))
+    assert first == SearchCase("keyword 0", ("kw", "word"), DEFAULT_MAX_PRODUCTS, 2)
+    assert case_id(first) == "row2-keyword_0"
+
+    shards = [[c.keyword for c in select_cases(sheet, shard=(k, 4))] for k in range(1, 5)]
+    assert sorted(sum(shards, [])) == sorted(f"keyword {n}" for n in range(1000))
+    assert all(shards)
+    # same split every time
+    assert [c.keyword for c in select_cases(sheet, shard=(2, 4))] == shards[1]
+
+    limited = list(select_cases(sheet, shard=(3, 4), limit=5))
+    assert [c.keyword for c in limited] == shards[2][:5]
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Data-driven search cases")
+def test_headerless_workbook_and_shard_spec():
+    assert list(iter_search_cases(DEFAULT_DATA_FILE)) == [SearchCase("outdoor toys", ("outdoor", "toys"), 5, 1)]
+    assert parse_shard("2/3") == (2, 3) and parse_shard(None) is None
+    for bad in ("0/3", "4/3", "x"):
+        with pytest.raises(ValueError):
+            parse_shard(bad)
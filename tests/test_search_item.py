@@ -1,16 +1,14 @@
 # tests/test_search_item.py
-import time
-import random
-import datetime
 import allure
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
 
 # relies on your existing project files
+from base.base_driver import By
+from base.bot_wall import detect_bot_wall
 from pages.home_page import HomePage
 from pages.search_results_page import SearchResultsPage
-from Utilities.Dataread import Dataread
+from pages.product_page import ProductPage
+from Utilities.artifacts import artifact_path, artifact_stamp
+from Utilities.pacing import pause
 
 
 @allure.epic("E-Commerce Testing")
@@ -18,14 +16,17 @@ from Utilities.Dataread import Dataread
 @allure.story("Search, open product tabs, add to cart, return to results")
 @allure.severity(allure.severity_level.CRITICAL)
 @allure.title("Search results: open multiple product tabs, add to cart, return")
-def test_search_and_add_multiple_products(setup_driver):
+def test_search_and_add_multiple_products(setup_driver, site, rate_controller, search_case):
+    # selenium.webdriver loads every browser's bindings: only pay for it when the test runs
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import Select, WebDriverWait
+
     driver = setup_driver
-    wait = WebDriverWait(driver, 20)
 
     # --- config ---
-    MAX_PRODUCTS = 5        # how many products on the first results page to try
+    MAX_PRODUCTS = search_case.max_products   # how many products on the first results page to try (per row)
     KEYWORD_MATCH_REQUIRED = True  # require href/title to contain keyword
-    MAX_CAPTCHAS = 2        # stop the test if too many CAPTCHAs appear in one run
+    MAX_CAPTCHAS = 2        # stop the test if too many CAPTCHAs appear in one run (the rate controller backs off before that)
     captcha_count = 0
 
     # some fallback add-to-cart selectors (keep these for non-ux-call variants)
@@ -40,80 +41,31 @@ def test_search_and_add_multiple_products(setup_driver):
         "//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'add to basket')]",
     ]
 
-    # --- Step 1: open homepage and read keyword ---
-    data_reader = Dataread()
-    filepath = "Testdata1.xlsx"   # relative to Utilities directory
-    search_keyword = data_reader.dataread(filepath)
-    if not search_keyword:
-        raise AssertionError("Test data (search keyword) not found in Utilities/Testdata1.xlsx")
+    # --- Step 1: open homepage; keyword comes from this case's workbook row (see --search-data) ---
+    search_keyword = search_case.keyword
+    allure.dynamic.parameter("search_case", f"row {search_case.row}: {search_keyword}")
 
     with allure.step("Navigate to eBay homepage and perform search"):
-        driver.get("https://www.ebay.com")
+        # returns as soon as the search box exists (see --page-load-strategy)
+        home = HomePage(driver).open_home(timeout=20)
         allure.attach(driver.current_url, name="Homepage URL", attachment_type=allure.attachment_type.TEXT)
-        time.sleep(1)
 
-        home = HomePage(driver)
         home.search_item(search_keyword)
-        time.sleep(2)  # let results start loading
 
     # --- Step 2: collect candidates from results ---
     with allure.step("Collect product anchors from search results (cards & list)"):
+        results = SearchResultsPage(driver)
         try:
-            wait.until(EC.presence_of_all_elements_located(
-                (By.CSS_SELECTOR, "a.s-item__link, li.s-item, img.s-card__image, .s-item__wrapper, .srp-results a")
-            ))
-        except Exception:
-            pass
-
-        candidates = []
-
-        # anchors by common class
-        try:
-            for a in driver.find_elements(By.CSS_SELECTOR, "a.s-item__link"):
-                if a not in candidates:
-                    candidates.append(a)
-        except Exception:
-            pass
-
-        # anchors under li.s-item
-        try:
-            for a in driver.find_elements(By.CSS_SELECTOR, "li.s-item a"):
-                if a not in candidates:
-                    candidates.append(a)
+            results.wait_until_ready(timeout=20)
         except Exception:
             pass
 
-        # card images -> ancestor anchors
-        try:
-            for img in driver.find_elements(By.CSS_SELECTOR, "img.s-card__image"):
-                try:
-                    a = img.find_element(By.XPATH, "./ancestor::a[1]")
-                    if a and a not in candidates:
-                        candidates.append(a)
-                except Exception:
-                    continue
-        except Exception:
-            pass
-
-        # fallback anchors containing /itm/
-        try:
-            for a in driver.find_elements(By.XPATH, "//a[contains(@href,'/itm/')]"):
-                if a not in candidates:
-                    candidates.append(a)
-        except Exception:
-            pass
-
-        # limit and ensure href present
-        final_candidates = []
-        for a in candidates:
-            if len(final_candidates) >= MAX_PRODUCTS:
-                break
-            try:
-                href = a.get_attribute("href") or ""
-                if href.strip():
-                    final_candidates.append(a)
-            except Exception:
-                continue
+        # one page_source snapshot parsed in Python: {title, price, href, item_id, alt, layout};
+        # the browser is only used again to open the chosen products
+        final_candidates = results.snapshot_products(products_only=True)[:MAX_PRODUCTS]
+        if not final_candidates:
+            # live DOM fallback (one script call) for markup the parser doesn't know yet
+            final_candidates = results.collect_candidates(limit=MAX_PRODUCTS, products_only=True)
 
         if not final_candidates:
             allure.attach(driver.get_screenshot_as_png(), name="no_candidates", attachment_type=allure.attachment_type.PNG)
@@ -123,45 +75,34 @@ def test_search_and_add_multiple_products(setup_driver):
     added_count = 0
     original_handle = driver.current_window_handle
 
-    for idx, anchor in enumerate(final_candidates, start=1):
+    for idx, candidate in enumerate(final_candidates, start=1):
         try:
-            # small randomized human-like pause before acting on each candidate
-            time.sleep(random.uniform(1.0, 3.0))
+            # human-like pause before acting on each candidate (see --pacing)
+            pause("between_products")
 
-            # refresh href safely
-            try:
-                href = anchor.get_attribute("href")
-            except Exception:
-                anchors_now = driver.find_elements(By.CSS_SELECTOR, "a.s-item__link, li.s-item a, .srp-results a")
-                if len(anchors_now) >= idx:
-                    anchor = anchors_now[idx - 1]
-                    href = anchor.get_attribute("href")
-                else:
-                    href = None
+            # href/title/alt come from the snapshot; no per-anchor round trips
+            anchor = candidate.get("element")
+            href = candidate["href"]
+            title_text = candidate.get("title") or candidate.get("text") or ""
+            alt_text = candidate.get("alt") or ""
 
             if not href:
                 continue
 
-            # gather title/alt text
-            title_text = (anchor.text or "").strip()
-            alt_text = ""
-            try:
-                img = anchor.find_element(By.TAG_NAME, "img")
-                alt_text = (img.get_attribute("alt") or "").strip()
-            except Exception:
-                alt_text = ""
-
             combo = " ".join([title_text, alt_text, href]).lower()
-            keyword_lower = search_keyword.lower()
 
             if KEYWORD_MATCH_REQUIRED:
-                tokens = [t for t in keyword_lower.split() if len(t) > 1]
+                tokens = search_case.match_tokens
                 matched = any(tok in combo for tok in tokens)
                 if not matched:
                     print(f"Skipping candidate #{idx} (no keyword token in href/title/alt)")
                     continue
 
+            # shared token bucket: waits as long as the live site needs right now (see --rate)
+            rate_controller.acquire()
+
             # open in new tab (preferred)
+            handles_before = driver.window_handles
             try:
                 driver.execute_script("window.open(arguments[0], '_blank');", href)
             except Exception:
@@ -171,38 +112,28 @@ def test_search_and_add_multiple_products(setup_driver):
                     driver.get(href)
 
             # switch to new tab (most recent that isn't original)
-            time.sleep(random.uniform(0.8, 1.6))
-            handles = driver.window_handles
-            new_handle = None
-            for h in handles[::-1]:
-                if h != original_handle:
-                    new_handle = h
-                    break
+            new_handle = results.wait_for_new_window(handles_before, timeout=10)
             if new_handle:
                 driver.switch_to.window(new_handle)
 
+            # product title (or a verification wall) rendered -> no need to wait for the full load
+            product = ProductPage(driver)
+            try:
+                product.wait_until_ready(timeout=10)
+            except Exception:
+                pass
+
             # ---------- CAPTCHA detection (product tab) ----------
             try:
-                captcha_found = False
-                # hcaptcha/recaptcha iframe presence
-                if driver.find_elements(By.CSS_SELECTOR, "iframe[src*='hcaptcha.com'], iframe[src*='captcha'], iframe[src*='recaptcha']"):
-                    captcha_found = True
-                # body text check
-                if not captcha_found:
-                    try:
-                        body_text = driver.find_element(By.TAG_NAME, "body").text or ""
-                        if "please verify yourself" in body_text.lower() or "verify yourself" in body_text.lower() or "please verify" in body_text.lower():
-                            captcha_found = True
-                    except Exception:
-                        pass
-                if not captcha_found:
-                    if driver.find_elements(By.CSS_SELECTOR, ".h-captcha, .h-captcha-checkbox, .g-recaptcha, .captcha"):
-                        captcha_found = True
+                # one script call: challenge URL, captcha iframes / containers, verification text
+                verdict = product.guard_bot_wall()
+                captcha_found = bool(verdict)
 
                 if captcha_found:
                     captcha_count += 1
-                    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                    path = f"tests/captcha_{ts}.png"
+                    rate_controller.on_captcha()
+                    ts = artifact_stamp()
+                    path = artifact_path("captcha", "png", ts)
                     try:
                         driver.save_screenshot(path)
                     except Exception:
@@ -215,7 +146,7 @@ def test_search_and_add_multiple_products(setup_driver):
                         allure.attach.file(path, name=f"captcha_{ts}", attachment_type=allure.attachment_type.PNG)
                     except Exception:
                         pass
-                    print(f"⚠️ CAPTCHA detected on candidate #{idx}, screenshot saved at {path}. Skipping this product.")
+                    print(f"⚠️ CAPTCHA detected on candidate #{idx} ({verdict.reason}: {verdict.detail}), screenshot saved at {path}. Skipping this product.")
                     try:
                         driver.close()
                     except Exception:
@@ -226,7 +157,7 @@ def test_search_and_add_multiple_products(setup_driver):
                         handles = driver.window_handles
                         if handles:
                             driver.switch_to.window(handles[0])
-                    time.sleep(random.uniform(0.8, 1.6))
+                    pause("after_skip")
                     # stop early if too many captchas triggered
                     if captcha_count >= MAX_CAPTCHAS:
                         raise AssertionError(f"Too many CAPTCHAs encountered ({captcha_count}). Aborting test to avoid blocking.")
@@ -236,6 +167,7 @@ def test_search_and_add_multiple_products(setup_driver):
                 raise
             except Exception:
                 pass
+            rate_controller.on_clean_page()
             # ---------- end captcha detection ----------
 
             # ---------- Skip product if it requires manual variant selection (e.g., Colour) ----------
@@ -272,7 +204,7 @@ def test_search_and_add_multiple_products(setup_driver):
                         handles = driver.window_handles
                         if handles:
                             driver.switch_to.window(handles[0])
-                    time.sleep(random.uniform(0.8, 1.6))
+                    pause("after_skip")
                     continue
             except Exception:
                 pass
@@ -280,9 +212,7 @@ def test_search_and_add_multiple_products(setup_driver):
 
             # wait for product elements to appear lightly
             try:
-                WebDriverWait(driver, 10).until(EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "h1, #itemTitle, .x-item-title__main, .it-ttl")
-                ))
+                product.wait_for_element(ProductPage.TITLE, timeout=10)
             except Exception:
                 pass
 
@@ -309,7 +239,7 @@ def test_search_and_add_multiple_products(setup_driver):
                         if not clickable:
                             try:
                                 sp.click()
-                                time.sleep(0.5)
+                                pause("after_click")
                             except Exception:
                                 pass
                         else:
@@ -317,7 +247,7 @@ def test_search_and_add_multiple_products(setup_driver):
                                 driver.execute_script("arguments[0].scrollIntoView({block:'center'});", clickable)
                             except Exception:
                                 pass
-                            time.sleep(0.2)
+                            pause("after_scroll")
                             try:
                                 clickable.click()
                             except Exception:
@@ -335,7 +265,7 @@ def test_search_and_add_multiple_products(setup_driver):
                             )))
                             return True
                         except Exception:
-                            time.sleep(1)
+                            pause("page_react")
                             try:
                                 if driver.find_elements(By.XPATH, "//span[contains(normalize-space(.), 'See in cart') or contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'see in cart')]"):
                                     return True
@@ -348,35 +278,29 @@ def test_search_and_add_multiple_products(setup_driver):
             def try_click_add_button_general():
                 if try_click_add_by_ux_span():
                     return True
-                for sel in ADD_TO_CART_SELECTORS:
+                # all fallback selectors evaluated in one round trip; first visible match wins
+                btn, _sel = product.find_first_visible(ADD_TO_CART_SELECTORS)
+                if btn:
                     try:
-                        if sel.strip().startswith("//"):
-                            btn = driver.find_element(By.XPATH, sel)
-                        else:
-                            btn = driver.find_element(By.CSS_SELECTOR, sel)
-                        if btn and btn.is_displayed():
-                            try:
-                                driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
-                            except Exception:
-                                pass
-                            time.sleep(0.3)
-                            try:
-                                btn.click()
-                            except Exception:
-                                try:
-                                    driver.execute_script("arguments[0].click();", btn)
-                                except Exception:
-                                    pass
-                            try:
-                                WebDriverWait(driver, 6).until(EC.presence_of_element_located((
-                                    By.XPATH,
-                                    "//span[contains(normalize-space(.), 'See in cart') or //*[contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'see in cart')]"
-                                )))
-                                return True
-                            except Exception:
-                                return True
+                        driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
                     except Exception:
-                        continue
+                        pass
+                    pause("after_scroll")
+                    try:
+                        btn.click()
+                    except Exception:
+                        try:
+                            driver.execute_script("arguments[0].click();", btn)
+                        except Exception:
+                            pass
+                    try:
+                        WebDriverWait(driver, 6).until(EC.presence_of_element_located((
+                            By.XPATH,
+                            "//span[contains(normalize-space(.), 'See in cart') or //*[contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'see in cart')]"
+                        )))
+                        return True
+                    except Exception:
+                        return True
                 try:
                     btn = driver.find_element(By.XPATH, "//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'add to cart') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'add to basket')]")
                     try:
@@ -390,7 +314,7 @@ def test_search_and_add_multiple_products(setup_driver):
                             driver.execute_script("arguments[0].click();", btn)
                         except Exception:
                             pass
-                    time.sleep(1)
+                    pause("page_react")
                     try:
                         if driver.find_elements(By.XPATH, "//span[contains(normalize-space(.), 'See in cart') or contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'see in cart')]"):
                             return True
@@ -411,7 +335,7 @@ def test_search_and_add_multiple_products(setup_driver):
                             if r.is_displayed() and r.is_enabled():
                                 driver.execute_script("arguments[0].scrollIntoView({block:'center'});", r)
                                 r.click()
-                                time.sleep(0.3)
+                                pause("after_option")
                                 break
                         except Exception:
                             continue
@@ -433,7 +357,7 @@ def test_search_and_add_multiple_products(setup_driver):
                                             sel.select_by_visible_text(txt)
                                         except Exception:
                                             continue
-                                    time.sleep(0.4)
+                                    pause("after_option")
                                     break
                         except Exception:
                             continue
@@ -452,7 +376,7 @@ def test_search_and_add_multiple_products(setup_driver):
                                         driver.execute_script("arguments[0].click();", t)
                                     except Exception:
                                         continue
-                                time.sleep(0.3)
+                                pause("after_option")
                                 break
                         except Exception:
                             continue
@@ -476,7 +400,7 @@ def test_search_and_add_multiple_products(setup_driver):
                         try:
                             btn = see_btns[0]
                             driver.execute_script("arguments[0].scrollIntoView({block:'center'});", btn)
-                            time.sleep(0.2)
+                            pause("after_scroll")
                             try:
                                 btn.click()
                             except Exception:
@@ -484,7 +408,7 @@ def test_search_and_add_multiple_products(setup_driver):
                                     driver.execute_script("arguments[0].click();", btn)
                                 except Exception:
                                     pass
-                            time.sleep(1)
+                            pause("page_react")
                         except Exception:
                             pass
                 except Exception:
@@ -508,8 +432,8 @@ def test_search_and_add_multiple_products(setup_driver):
                 if handles:
                     driver.switch_to.window(handles[0])
 
-            # randomized small wait before next product
-            time.sleep(random.uniform(1.2, 3.0))
+            # small wait before next product (see --pacing)
+            pause("after_product")
 
         except Exception as e:
             try:
@@ -533,25 +457,21 @@ def test_search_and_add_multiple_products(setup_driver):
         with allure.step("Open cart page (new tab), remove last added product, capture final screenshot"):
             try:
                 # open cart in a new tab (do not replace current window's content)
+                rate_controller.acquire()
+                handles_before = driver.window_handles
                 try:
-                    driver.execute_script("window.open('https://cart.ebay.com','_blank');")
+                    driver.execute_script("window.open(arguments[0], '_blank');", site.cart)
                 except Exception:
                     # fallback: navigate current window (less ideal)
-                    driver.get("https://cart.ebay.com")
+                    driver.get(site.cart)
 
                 # switch to the newest handle (cart)
-                time.sleep(1.0)
-                handles = driver.window_handles
-                cart_handle = None
-                for h in handles[::-1]:
-                    if h != original_handle:
-                        cart_handle = h
-                        break
+                cart_handle = results.wait_for_new_window(handles_before, timeout=10)
                 if cart_handle:
                     driver.switch_to.window(cart_handle)
                 else:
                     # if no new handle, stay in current window
-                    driver.get("https://cart.ebay.com")
+                    driver.get(site.cart)
 
                 # wait for cart content to appear (or for captcha)
                 try:
@@ -562,28 +482,14 @@ def test_search_and_add_multiple_products(setup_driver):
                     pass
 
                 # detect captcha on cart
-                cart_has_captcha = False
-                try:
-                    if driver.find_elements(By.CSS_SELECTOR,
-                                            "iframe[src*='hcaptcha.com'], iframe[src*='captcha'], iframe[src*='recaptcha']"):
-                        cart_has_captcha = True
-                    else:
-                        body_text = ""
-                        try:
-                            body_text = driver.find_element(By.TAG_NAME, "body").text or ""
-                        except Exception:
-                            body_text = ""
-                        if any(tok in body_text.lower() for tok in
-                               ("please verify yourself", "please verify", "verify yourself", "security check")):
-                            cart_has_captcha = True
-                except Exception:
-                    cart_has_captcha = False
+                cart_has_captcha = bool(detect_bot_wall(driver))
 
-                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = artifact_stamp()
 
                 # if blocked by captcha, save screenshot and bail to avoid extra actions
                 if cart_has_captcha:
-                    screenshot_path = f"tests/cart_blocked_by_captcha_{timestamp}.png"
+                    rate_controller.on_captcha()
+                    screenshot_path = artifact_path("cart_blocked_by_captcha", "png", timestamp)
                     try:
                         driver.save_screenshot(screenshot_path)
                     except Exception:
@@ -599,9 +505,10 @@ def test_search_and_add_multiple_products(setup_driver):
                         pass
                     print(f"⚠️ Cart page blocked by CAPTCHA. Screenshot saved to: {screenshot_path}")
                 else:
+                    rate_controller.on_clean_page()
                     # --- BEFORE removal: attach a before-removal screenshot and page HTML ---
-                    before_png = f"tests/cart_before_remove_{timestamp}.png"
-                    before_html = f"tests/cart_before_remove_{timestamp}.html"
+                    before_png = artifact_path("cart_before_remove", "png", timestamp)
+                    before_html = artifact_path("cart_before_remove", "html", timestamp)
                     try:
                         driver.save_screenshot(before_png)
                     except Exception:
@@ -664,7 +571,7 @@ def test_search_and_add_multiple_products(setup_driver):
                                 driver.execute_script("arguments[0].scrollIntoView({block:'center'});", last_btn)
                             except Exception:
                                 pass
-                            time.sleep(0.3)
+                            pause("after_scroll")
                             try:
                                 last_btn.click()
                             except Exception:
@@ -684,7 +591,7 @@ def test_search_and_add_multiple_products(setup_driver):
                                 removed = True
                             except Exception:
                                 # fallback: wait a short while and check changes
-                                time.sleep(2)
+                                pause("page_react")
                                 try:
                                     new_remove_elems = driver.find_elements(By.XPATH,
                                                                             "//button[contains(normalize-space(.),'Remove') or //a[contains(normalize-space(.),'Remove')]]")
@@ -699,10 +606,10 @@ def test_search_and_add_multiple_products(setup_driver):
                         removed = False
 
                     # Attach result and screenshot after removal attempt
-                    after_ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                    after_png = f"tests/cart_after_remove_{after_ts}.png"
+                    after_ts = artifact_stamp()
+                    after_png = artifact_path("cart_after_remove", "png", after_ts)
                     try:
-                        time.sleep(1)
+                        pause("page_react")
                         driver.save_screenshot(after_png)
                     except Exception:
                         try:
@@ -722,7 +629,7 @@ def test_search_and_add_multiple_products(setup_driver):
                         print("⚠️ Could not confirm removal of last item (see before/after screenshots).")
 
                     # Save the "final" cart screenshot (after removal attempt) as final_cart_after_remove
-                    final_path = f"tests/final_cart_after_remove_{after_ts}.png"
+                    final_path = artifact_path("final_cart_after_remove", "png", after_ts)
                     try:
                         driver.save_screenshot(final_path)
                     except Exception:
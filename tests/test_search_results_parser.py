@@ -0,0 +1,78 @@
+# tests/test_search_results_parser.py
+import allure
+
+from pages.search_results_parser import parse_search_results
+
+LIST_LAYOUT = """
+<html><body><ul class="srp-results srp-list">
+  <li class="s-item s-item__pl-on-bottom">
+    <div class="s-item__image"><a href="https://ebay.com/itm/123456"><img src="x.jpg" alt=""></a></div>
+    <a class="s-item__link" href="https://ebay.com/itm/123456"><div class="s-item__title">Shop on eBay</div></a>
+  </li>
+  <li class="s-item">
+    <div class="s-item__image"><a href="/itm/Kids-Outdoor-Toys/334455667788?hash=1"><img alt="Outdoor toys set"></a></div>
+    <a class="s-item__link" href="/itm/Kids-Outdoor-Toys/334455667788?hash=1">
+      <div class="s-item__title"><span class="LIGHT_HIGHLIGHT">New Listing</span>Kids Outdoor Toys Set</div>
+    </a>
+    <span class="s-item__price">$19.99</span>
+  </li>
+  <li class="s-item">
+    <a class="s-item__link" href="https://www.ebay.com/itm/998877665544"><div class="s-item__title">Water Blaster</div></a>
+    <span class="s-item__price">$7.50 to $9.00</span>
+  </li>
+</ul></body></html>
+"""
+
+CARD_LAYOUT = """
+<html><body><ul class="srp-results">
+  <li class="s-card s-card--horizontal">
+    <a class="su-link" href="https://www.ebay.com/itm/111122223333">
+      <img class="s-card__image" src="a.webp" alt="Garden swing for kids">
+    </a>
+    <div class="s-card__title"><span>Garden Swing</span></div>
+    <div class="s-card__price">$45.00</div>
+  </li>
+  <li class="s-card">
+    <a href="https://www.ebay.com/itm/111122223333"><img class="s-card__image" alt="duplicate"></a>
+  </li>
+  <li class="s-card">
+    <a href="https://www.ebay.com/str/toyseller">Visit the toy seller's store</a>
+    <div class="s-card__title">Shop the seller</div>
+  </li>
+</ul>
+<a href="https://www.ebay.com/itm/555566667777">Sponsored trampoline</a>
+</body></html>
+"""
+
+
+@allure.feature("Product Search")
+@allure.story("In-process results parsing")
+def test_list_layout_cards():
+    products = parse_search_results(LIST_LAYOUT)
+
+    assert [p["item_id"] for p in products] == ["334455667788", "998877665544"]
+    first = products[0]
+    assert first["title"] == "Kids Outdoor Toys Set"
+    assert first["price"] == "$19.99"
+    assert first["alt"] == "Outdoor toys set"
+    assert first["href"] == "https://www.ebay.com/itm/Kids-Outdoor-Toys/334455667788?hash=1"
+    assert first["layout"] == "list"
+
+
+@allure.feature("Product Search")
+@allure.story("In-process results parsing")
+def test_card_layout_and_stray_links_are_deduplicated():
+    products = parse_search_results(CARD_LAYOUT)
+
+    assert [(p["item_id"], p["layout"]) for p in products] == [
+        ("111122223333", "card"),
+        (None, "card"),  # the seller-store card: only a non-product link
+        ("555566667777", "link"),
+    ]
+    assert [p["item_id"] for p in parse_search_results(CARD_LAYOUT, products_only=True)] == [
+        "111122223333", "555566667777",
+    ]
+    assert products[0]["title"] == "Garden Swing"
+    assert products[0]["price"] == "$45.00"
+    assert products[0]["alt"] == "Garden swing for kids"
+    assert parse_search_results("") == []
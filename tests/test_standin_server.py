@@ -0,0 +1,102 @@
+# tests/test_standin_server.py
+import http.cookiejar
+import urllib.parse
+import urllib.request
+
+import allure
+import pytest
+
+from base.site import Site
+from pages.search_results_parser import parse_search_results
+from Utilities.standin_server import StandinServer
+
+
+@pytest.fixture
+def standin():
+    with StandinServer() as server:
+        yield server
+
+
+def _browser():
+    return urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+
+
+def _get(opener, url, data=None):
+    body = urllib.parse.urlencode(data).encode() if data is not None else None
+    with opener.open(url, data=body, timeout=5) as resp:
+        return resp.geturl(), resp.read().decode("utf-8")
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Local eBay stand-in")
+def test_search_serves_both_layouts(standin):
+    site = Site(standin.base_url)
+    opener = _browser()
+
+    _, home = _get(opener, site.home)
+    assert 'id="gh-ac"' in home and 'action="/sch/i.html"' in home
+
+    _, listing = _get(opener, site.search("outdoor toys"))
+    list_products = parse_search_results(listing, base_url=site.home)
+    assert list_products and all(p["layout"] == "list" for p in list_products)
+    assert all("outdoor toys" in p["title"].lower() for p in list_products)
+
+    _, cards = _get(opener, site.search("outdoor toys") + "&layout=card")
+    card_products = parse_search_results(cards, base_url=site.home)
+    assert [p["item_id"] for p in card_products] == [p["item_id"] for p in list_products]
+    assert all(p["layout"] == "card" and p["alt"] for p in card_products)
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Local eBay stand-in")
+def test_add_to_cart_and_remove(standin):
+    site = Site(standin.base_url)
+    opener = _browser()
+    first = parse_search_results(_get(opener, site.search("outdoor toys"))[1], base_url=site.home)[0]
+
+    _, product = _get(opener, first["href"])
+    assert "atcRedesignId_btn" in product and "Add to cart" in product
+
+    url, product = _get(opener, site.base_url + "/cart/add", {"item": first["item_id"]})
+    assert url.endswith(f"/itm/{first['item_id']}?added=1")
+    assert "See in cart" in product
+
+    _, cart = _get(opener, site.cart)
+    assert first["title"] in cart and "Remove" in cart
+
+    # another visitor has their own cart
+    assert first["title"] not in _get(_browser(), site.cart)[1]
+
+    _, cart = _get(opener, site.base_url + "/cart/remove", {"item": first["item_id"]})
+    assert first["title"] not in cart
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Local eBay stand-in")
+def test_sign_in_shows_account_ui(standin):
+    site = Site(standin.base_url)
+    opener = _browser()
+
+    _, page = _get(opener, site.signin)
+    assert 'id="userid"' in page and 'id="signin-continue-btn"' in page
+
+    _, page = _get(opener, site.signin, {"userid": "buyer@example.com"})
+    assert 'id="pass"' in page and 'id="sgnBt"' in page
+
+    url, page = _get(opener, site.base_url + "/signin/password", {"userid": "buyer@example.com", "pass": "x"})
+    assert "signin" not in url
+    assert 'id="gh-ug"' in page
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Local eBay stand-in")
+def test_verification_wall_on_every_nth_product():
+    with StandinServer(challenge_every=2) as server:
+        opener = _browser()
+        item = Site(server.base_url).item("296512337401")
+        assert "Please verify yourself" not in _get(opener, item)[1]
+        url, wall = _get(opener, item)
+        assert "/splashui/captcha" in url and "h-captcha" in wall
+
+        url, page = _get(opener, server.base_url + "/splashui/captcha", {"ru": "/itm/296512337401"})
+        assert url.endswith("/itm/296512337401") and "x-item-title__main" in page
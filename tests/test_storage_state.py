@@ -0,0 +1,69 @@
+# tests/test_storage_state.py
+import time
+
+import allure
+
+from base.auth_session import AuthState
+from base.storage_state import all_expired, forget_storage_state, load_storage_state, to_cdp_cookie
+
+
+class CdpDriver:
+    """Records DevTools calls; any WebDriver navigation would be a bug."""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.calls.append((cmd, params))
+        return {"identifier": str(len(self.calls))} if cmd == "Page.addScriptToEvaluateOnNewDocument" else {}
+
+    def get(self, url):
+        raise AssertionError(f"navigated to {url}")
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Storage state loading")
+def test_state_goes_in_with_one_cookie_call_and_no_navigation():
+    now = int(time.time())
+    state = AuthState(
+        [
+            {"name": "s", "value": "1", "domain": ".ebay.com", "path": "/", "secure": True, "sameSite": "None",
+             "expiry": now + 3600},
+            {"name": "host", "value": "2", "domain": "signin.ebay.com", "path": "/", "secure": True},
+            {"name": "old", "value": "3", "domain": ".ebay.com", "path": "/", "expiry": now - 60},
+        ],
+        origins={"https://www.ebay.com": {"localStorage": {"k": "v"}, "sessionStorage": {}}},
+        base_url="https://www.ebay.com",
+    )
+    driver = CdpDriver()
+    assert state.apply(driver) == 2
+
+    (cmd, params), (script_cmd, script) = driver.calls
+    assert cmd == "Network.setCookies"
+    assert params["cookies"] == [
+        {"name": "s", "value": "1", "path": "/", "secure": True, "httpOnly": False, "domain": ".ebay.com",
+         "sameSite": "None", "expires": now + 3600},
+        {"name": "host", "value": "2", "path": "/", "secure": True, "httpOnly": False,
+         "url": "https://signin.ebay.com/"},
+    ]
+    assert script_cmd == "Page.addScriptToEvaluateOnNewDocument"
+    assert '"https://www.ebay.com"' in script["source"] and '"k": "v"' in script["source"]
+
+    # the pool drops the seeding script before the browser serves another test
+    forget_storage_state(driver)
+    assert driver.calls[-1] == ("Page.removeScriptToEvaluateOnNewDocument", {"identifier": "2"})
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Storage state loading")
+def test_expiry_precheck_and_non_cdp_fallback():
+    now = time.time()
+    assert all_expired([{"name": "a", "expiry": now - 1}, {"name": "b", "expiry": now - 5}])
+    assert not all_expired([{"name": "a", "expiry": now - 1}, {"name": "session"}])
+    assert not all_expired([])
+    assert to_cdp_cookie({"name": "a", "value": "b", "domain": "127.0.0.1"})["url"] == "http://127.0.0.1/"
+
+    class NoCdp:
+        pass
+
+    assert load_storage_state(NoCdp(), [{"name": "a", "value": "b"}]) is False
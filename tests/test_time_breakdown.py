@@ -0,0 +1,107 @@
+# tests/test_time_breakdown.py
+import time
+
+import allure
+import pytest
+
+from base.profiler import WebDriverProfiler
+from base.time_breakdown import TimeLedger, attribute
+
+
+class _Clock:
+    """Manual clock: only sleeps and stub round trips move it."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class _StubExecutor:
+    def __init__(self, clock):
+        self.clock = clock
+
+    def execute(self, command, params):
+        self.clock.sleep(1.0 if command == "get" else 0.1)
+        return {"value": None}
+
+
+class _StubDriver:
+    def __init__(self, clock):
+        self.command_executor = _StubExecutor(clock)
+
+    def execute(self, command, params=None):
+        return self.command_executor.execute(command, params or {})
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Time breakdown")
+def test_wall_time_is_split_without_double_counting(tmp_path):
+    clock = _Clock()
+    profiler = WebDriverProfiler(clock=clock, keep_commands=True)
+    ledger = TimeLedger(profiler=profiler, clock=clock, report_dir=str(tmp_path))
+    driver = _StubDriver(clock)
+    profiler.attach(driver)
+    sleep = ledger.timed("sleep", clock.sleep, count="sleeps")
+
+    def until(condition):
+        # a WebDriverWait: polls with round trips and sleeps, all of it waiting
+        while not condition():
+            sleep(0.5)
+
+    until = ledger.timed("load_wait", until, count="waits")
+    polls = iter([False, False, True])
+
+    profiler.start_test("t::search")
+    ledger.start_test("t::search")
+    driver.execute("get", {"url": "http://127.0.0.1/"})                   # 1.0 navigation
+    until(lambda: driver.execute("findElements", {})["value"] or next(polls))  # 3 finds + 2 polls = 1.3
+    for _ in range(4):
+        driver.execute("getElementText", {})                              # 0.4 round trips
+    sleep(2.0)                                                            # 2.0 pause
+    clock.now += 0.25                                                     # our own code
+    profiler.end_test()
+    result = ledger.end_test()
+
+    assert result["wall_seconds"] == pytest.approx(4.95)
+    assert result["seconds"] == pytest.approx({"sleep": 2.0, "webdriver": 0.4, "load_wait": 2.3, "python": 0.25})
+    assert result["counts"] == {"sleeps": 3, "waits": 1, "navigations": 1, "round_trips": 7}
+    assert sum(result["share"].values()) == pytest.approx(1.0, abs=1e-3)
+    assert "load_wait" in TimeLedger.format(result)
+
+    # nothing is charged outside a test
+    sleep(5.0)
+    assert ledger.end_test() is None
+    path, summary = ledger.write_report()
+    assert summary["seconds"]["sleep"] == pytest.approx(2.0) and summary["tests"] == [result]
+    assert path.endswith(".json")
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Time breakdown")
+def test_install_hooks_sleep_and_waits_and_restores_them():
+    from selenium.webdriver.support.wait import WebDriverWait
+
+    original_sleep, original_until = time.sleep, WebDriverWait.until
+    ledger = TimeLedger().install()
+    try:
+        ledger.start_test("t::hooks")
+        time.sleep(0.01)
+        WebDriverWait(object(), 1).until(lambda d: True)
+        result = ledger.end_test()
+    finally:
+        ledger.uninstall()
+    assert time.sleep is original_sleep and WebDriverWait.until is original_until
+    assert result["counts"] == {"sleeps": 1, "waits": 1}
+    assert result["seconds"]["sleep"] >= 0.01
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Time breakdown")
+def test_overlaps_go_to_the_outer_wait():
+    spans = [(1, 4, "load_wait"), (2, 3, "webdriver"), (5, 6, "sleep"), (5.5, 7, "webdriver")]
+    assert attribute(spans, 0, 10) == {"sleep": 1, "webdriver": 1, "load_wait": 3, "python": 5}
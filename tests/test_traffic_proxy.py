@@ -0,0 +1,74 @@
+# tests/test_traffic_proxy.py
+import shutil
+import ssl
+import urllib.error
+import urllib.request
+
+import allure
+import pytest
+
+from Utilities import traffic_proxy
+from Utilities.standin_server import StandinServer
+from Utilities.traffic_proxy import MatchRules, TrafficArchive, TrafficProxy
+
+
+@pytest.fixture(autouse=True)
+def _cert_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(traffic_proxy, "CERT_DIR", str(tmp_path / "cert"))
+
+
+def _via(proxy, url, context=None):
+    handlers = [urllib.request.ProxyHandler({"http": f"http://{proxy.address}", "https": f"http://{proxy.address}"})]
+    if context:
+        handlers.append(urllib.request.HTTPSHandler(context=context))
+    with urllib.request.build_opener(*handlers).open(url, timeout=10) as resp:
+        return resp.status, resp.read().decode("utf-8")
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Record / replay proxy")
+def test_record_then_replay_offline(tmp_path):
+    archive = str(tmp_path / "traffic.jsonl.gz")
+    with StandinServer() as server:
+        search = f"{server.base_url}/sch/i.html?_nkw=outdoor+toys&_trksid=p1"
+        with TrafficProxy("record", archive) as proxy:
+            status, recorded = _via(proxy, search)
+            assert status == 200 and "s-item__link" in recorded
+            _via(proxy, server.base_url + "/")
+
+    # the site is gone; replay still serves it, ignoring the tracking parameter
+    with TrafficProxy("replay", archive) as proxy:
+        status, replayed = _via(proxy, search.replace("_trksid=p1", "_trksid=p2"))
+        assert status == 200 and replayed == recorded
+
+        with pytest.raises(urllib.error.HTTPError) as miss:
+            _via(proxy, search.replace("outdoor+toys", "headphones"))
+        assert miss.value.code == 404
+        assert proxy.misses == [f"GET {search.replace('outdoor+toys', 'headphones')}"]
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Record / replay proxy")
+def test_match_rules():
+    rules = MatchRules(ignore_params=["hash"])
+    assert rules.key("get", "https://www.ebay.com/itm/1?b=2&a=1&hash=x") == rules.key("GET", "https://WWW.ebay.com/itm/1?a=1&b=2")
+    assert rules.key("GET", "https://www.ebay.com/itm/1?a=1") != rules.key("GET", "https://www.ebay.com/itm/1?a=2")
+    assert MatchRules(ignore_query=True).key("GET", "http://h/p?a=1") == MatchRules(ignore_query=True).key("GET", "http://h/p")
+    body_rules = MatchRules(match_body=True)
+    assert body_rules.key("POST", "http://h/cart/add", b"item=1") != body_rules.key("POST", "http://h/cart/add", b"item=2")
+
+
+@allure.feature("Test Infrastructure")
+@allure.story("Record / replay proxy")
+@pytest.mark.skipif(not shutil.which("openssl"), reason="openssl CLI needed for HTTPS interception")
+def test_https_is_replayed_through_interception(tmp_path):
+    archive = str(tmp_path / "traffic.jsonl.gz")
+    recorded = TrafficArchive()
+    recorded.add("GET", "https://www.ebay.com/", b"", 200, "OK", [("Content-Type", "text/html")], b"<html>home</html>")
+    recorded.save(archive)
+
+    insecure = ssl.create_default_context()
+    insecure.check_hostname = False
+    insecure.verify_mode = ssl.CERT_NONE
+    with TrafficProxy("replay", archive) as proxy:
+        assert _via(proxy, "https://www.ebay.com/", context=insecure) == (200, "<html>home</html>")